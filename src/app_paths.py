@@ -0,0 +1,75 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# --- Script Summary ---
+# Responsibility: Shared location helpers for user data, caches and bundled resources.
+# Usage: import app_paths
+# ----------------------
+
+# Copyright (C) 2025 steve.rock@wheelhouser.com
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#===============================================================================================================
+
+import os
+import sys
+
+# Must match QSettings("Wheelhouser", "TextToSpeech") in text_to_speech.py
+ORGANIZATION = "Wheelhouser"
+APPLICATION = "TextToSpeech"
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.dirname(SRC_DIR)
+
+def user_data_dir():
+    """Returns the per-user writable data directory (same place Qt's AppDataLocation points to)."""
+    override = os.environ.get("TTS_DATA_DIR")
+    if override:
+        return override
+
+    if sys.platform.startswith("win"):
+        base = os.environ.get("APPDATA") or os.path.expanduser("~\\AppData\\Roaming")
+    elif sys.platform == "darwin":
+        base = os.path.expanduser("~/Library/Application Support")
+    else:
+        base = os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+    return os.path.join(base, ORGANIZATION, APPLICATION)
+
+def user_cache_dir():
+    """Returns the per-user cache directory (safe to delete at any time)."""
+    override = os.environ.get("TTS_CACHE_DIR")
+    if override:
+        return override
+
+    if sys.platform.startswith("win"):
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~\\AppData\\Local")
+        return os.path.join(base, ORGANIZATION, APPLICATION, "cache")
+    if sys.platform == "darwin":
+        base = os.path.expanduser("~/Library/Caches")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, ORGANIZATION, APPLICATION)
+
+def bundled_path(relative_path):
+    """Finds a file shipped with the app, checking the PyInstaller bundle, src/ and the project root."""
+    candidates = []
+    if hasattr(sys, "_MEIPASS"):
+        candidates.append(os.path.join(sys._MEIPASS, relative_path))
+    candidates.append(os.path.join(SRC_DIR, relative_path))
+    candidates.append(os.path.join(PROJECT_DIR, relative_path))
+
+    for p in candidates:
+        if os.path.exists(p):
+            return p
+    return None
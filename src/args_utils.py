@@ -27,11 +27,11 @@ def add_outfile_arg(parser, required=True):
 def add_pitch_rate_args(parser):
     """Add --pitch and --rate arguments."""
     parser.add_argument("--pitch", default="+0Hz", help="Pitch adjustment (e.g. -50Hz)")
-    parser.add_argument("--rate", default="+0%", help="Rate adjustment (e.g. -10%)")
+    parser.add_argument("--rate", default="+0%", help="Rate adjustment (e.g. -10%%)")
 
 def add_volume_arg(parser):
     """Add --volume argument."""
-    parser.add_argument("--volume", default="+0%", help="Volume adjustment (e.g. +10%)")
+    parser.add_argument("--volume", default="+0%", help="Volume adjustment (e.g. +10%%)")
 
 def get_text_content(text_arg):
     """Reads text from a file if the argument is a valid file path, otherwise returns the argument."""
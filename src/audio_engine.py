@@ -0,0 +1,403 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# --- Script Summary ---
+# Responsibility: Long-lived playback engine shared by play_audio.py and the GUI.
+#                 Initializes the Pygame mixer once, decodes the next file while the current one plays,
+#                 queues it on the channel for gapless playback and stops instantly via an Event.
+#                 Falls back to a system CLI player that is discovered once per process.
+# Usage: import audio_engine
+#   audio_engine.get_engine().play(["a.mp3", "b.mp3"])   # blocks until done or stop()
+#   audio_engine.get_engine().start([audio_engine.MemoryClip(mp3_bytes)])   # in-memory, non-blocking
+# ----------------------
+
+# Copyright (C) 2025 steve.rock@wheelhouser.com
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# --- Setup Instructions ---
+# Active the venv on linux/macOS:
+# python -m venv .venv
+# source .venv/bin/activate
+# pip install --upgrade pip
+# pip install pygame
+#===============================================================================================================
+
+import collections
+import contextlib
+import functools
+import hashlib
+import io
+import os
+import queue
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import warnings
+import tts_metrics
+import tts_profiling
+
+# Suppress the specific UserWarning from pygame about pkg_resources
+warnings.filterwarnings("ignore", category=UserWarning, message=".*pkg_resources is deprecated.*")
+
+# paplay = PulseAudio (Standard on Fedora/Ubuntu)
+# aplay = ALSA (Linux)
+# afplay = macOS
+# ffplay = FFmpeg
+SYSTEM_PLAYERS = [
+    ("paplay", []),
+    ("mpg123", []),
+    ("afplay", []),
+    ("aplay", []),
+    ("ffplay", ["-nodisp", "-autoexit", "-hide_banner"]),
+]
+
+# Memory budget for decoded audio kept around for instant replays
+DEFAULT_PCM_CACHE_MB = int(os.environ.get("TTS_PCM_CACHE_MB", "256"))
+
+class NoPlayerError(RuntimeError):
+    """Raised when neither Pygame nor any system player is available."""
+
+class MemoryClip:
+    """
+    Encoded audio (e.g. MP3 bytes from the synthesizer) that plays without touching disk.
+    Accepted anywhere the engine takes a file path.
+    """
+
+    def __init__(self, data, suffix=".mp3"):
+        self.data = data
+        self.suffix = suffix
+        self.digest = hashlib.sha1(data).hexdigest()
+        self.name = f"memory:{self.digest}"
+        # Same shape as PCMCache.key_for(); identical bytes share one decoded Sound
+        self.key = (self.name, 0, len(data))
+
+    def __len__(self):
+        return len(self.data)
+
+class PCMCache:
+    """
+    LRU cache of decoded audio (pygame Sound objects) keyed by (path, mtime, size),
+    bounded by the decoded PCM size. Editing or replacing a file changes its key.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._entries = collections.OrderedDict()  # key -> (sound, nbytes)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key_for(file_path):
+        st = os.stat(file_path)
+        return (file_path, st.st_mtime_ns, st.st_size)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, sound, nbytes):
+        if nbytes > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old:
+                self.current_bytes -= old[1]
+            # Older versions of the same path can never be hit again
+            for stale in [k for k in self._entries if k[0] == key[0]]:
+                self.current_bytes -= self._entries.pop(stale)[1]
+            self._entries[key] = (sound, nbytes)
+            self.current_bytes += nbytes
+            while self.current_bytes > self.max_bytes and self._entries:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+@functools.lru_cache(maxsize=None)
+def find_system_player():
+    """Returns the command prefix of the first available CLI player (probed once), or None."""
+    for player_cmd, args in SYSTEM_PLAYERS:
+        path = shutil.which(player_cmd)
+        if path:
+            return tuple([path] + args)
+    # Flatpak Fallback (For VS Code sandbox)
+    if shutil.which("flatpak-spawn"):
+        return ("flatpak-spawn", "--host", "paplay")
+    return None
+
+class AudioEngine:
+    """Plays queues of files. One play() runs at a time; stop() may be called from any thread."""
+
+    def __init__(self, cache_mb=DEFAULT_PCM_CACHE_MB):
+        self.cache = PCMCache(cache_mb * 1024 * 1024)
+        self._lock = threading.Lock()
+        self._play_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._generation = 0  # Bumped by stop() so a play() queued before the stop never starts
+        self._pygame = None
+        self._mixer_state = None  # None = not tried yet, True/False afterwards
+        self._channel = None
+        self._process = None
+        self._player_thread = None
+        self._prefetch_queue = None
+        self._requested_at = None  # When the running play() was asked for; cleared once it is heard
+
+    # --- Pygame backend ---
+    def _ensure_mixer(self):
+        """Initializes the mixer on first use and keeps it open for the life of the process."""
+        with self._lock:
+            if self._mixer_state is None:
+                try:
+                    # Suppress pygame welcome message
+                    os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = "hide"
+                    # SDL would otherwise swallow SIGINT/SIGTERM meant for the host app
+                    os.environ.setdefault('SDL_NO_SIGNAL_HANDLERS', "1")
+                    import pygame
+                    pygame.mixer.init()
+                    self._pygame = pygame
+                    self._channel = pygame.mixer.Channel(0)
+                    self._mixer_state = True
+                except ImportError:
+                    self._mixer_state = False
+                except Exception as e:
+                    print(f"Pygame mixer unavailable: {e}")
+                    self._mixer_state = False
+            return self._mixer_state
+
+    def _pcm_bytes(self, sound):
+        """Decoded size of a Sound in the mixer's output format."""
+        frequency, size, channels = self._pygame.mixer.get_init()
+        return int(sound.get_length() * frequency * channels * (abs(size) // 8))
+
+    def decode(self, file_path):
+        """
+        Returns a pygame Sound for the file (or MemoryClip), decoding it only on a PCM cache miss.
+        Returns None if Pygame can't handle it.
+        """
+        if not self._ensure_mixer():
+            return None
+        if isinstance(file_path, MemoryClip):
+            key = file_path.key
+        else:
+            try:
+                key = PCMCache.key_for(file_path)
+            except OSError:
+                return None
+
+        sound = self.cache.get(key)
+        if sound is not None:
+            return sound
+        try:
+            if isinstance(file_path, MemoryClip):
+                sound = self._pygame.mixer.Sound(file=io.BytesIO(file_path.data))
+            else:
+                sound = self._pygame.mixer.Sound(file_path)
+        except Exception as e:
+            print(f"Pygame could not decode {getattr(file_path, 'name', file_path)}: {e}")
+            return None
+        self.cache.put(key, sound, self._pcm_bytes(sound))
+        return sound
+
+    def _first_sound(self, backend):
+        """Records time-to-first-sound for the current play() the first time audio starts."""
+        if self._requested_at is not None:
+            tts_metrics.get_metrics().record_playback(time.perf_counter() - self._requested_at, backend)
+            self._requested_at = None
+
+    def _wait_for(self, sound, started):
+        """Waits until 'sound' (started at 'started') has finished. Returns False if stop() was called."""
+        remaining = started + sound.get_length() - time.monotonic()
+        return not self._stop_event.wait(max(0.0, remaining))
+
+    def _play_sounds(self, files):
+        """Gapless pygame playback: the next sound is decoded and queued while the current one plays."""
+        pending = list(files)
+        current, started = None, 0.0
+
+        while True:
+            # Decode ahead while the mixer thread plays 'current'
+            upcoming = None
+            while pending and upcoming is None:
+                path = pending.pop(0)
+                upcoming = self.decode(path)
+                if upcoming is None:
+                    # Pygame can't decode it: finish current, then hand this file to the system player
+                    if current is not None and not self._wait_for(current, started):
+                        return False
+                    current = None
+                    if not self._play_external(path):
+                        return False
+
+            if self._stop_event.is_set():
+                return False
+
+            if current is None:
+                if upcoming is None:
+                    return True
+                self._channel.play(upcoming)
+                self._first_sound("pygame")
+                current, started = upcoming, time.monotonic()
+                continue
+
+            if upcoming is not None:
+                self._channel.queue(upcoming)
+            if not self._wait_for(current, started):
+                return False
+
+            if upcoming is None:
+                # Let the mixer drain the tail of the last buffer
+                while self._channel.get_busy():
+                    if self._stop_event.wait(0.01):
+                        return False
+                return True
+            current, started = upcoming, started + current.get_length()
+
+    # --- System player backend ---
+    def _play_external(self, file_path):
+        """Plays one file with the cached CLI player. Returns False if stopped."""
+        player = find_system_player()
+        if not player:
+            raise NoPlayerError("Could not play audio. Please install 'pygame' or a CLI player.")
+        if self._stop_event.is_set():
+            return False
+        if isinstance(file_path, MemoryClip):
+            # CLI players need a real file; spill to a temp file just for this playback
+            fd, tmp_path = tempfile.mkstemp(prefix="tts-clip-", suffix=file_path.suffix)
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(file_path.data)
+                return self._play_external(tmp_path)
+            finally:
+                with contextlib.suppress(OSError):
+                    os.remove(tmp_path)
+        try:
+            with self._lock:
+                self._process = subprocess.Popen(list(player) + [file_path],
+                                                 stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                self._first_sound(os.path.basename(player[0]))  # The player is running; its own start-up isn't visible
+                if self._stop_event.is_set():
+                    self._process.terminate()
+            # stop() terminates the process, which wakes this wait immediately
+            self._process.wait()
+        except (subprocess.CalledProcessError, FileNotFoundError) as e:
+            print(f"Failed to play via {player[0]}: {e}")
+        finally:
+            with self._lock:
+                self._process = None
+        return not self._stop_event.is_set()
+
+    # --- Public API ---
+    def play(self, files, _generation=None, _requested_at=None):
+        """
+        Plays 'files' (paths or MemoryClips) in order and blocks until they finish. Returns True when the whole
+        queue played, False if stop() interrupted it. Raises NoPlayerError if nothing can play audio.
+        """
+        requested_at = _requested_at or time.perf_counter()
+        files = [f if isinstance(f, MemoryClip) else os.path.abspath(f) for f in files]
+        missing = [f for f in files if not isinstance(f, MemoryClip) and not os.path.exists(f)]
+        for f in missing:
+            print(f"Error: File not found: {f}")
+        files = [f for f in files if f not in missing]
+
+        generation = self._generation if _generation is None else _generation
+        with self._play_lock, tts_profiling.profiled("playback"):
+            if generation != self._generation:
+                return False
+            self._stop_event.clear()
+            self._requested_at = requested_at
+            if self._ensure_mixer():
+                return self._play_sounds(files)
+            for f in files:
+                if not self._play_external(f):
+                    return False
+            return True
+
+    def stop(self):
+        """Stops playback immediately."""
+        with self._lock:
+            self._generation += 1
+            self._stop_event.set()
+            if self._channel is not None:
+                self._channel.stop()
+            if self._process and self._process.poll() is None:
+                try:
+                    self._process.terminate()
+                except Exception as e:
+                    print(f"Error terminating playback process: {e}")
+
+    def start(self, files, on_finished=None):
+        """
+        Non-blocking play(): cuts whatever is playing and plays 'files' on a background thread.
+        'on_finished(completed)' is called from that thread when the queue ends or is stopped.
+        """
+        requested_at = time.perf_counter()
+        self.stop()
+        generation = self._generation
+
+        def run():
+            completed = False
+            try:
+                completed = self.play(files, _generation=generation, _requested_at=requested_at)
+            except NoPlayerError as e:
+                print(f"Error: {e}")
+            if on_finished:
+                on_finished(completed)
+
+        thread = threading.Thread(target=run, name="audio-engine-player", daemon=True)
+        self._player_thread = thread
+        thread.start()
+        return thread
+
+    def prefetch(self, files):
+        """Decodes 'files' into the PCM cache on a background thread so they start instantly later."""
+        with self._lock:
+            if self._prefetch_queue is None:
+                self._prefetch_queue = queue.Queue()
+                threading.Thread(target=self._prefetch_loop, name="audio-engine-prefetch", daemon=True).start()
+        for f in files:
+            self._prefetch_queue.put(f if isinstance(f, MemoryClip) else os.path.abspath(f))
+
+    def _prefetch_loop(self):
+        while True:
+            file_path = self._prefetch_queue.get()
+            if isinstance(file_path, MemoryClip) or os.path.exists(file_path):
+                self.decode(file_path)
+
+    def warm_up(self):
+        """Imports Pygame and opens the mixer ahead of the first playback. Returns True if Pygame is usable."""
+        return self._ensure_mixer()
+
+    def is_playing(self):
+        return self._play_lock.locked()
+
+_engine = None
+_engine_lock = threading.Lock()
+
+def get_engine():
+    """Returns the process-wide AudioEngine."""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = AudioEngine()
+        return _engine
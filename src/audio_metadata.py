@@ -0,0 +1,141 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# --- Script Summary ---
+# Responsibility: Audio file metadata (duration, bitrate) via mutagen, with a per-directory on-disk
+#                 cache so large folders of generated clips list instantly the second time.
+# Usage: import audio_metadata
+# ----------------------
+
+# Copyright (C) 2025 steve.rock@wheelhouser.com
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# --- Setup Instructions ---
+# Active the venv on linux/macOS:
+# python -m venv .venv
+# source .venv/bin/activate
+# pip install --upgrade pip
+# pip install mutagen
+#===============================================================================================================
+
+import hashlib
+import json
+import os
+import threading
+import app_paths
+
+def probe(file_path):
+    """Returns {'duration': seconds, 'bitrate': bits/s} for an audio file, or {} if it can't be read."""
+    try:
+        from mutagen import File as MutagenFile
+    except ImportError:
+        return {}
+    try:
+        audio = MutagenFile(file_path)
+    except Exception:
+        return {}
+    if audio is None or getattr(audio, "info", None) is None:
+        return {}
+    return {
+        "duration": getattr(audio.info, "length", None),
+        "bitrate": getattr(audio.info, "bitrate", None),
+    }
+
+def format_duration(seconds):
+    if seconds is None:
+        return ""
+    minutes, secs = divmod(seconds, 60)
+    return f"{int(minutes)}:{secs:04.1f}"
+
+def format_size(num_bytes):
+    if num_bytes is None:
+        return ""
+    for unit in ("B", "KB", "MB"):
+        if num_bytes < 1024:
+            return f"{num_bytes:.0f} {unit}" if unit == "B" else f"{num_bytes:.1f} {unit}"
+        num_bytes /= 1024
+    return f"{num_bytes:.1f} GB"
+
+def format_bitrate(bits_per_second):
+    if not bits_per_second:
+        return ""
+    return f"{bits_per_second // 1000} kbps"
+
+class DirectoryMetadataCache:
+    """
+    Remembers one directory's audio listing and per-file metadata between runs.
+    The listing is reused while the directory's mtime is unchanged; each file's
+    metadata is reused while its (mtime, size) is unchanged.
+    """
+
+    def __init__(self, directory, cache_dir=None):
+        self.directory = os.path.abspath(directory)
+        cache_dir = cache_dir or os.path.join(app_paths.user_cache_dir(), "metadata")
+        digest = hashlib.sha1(self.directory.encode("utf-8")).hexdigest()
+        self.path = os.path.join(cache_dir, f"{digest}.json")
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._data = {"dir_mtime": None, "listing": None, "files": {}}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                self._data.update(data)
+        except (OSError, ValueError):
+            pass
+
+    def listing(self, dir_mtime):
+        """
+        Returns the cached [(name, size, mtime_ns), ...] if no file was added, removed or renamed since
+        (the directory's mtime is unchanged), else None. Sizes and mtimes may be stale: re-stat them.
+        """
+        with self._lock:
+            if self._data.get("dir_mtime") == dir_mtime and self._data.get("listing") is not None:
+                return [tuple(e) for e in self._data["listing"]]
+        return None
+
+    def set_listing(self, entries, dir_mtime):
+        with self._lock:
+            self._data["dir_mtime"] = dir_mtime
+            self._data["listing"] = [list(e) for e in entries]
+            # Forget metadata for files that are gone
+            names = {e[0] for e in entries}
+            self._data["files"] = {n: v for n, v in self._data["files"].items() if n in names}
+            self._dirty = True
+
+    def get(self, name, mtime_ns, size):
+        with self._lock:
+            entry = self._data["files"].get(name)
+        if entry and entry[0] == mtime_ns and entry[1] == size:
+            return entry[2]
+        return None
+
+    def put(self, name, mtime_ns, size, meta):
+        with self._lock:
+            self._data["files"][name] = [mtime_ns, size, meta]
+            self._dirty = True
+
+    def save(self):
+        """Writes the cache atomically if anything changed."""
+        with self._lock:
+            if not self._dirty:
+                return
+            payload = json.dumps(self._data)
+            self._dirty = False
+        import tts_engine
+        try:
+            tts_engine.write_atomic(self.path, payload.encode("utf-8"))
+        except OSError as e:
+            print(f"Failed to save metadata cache {self.path}: {e}")
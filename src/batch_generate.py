@@ -7,6 +7,7 @@
 # Examples:
 #   python batch_generate.py Male "Always with you what can't be done..." ./always-with-you-what-cant-be-done --pitch="-10Hz" --rate="-35%"
 #   python batch_generate.py Female "Testing speed" ./female_fast --rate="+20%"
+#   python batch_generate.py Female "Testing speed" ./female_sweep --pack   # one samples.pack instead of ~300 files
 # ----------------------
 
 # Copyright (C) 2025 steve.rock@wheelhouser.com
@@ -30,35 +31,32 @@
 # source .venv/bin/activate
 # pip install --upgrade pip
 # pip install args_utils
+# pip install edge-tts
 #===============================================================================================================
 
 import json
-import subprocess
 import os
 import sys
 import args_utils
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 VOICES_FILE = os.path.join(SCRIPT_DIR, "voices.json")
-SAMPLE_SCRIPT = os.path.join(SCRIPT_DIR, "sample_voices.py")
+DESCRIPTION = "Batch generate samples for a specific gender."
 
-def main():
-    parser = args_utils.init_parser("Batch generate samples for a specific gender.")
+def add_arguments(parser):
     parser.add_argument("gender", choices=["Male", "Female"], help="Gender to filter by")
     args_utils.add_text_arg(parser)
     parser.add_argument("output_dir", help="Directory to save output")
     args_utils.add_pitch_rate_args(parser)
-    
-    args = parser.parse_args()
+    import sample_voices
+    sample_voices.add_order_argument(parser)
+    sample_voices.add_pack_argument(parser)
 
+def run(args):
     if not os.path.exists(VOICES_FILE):
         print(f"Error: {VOICES_FILE} not found.")
         sys.exit(1)
 
-    if not os.path.exists(SAMPLE_SCRIPT):
-        print(f"Error: {SAMPLE_SCRIPT} not found.")
-        sys.exit(1)
-
     print(f"Reading voices from {VOICES_FILE}...")
     with open(VOICES_FILE, 'r', encoding='utf-8') as f:
         voices = json.load(f)
@@ -85,20 +83,18 @@ def main():
     with open(os.path.join(args.output_dir, "settings.json"), "w", encoding="utf-8") as f:
         json.dump(settings, f, indent=4)
 
-    # Construct command to call sample_voices.py
-    id_list = ",".join(ids)
-    
-    cmd = [
-        sys.executable, SAMPLE_SCRIPT,
-        args.text,
-        id_list,
-        f"--pitch={args.pitch}",
-        f"--rate={args.rate}",
-        "--output-dir", args.output_dir
-    ]
-    
     print(f"Running batch generation for {args.gender} voices into '{args.output_dir}'...")
-    subprocess.run(cmd)
+    # Same process as sample_voices.py: Ctrl-C cancels the in-flight synthesis and exits with 130
+    import sample_voices
+    import tts_engine
+    tts_engine.run_cli(sample_voices.generate_samples(args_utils.get_text_content(args.text), ids,
+                                                      args.output_dir, args.pitch, args.rate, args.in_order,
+                                                      args.pack))
+
+def main():
+    parser = args_utils.init_parser(DESCRIPTION)
+    add_arguments(parser)
+    run(parser.parse_args())
 
 if __name__ == "__main__":
     main()
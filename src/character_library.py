@@ -0,0 +1,245 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# --- Script Summary ---
+# Responsibility: Single access layer for characters.json shared by the GUI and the CLI tools.
+#                 Resolves one library path, serializes access with an advisory lock file and
+#                 writes atomically (temp file + rename) so concurrent processes never clobber each other.
+# Usage: import character_library
+# ----------------------
+
+# Copyright (C) 2025 steve.rock@wheelhouser.com
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#===============================================================================================================
+
+import contextlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import app_paths
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:  # POSIX
+    msvcrt = None
+
+LIBRARY_FILENAME = "characters.json"
+TEMPLATE_RELATIVE_PATH = os.path.join("voice-library", LIBRARY_FILENAME)
+
+def resolve_library_path(legacy_paths=()):
+    """
+    Returns the one characters.json every tool should use.
+    Order: $TTS_CHARACTERS_FILE, then the per-user data dir. On first use the file is
+    seeded from a legacy location (if given and present) or the bundled template.
+    """
+    override = os.environ.get("TTS_CHARACTERS_FILE")
+    if override:
+        return os.path.abspath(override)
+
+    path = os.path.join(app_paths.user_data_dir(), LIBRARY_FILENAME)
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        seeds = [p for p in legacy_paths if p and os.path.abspath(p) != path]
+        seeds.append(app_paths.bundled_path(TEMPLATE_RELATIVE_PATH))
+        for seed in seeds:
+            if seed and os.path.exists(seed):
+                with _locked(path, exclusive=True):
+                    if not os.path.exists(path):
+                        shutil.copy2(seed, path)
+                break
+    return path
+
+@contextlib.contextmanager
+def _locked(path, exclusive):
+    """Holds an advisory lock on '<path>.lock' (shared for readers, exclusive for writers)."""
+    lock_path = path + ".lock"
+    os.makedirs(os.path.dirname(lock_path) or ".", exist_ok=True)
+    fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if fcntl:
+            fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        elif msvcrt:
+            # msvcrt has no shared locks; every access is exclusive
+            msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+        yield
+    finally:
+        try:
+            if fcntl:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            elif msvcrt:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(fd)
+
+def _read(path):
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+# Read once: os.umask() can only be queried by setting it
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+def _write_atomic(path, library):
+    """Writes to a temp file in the same directory, fsyncs, then renames over the target."""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=".characters-", suffix=".tmp", dir=directory)
+    os.chmod(tmp_path, 0o666 & ~_UMASK)  # mkstemp creates 0600; give the file normal permissions
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(library, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+        raise
+
+def load_library(path=None):
+    """Reads the library under a shared lock. Returns [] if the file does not exist yet.
+    Raises json.JSONDecodeError if the file is corrupt."""
+    path = path or resolve_library_path()
+    with _locked(path, exclusive=False):
+        return _read(path)
+
+def save_library(library, path=None):
+    """Replaces the whole library atomically. Prefer update_library() for read-modify-write."""
+    path = path or resolve_library_path()
+    with _locked(path, exclusive=True):
+        _write_atomic(path, library)
+
+def update_library(mutator, path=None):
+    """
+    Read-modify-write under one exclusive lock so edits from other processes are not lost.
+    'mutator' receives the current list, edits it in place and may return a value.
+    Returns (library, mutator_result). Raises json.JSONDecodeError, without writing, if the file is corrupt.
+    """
+    path = path or resolve_library_path()
+    with _locked(path, exclusive=True):
+        library = _read(path)
+        result = mutator(library)
+        _write_atomic(path, library)
+    return library, result
+
+def diff_libraries(old, new):
+    """Compares two library lists by ReferenceID. Returns (added, changed, removed) lists of characters."""
+    old_map = {c.get("ReferenceID"): c for c in old}
+    new_map = {c.get("ReferenceID"): c for c in new}
+    added = [c for rid, c in new_map.items() if rid not in old_map]
+    changed = [c for rid, c in new_map.items() if rid in old_map and old_map[rid] != c]
+    removed = [c for rid, c in old_map.items() if rid not in new_map]
+    return added, changed, removed
+
+def next_reference_id(library):
+    """Returns the next free ReferenceID."""
+    return max((c.get("ReferenceID", 0) for c in library), default=0) + 1
+
+def upsert_character(library, character):
+    """Updates a character with the same Alias (keeping its ReferenceID) or appends it as new.
+    Returns True if an existing entry was updated."""
+    existing_index = next((i for i, c in enumerate(library) if c.get("Alias") == character["Alias"]), -1)
+    if existing_index >= 0:
+        character["ReferenceID"] = library[existing_index]["ReferenceID"]
+        library[existing_index] = character
+        return True
+    character["ReferenceID"] = next_reference_id(library)
+    library.append(character)
+    return False
+
+def voice_settings(character, variation=None):
+    """
+    Returns (voice, pitch, rate, volume) for a character's variation, or its Baseline when
+    'variation' is None. Raises KeyError for an unknown variation.
+    """
+    if variation is None:
+        settings = character.get("Baseline", {})
+    else:
+        settings = character.get("Variations", {})[variation]
+    return (character.get("ShortName"), settings.get("Pitch", "+0Hz"),
+            settings.get("Rate", "+0%"), settings.get("Volume", "+0%"))
+
+class CharacterStore:
+    """
+    Parsed, indexed view of characters.json for O(1) lookup by Alias or ReferenceID.
+    The file is only re-parsed when its mtime, size or inode changes, so repeated
+    lookups in one process cost a single os.stat().
+    """
+
+    def __init__(self, path=None):
+        self.path = path or resolve_library_path()
+        self._lock = threading.Lock()
+        self._stamp = None
+        self._characters = []
+        self._by_alias = {}
+        self._by_id = {}
+
+    def _refresh(self):
+        try:
+            st = os.stat(self.path)
+            stamp = (st.st_mtime_ns, st.st_size, st.st_ino)
+        except FileNotFoundError:
+            stamp = None
+
+        with self._lock:
+            if stamp is not None and stamp == self._stamp:
+                return
+            characters = load_library(self.path) if stamp is not None else []
+            self._characters = characters
+            self._by_alias = {c.get("Alias"): c for c in characters}
+            self._by_id = {c.get("ReferenceID"): c for c in characters}
+            self._stamp = stamp
+
+    def characters(self):
+        """Returns all characters (the cached list; do not modify it)."""
+        self._refresh()
+        return self._characters
+
+    def by_alias(self, alias):
+        self._refresh()
+        return self._by_alias.get(alias)
+
+    def by_reference_id(self, reference_id):
+        self._refresh()
+        try:
+            return self._by_id.get(int(reference_id))
+        except (TypeError, ValueError):
+            return None
+
+    def get(self, key):
+        """Looks a character up by Alias first, then by ReferenceID (e.g. '3')."""
+        return self.by_alias(key) or self.by_reference_id(key)
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+def get_store(path=None):
+    """Returns the process-wide CharacterStore for 'path' (default: the resolved library)."""
+    path = os.path.abspath(path or resolve_library_path())
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = _stores[path] = CharacterStore(path)
+        return store
@@ -32,45 +32,151 @@
 
 
 import argparse
+import asyncio
 import json
 import os
-import subprocess
+import re
 import sys 
+import time
+import args_utils
 
-# Path to the characters database
-CHARACTERS_FILE = "/home/user/projects/Text-to-Speech/voice-library/characters.json"
+DESCRIPTION = "Generate audio lines for a character."
 
 def load_character(alias):
-    """Loads character details from the JSON library."""
-    if not os.path.exists(CHARACTERS_FILE):
-        print(f"Error: {CHARACTERS_FILE} not found. Please run save_character.py first.")
+    """Loads character details (by Alias or ReferenceID) from the indexed, cached library."""
+    import character_library
+    store = character_library.get_store()
+    if not os.path.exists(store.path):
+        print(f"Error: {store.path} not found. Please run save_character.py first.")
         sys.exit(1)
 
-    with open(CHARACTERS_FILE, 'r') as f:
+    try:
+        char = store.get(alias)
+    except json.JSONDecodeError:
+        print(f"Error: Failed to decode {store.path}.")
+        sys.exit(1)
+
+    if char:
+        return char
+
+    print(f"Error: Character '{alias}' not found in {store.path}.")
+    sys.exit(1)
+
+def safe_folder_name(name):
+    """Sanitizes an alias for use as a folder name (e.g. 'Narrator - Deep' -> 'Narrator_Deep')."""
+    safe = re.sub(r'[^\w\s-]', '', name).strip()
+    return re.sub(r'[-\s]+', '_', safe) or "character"
+
+def variation_jobs(characters, output_dir, file_name, variations=None):
+    """Lists (alias, variation, outfile, voice, settings) for every file render_variations would write."""
+    jobs = []
+    for char in characters:
+        alias = char.get("Alias", "Unknown")
+        base_dir = output_dir if len(characters) == 1 else os.path.join(output_dir, safe_folder_name(alias))
+        for var_name, settings in char.get("Variations", {}).items():
+            if variations and var_name not in variations:
+                continue
+            outfile = os.path.join(base_dir, var_name, f"{file_name}.mp3")
+            jobs.append((alias, var_name, outfile, char.get("ShortName"), settings))
+    return jobs
+
+def queue_variations(characters, text, output_dir, file_name, variations=None, batch=None):
+    """Submits the same files as render_variations to the durable render queue. Returns the job ids."""
+    import render_queue
+    queue = render_queue.RenderQueue()
+    try:
+        return queue.submit_many([
+            {"text": text, "voice": voice, "outfile": outfile, "character": alias, "variation": var_name,
+             "pitch": settings.get("Pitch", "+0Hz"), "rate": settings.get("Rate", "+0%"),
+             "volume": settings.get("Volume", "+0%")}
+            for alias, var_name, outfile, voice, settings in variation_jobs(characters, output_dir, file_name, variations)
+        ], batch=batch or file_name)
+    finally:
+        queue.close()
+
+async def render_variations(characters, text, output_dir, file_name, variations=None, synthesizer=None, on_result=None):
+    """
+    Renders 'text' for every variation (or the given subset) of each character concurrently
+    through the shared Synthesizer. Files go to <output_dir>/<Variation>/<file_name>.mp3, or
+    <output_dir>/<Alias>/<Variation>/<file_name>.mp3 when more than one character is given.
+    'on_result(alias, variation, outfile, error)' is called as each file finishes.
+    Returns a list of (alias, variation, outfile, error) tuples; error is None on success.
+    """
+    import pronunciation
+    import tts_engine
+    synthesizer = synthesizer or tts_engine.get_synthesizer()
+    jobs = variation_jobs(characters, output_dir, file_name, variations)
+    # Global pronunciation lexicon plus each character's own entries
+    lexicons = {char.get("Alias", "Unknown"): pronunciation.for_character(char) for char in characters}
+
+    async def run(alias, var_name, outfile, voice, settings):
+        error = None
         try:
-            data = json.load(f)
-        except json.JSONDecodeError:
-            print(f"Error: Failed to decode {CHARACTERS_FILE}.")
+            await synthesizer.save(outfile, text, voice,
+                                   pitch=settings.get("Pitch", "+0Hz"),
+                                   rate=settings.get("Rate", "+0%"),
+                                   volume=settings.get("Volume", "+0%"),
+                                   lexicon=lexicons[alias])
+        except Exception as e:
+            error = str(e)
+        if on_result:
+            on_result(alias, var_name, outfile, error)
+        return alias, var_name, outfile, error
+
+    return await asyncio.gather(*(run(*job) for job in jobs))
+
+def run_batch(args):
+    """Handles --all-variations and multiple --alias values in one process."""
+    characters = [load_character(alias) for alias in args.alias]
+    for char in characters:
+        if not char.get("ShortName"):
+            print(f"Error: No voice ShortName found for character '{char.get('Alias')}'.")
             sys.exit(1)
 
-    # characters.json is a list of objects
-    for char in data:
-        if char.get("Alias") == alias:
-            return char
-            
-    print(f"Error: Character '{alias}' not found in {CHARACTERS_FILE}.")
-    sys.exit(1)
+    variations = None if args.all_variations else [args.variation]
+
+    if args.queue:
+        ids = queue_variations(characters, args.lines, args.output_dir, args.file_name, variations)
+        print(f"Queued {len(ids)} job(s) as batch '{args.file_name}'. Run 'render_queue.py daemon' to render them.")
+        return
+
+    def report(alias, var_name, outfile, error):
+        if error:
+            print(f"  [FAIL] {alias} / {var_name}: {error}")
+        else:
+            print(f"  [ OK ] {alias} / {var_name} -> {outfile}")
+
+    print(f"Rendering {len(characters)} character(s) concurrently...")
+    start = time.perf_counter()
+    import tts_engine
+    # Ctrl-C cancels every in-flight render; outputs are written atomically
+    results = tts_engine.run_cli(render_variations(characters, args.lines, args.output_dir, args.file_name,
+                                                   variations=variations, on_result=report))
+    failures = [r for r in results if r[3]]
+    print(f"Rendered {len(results) - len(failures)}/{len(results)} files in {time.perf_counter() - start:.1f}s.")
+    if failures:
+        sys.exit(1)
 
-def main():
-    parser = argparse.ArgumentParser(description="Generate audio lines for a character.")
-    parser.add_argument("--alias", required=True, help="Character alias (e.g., Yoda)")
-    parser.add_argument("--variation", required=True, help="Variation folder (e.g., Calm)")
+def add_arguments(parser):
+    parser.add_argument("--alias", required=True, action="append",
+                        help="Character alias or ReferenceID (e.g., Yoda). Repeat to render several characters.")
+    var_group = parser.add_mutually_exclusive_group(required=True)
+    var_group.add_argument("--variation", help="Variation folder (e.g., Calm)")
+    var_group.add_argument("--all-variations", action="store_true",
+                           help="Render the line for every variation of each character concurrently")
     parser.add_argument("--lines", required=True, help="Text content to generate")
     parser.add_argument("--output-dir", required=True, help="Base output directory")
     parser.add_argument("--file-name", required=True, help="Output filename (without extension)")
-    parser.add_argument("--play", action="store_true", help="Automatically play the generated audio")
+    parser.add_argument("--play", action="store_true", help="Automatically play the generated audio (single variation only)")
+    parser.add_argument("--queue", action="store_true",
+                        help="Add the files to the durable render queue instead of rendering now")
+
+def run(args):
+    if args.all_variations or len(args.alias) > 1 or args.queue:
+        run_batch(args)
+        return
 
-    args = parser.parse_args()
+    args.alias = args.alias[0]
 
     # Load character settings
     character = load_character(args.alias)
@@ -101,15 +207,18 @@ def main():
     os.makedirs(full_output_dir, exist_ok=True)
     output_file = os.path.join(full_output_dir, f"{args.file_name}.mp3")
 
-    # Call the generation script
-    # Use absolute path to sibling script to ensure it works from any CWD
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    gen_script = os.path.join(script_dir, "generate_speech_edge.py")
-    
-    cmd = [sys.executable, gen_script, args.lines, output_file, "--voice", voice, f"--pitch={pitch}", f"--rate={rate}", f"--volume={volume}"]
-    if args.play:
-        cmd.append("--play")
-    subprocess.run(cmd, check=True)
+    # Same process as generate_speech_edge.py (no second interpreter start-up)
+    import generate_speech_edge
+    import pronunciation
+    import tts_engine
+    tts_engine.run_cli(generate_speech_edge.speak(args_utils.get_text_content(args.lines), output_file, voice,
+                                                  pitch, rate, volume, play=args.play,
+                                                  lexicon=pronunciation.for_character(character)))
+
+def main():
+    parser = argparse.ArgumentParser(description=DESCRIPTION)
+    add_arguments(parser)
+    run(parser.parse_args())
 
 if __name__ == "__main__":
     main()
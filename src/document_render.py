@@ -0,0 +1,144 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# --- Script Summary ---
+# Responsibility: Incremental rendering of long documents. The text is split into sentences, each sentence
+#                 is synthesized (and cached) on its own, and the MP3 frames are joined into one file. A
+#                 manifest next to the output records each sentence's hash and byte range, so re-rendering
+#                 after an edit synthesizes only the sentences that are new or changed and copies the rest
+#                 from the previous output.
+# Usage: python generate_speech_edge.py script.txt script.mp3 --document
+#        (or: await document_render.render_document(text, "script.mp3", voice))
+# Manifest: <outfile>.segments.json
+# ----------------------
+
+# Copyright (C) 2025 steve.rock@wheelhouser.com
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#===============================================================================================================
+
+import asyncio
+import difflib
+import json
+import os
+import re
+import time
+import tts_engine
+
+MANIFEST_SUFFIX = ".segments.json"
+# Sentence end: terminal punctuation, optional closing quotes/brackets, then whitespace
+_SENTENCE_END = re.compile(r"[.!?…。！？]+[\"'”’)\]]*\s+")
+_PARAGRAPH = re.compile(r"\n\s*\n")
+# A period after these is not the end of a sentence
+_ABBREVIATIONS = {"mr", "mrs", "ms", "dr", "st", "prof", "sr", "jr", "vs", "etc", "e.g", "i.e", "no", "fig", "mt"}
+
+def split_sentences(text):
+    """
+    Splits text into sentences (paragraph breaks always end one). Whitespace inside a sentence is
+    collapsed, so re-wrapping a paragraph does not change its sentences.
+    """
+    sentences = []
+    for paragraph in _PARAGRAPH.split(text):
+        start = 0
+        for match in _SENTENCE_END.finditer(paragraph):
+            words = paragraph[start:match.start()].split()
+            if match.group().startswith(".") and words and words[-1].lower() in _ABBREVIATIONS:
+                continue
+            if paragraph[match.end():match.end() + 1].islower():  # '"Really?" she asked.'
+                continue
+            sentences.append(paragraph[start:match.end()])
+            start = match.end()
+        sentences.append(paragraph[start:])
+    return [s for s in (" ".join(s.split()) for s in sentences) if s]
+
+def manifest_path(outfile):
+    return outfile + MANIFEST_SUFFIX
+
+def _load_previous(outfile):
+    """The previous manifest's segments, or [] if it is missing or no longer matches the output file."""
+    try:
+        with open(manifest_path(outfile), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        st = os.stat(outfile)
+        if st.st_size != manifest["size"] or st.st_mtime_ns != manifest["mtime_ns"]:
+            return []  # The output was replaced by something else since
+        return manifest["segments"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return []
+
+async def render_document(text, outfile, voice=tts_engine.DEFAULT_VOICE, pitch="+0Hz", rate="+0%", volume="+0%",
+                          synthesizer=None, lexicon=None):
+    """
+    Renders 'text' to 'outfile' sentence by sentence, reusing every sentence whose text and prosody are
+    unchanged since the last render of 'outfile' (or that is in the synthesis cache). Returns a dict of counts.
+    Keys are taken after the pronunciation lexicon, so a lexicon edit re-renders the sentences it affects.
+    """
+    synthesizer = synthesizer or tts_engine.get_synthesizer()
+    started = time.perf_counter()
+    sentences = split_sentences(text)
+    if not sentences:
+        raise ValueError("The document has no text.")
+    keys = [synthesizer.key_for(s, voice, pitch, rate, volume, lexicon) for s in sentences]
+
+    previous = _load_previous(outfile)
+    old_keys = [segment["key"] for segment in previous]
+    diff = {"equal": 0, "replace": 0, "insert": 0, "delete": 0}
+    for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(None, old_keys, keys, autojunk=False).get_opcodes():
+        changed = min(i2 - i1, j2 - j1) if tag == "replace" else 0
+        diff["replace"] += changed
+        diff["equal"] += j2 - j1 if tag == "equal" else 0
+        diff["insert"] += j2 - j1 - changed if tag in ("replace", "insert") else 0
+        diff["delete"] += i2 - i1 - changed if tag in ("replace", "delete") else 0
+    if previous:
+        print(f"{len(sentences)} sentences: {diff['equal']} unchanged, {diff['replace']} changed, "
+              f"{diff['insert']} added, {diff['delete']} removed.")
+
+    # Unchanged sentences are copied out of the previous output (works even if the cache was cleared)
+    audio = [None] * len(sentences)
+    old_ranges = {segment["key"]: (segment["offset"], segment["length"]) for segment in previous}
+    reused = 0
+    if old_ranges:
+        with open(outfile, "rb") as f:
+            for i, key in enumerate(keys):
+                if key in old_ranges:
+                    offset, length = old_ranges[key]
+                    f.seek(offset)
+                    audio[i] = f.read(length)
+                    reused += 1
+
+    missing = [i for i, data in enumerate(audio) if data is None]
+    cached = sum(1 for i in missing if synthesizer.use_cache and synthesizer.cache.contains(keys[i]))
+    if len(missing) > cached:
+        print(f"Synthesizing {len(missing) - cached} sentence(s) ({cached} from the cache)...")
+    results = await asyncio.gather(*(synthesizer.synthesize(sentences[i], voice, pitch=pitch, rate=rate,
+                                                            volume=volume, lexicon=lexicon) for i in missing))
+    for i, data in zip(missing, results):
+        audio[i] = data
+
+    # Edge TTS sends bare MP3 frames, so the sentences join into one stream by concatenation
+    segments, offset = [], 0
+    for sentence, key, data in zip(sentences, keys, audio):
+        segments.append({"key": key, "offset": offset, "length": len(data), "text": sentence})
+        offset += len(data)
+    tts_engine.write_atomic(outfile, b"".join(audio))
+    st = os.stat(outfile)
+    manifest = {"version": 1, "voice": voice, "pitch": pitch, "rate": rate, "volume": volume,
+                "size": st.st_size, "mtime_ns": st.st_mtime_ns, "segments": segments}
+    tts_engine.write_atomic(manifest_path(outfile), json.dumps(manifest, ensure_ascii=False, indent=1).encode("utf-8"))
+
+    stats = {"sentences": len(sentences), "reused": reused, "cached": cached,
+             "synthesized": len(missing) - cached, "seconds": time.perf_counter() - started}
+    print(f"Rendered {stats['sentences']} sentences in {stats['seconds']:.1f}s: {stats['synthesized']} synthesized, "
+          f"{stats['cached']} from the cache, {stats['reused']} reused from the previous render.")
+    return stats
@@ -7,6 +7,7 @@
 # Examples:
 #   python generate_speech_edge.py "Always with you, what can't be done" output.mp3 --voice en-US-GuyNeural --pitch="-10Hz" --rate="-35%" --play
 #   python generate_speech_edge.py --list-voices
+#   python generate_speech_edge.py script.txt script.mp3 --document   # re-renders only changed sentences
 # ----------------------
 
 # Copyright (C) 2025 steve.rock@wheelhouser.com
@@ -35,63 +36,103 @@
 
 
 import json
-import asyncio
 import os
 import sys
-import edge_tts
 import args_utils
 
-# Ensure we can import play_audio from the current directory
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-from play_audio import play_audio
+DESCRIPTION = "Convert text to speech using Microsoft Edge TTS (High Quality)."
 
-async def main():
-    parser = args_utils.init_parser("Convert text to speech using Microsoft Edge TTS (High Quality).")
-    args_utils.add_text_arg(parser, required=False)
-    args_utils.add_outfile_arg(parser, required=False)
-    parser.add_argument("--voice", default="en-US-AriaNeural", help="Voice ID (default: en-US-AriaNeural)")
-    parser.add_argument("--list-voices", action="store_true", help="List available voices and exit")
-    parser.add_argument("--json", action="store_true", help="Output voices as JSON (use with --list-voices)")
-    args_utils.add_pitch_rate_args(parser)
-    args_utils.add_volume_arg(parser)
-    parser.add_argument("--play", action="store_true", help="Automatically play the generated audio")
-    args = parser.parse_args()
-
-    if args.list_voices:
-        voices = await edge_tts.list_voices()
-        if args.json:
-            for i, v in enumerate(voices, 1):
-                v['ID'] = i
-            print(json.dumps(voices, indent=2))
-            return
-        for v in voices:
-            print(f"{v['ShortName']} ({v['Gender']}) - {v['Locale']}")
+async def list_voices(as_json=False, locale=None, gender=None):
+    """Prints the online voice list, optionally filtered by locale prefix (e.g. 'en-GB') and gender."""
+    import edge_tts
+    voices = await edge_tts.list_voices()
+    if as_json:
+        for i, v in enumerate(voices, 1):
+            v['ID'] = i
+    voices = [v for v in voices
+              if (not locale or v['Locale'].lower().startswith(locale.lower()))
+              and (not gender or v['Gender'].lower() == gender.lower())]
+    if as_json:
+        print(json.dumps(voices, indent=2))
         return
+    for v in voices:
+        print(f"{v['ShortName']} ({v['Gender']}) - {v['Locale']}")
 
-    if not args.text or not args.outfile:
-        parser.print_help()
-        sys.exit(1)
-
-    # 1. Get Text
-    text = args_utils.get_text_content(args.text)
-
-    outfile = os.path.abspath(args.outfile)
+async def speak(text, outfile, voice, pitch="+0Hz", rate="+0%", volume="+0%", play=False, document=False,
+                lexicon=None):
+    """
+    Synthesizes 'text' to 'outfile' (optionally playing it). Used by 'tts speak' and character_lines.py.
+    With 'document', renders sentence by sentence and only re-synthesizes what changed (document_render.py).
+    'lexicon' is the pronunciation lexicon to apply (default: the global one, see pronunciation.py).
+    """
+    import tts_engine
+    outfile = os.path.abspath(outfile)
 
-    # 2. Generate Audio
     print("Connecting to Edge TTS...")
-    print(f"Voice: {args.voice}")
-    print(f"Params: Pitch={args.pitch}, Rate={args.rate}, Volume={args.volume}")
-    
+    print(f"Voice: {voice}")
+    print(f"Params: Pitch={pitch}, Rate={rate}, Volume={volume}")
+
     try:
-        communicate = edge_tts.Communicate(text, args.voice, pitch=args.pitch, rate=args.rate, volume=args.volume)
-        await communicate.save(outfile)
+        if document:
+            import document_render
+            await document_render.render_document(text, outfile, voice, pitch, rate, volume, lexicon=lexicon)
+        else:
+            await tts_engine.get_synthesizer().save(outfile, text, voice, pitch=pitch, rate=rate, volume=volume,
+                                                    lexicon=lexicon)
         print(f"Audio saved to: {outfile}")
 
-        if args.play:
+        if play:
+            from play_audio import play_audio, install_signal_handlers
+            install_signal_handlers()
             play_audio(outfile)
     except Exception as e:
         print(f"Error: {e}")
         sys.exit(1)
 
+def add_arguments(parser, with_list_voices=True):
+    args_utils.add_text_arg(parser, required=not with_list_voices)
+    args_utils.add_outfile_arg(parser, required=not with_list_voices)
+    parser.add_argument("--voice", default="en-US-AriaNeural", help="Voice ID (default: en-US-AriaNeural)")
+    if with_list_voices:
+        parser.add_argument("--list-voices", action="store_true", help="List available voices and exit")
+        parser.add_argument("--json", action="store_true", help="Output voices as JSON (use with --list-voices)")
+    args_utils.add_pitch_rate_args(parser)
+    args_utils.add_volume_arg(parser)
+    parser.add_argument("--play", action="store_true", help="Automatically play the generated audio")
+    parser.add_argument("--document", action="store_true",
+                        help="Render sentence by sentence; re-renders only synthesize sentences that changed")
+
+def add_speak_arguments(parser):
+    """'tts speak': text and outfile are required; voice listing is its own subcommand there."""
+    add_arguments(parser, with_list_voices=False)
+
+def add_voices_arguments(parser):
+    parser.add_argument("--json", action="store_true", help="Output voices as JSON")
+    parser.add_argument("--locale", help="Only voices whose locale starts with this (e.g. en, en-GB)")
+    parser.add_argument("--gender", choices=["Male", "Female"], help="Only voices of this gender")
+
+def run(args):
+    import tts_engine
+    if getattr(args, "list_voices", False):
+        tts_engine.run_cli(list_voices(args.json))
+        return
+
+    if not args.text or not args.outfile:
+        print("Error: text and outfile are required (or use --list-voices).")
+        sys.exit(1)
+
+    tts_engine.run_cli(speak(args_utils.get_text_content(args.text), args.outfile, args.voice,
+                             args.pitch, args.rate, args.volume, play=args.play,
+                             document=args.document))
+
+def run_voices(args):
+    import tts_engine
+    tts_engine.run_cli(list_voices(args.json, args.locale, args.gender))
+
+def main():
+    parser = args_utils.init_parser(DESCRIPTION)
+    add_arguments(parser)
+    run(parser.parse_args())
+
 if __name__ == "__main__":
-    asyncio.run(main())
+    main()
@@ -34,39 +34,24 @@
 
 import os
 import sys
-import time
-import subprocess
-import shutil
 import signal
 import args_utils
-import warnings
 
-child_process = None
-
-# Suppress the specific UserWarning from pygame about pkg_resources
-warnings.filterwarnings("ignore", category=UserWarning, message=".*pkg_resources is deprecated.*")
+DESCRIPTION = "Simple Audio Player"
 
 def signal_handler(sig, frame):
-    """Gracefully terminate the child process or pygame."""
-    global child_process
-    if child_process and child_process.poll() is None:
-        child_process.terminate()
-    
-    try:
-        import pygame
-        if pygame.mixer.get_init() and pygame.mixer.music.get_busy():
-            pygame.mixer.music.stop()
-    except (ImportError, pygame.error):
-        pass
-    
+    """Gracefully stop the shared playback engine (pygame or child player process)."""
+    import audio_engine
+    audio_engine.get_engine().stop()
     sys.exit(0)
 
-# Register the signal handler for termination signals
-signal.signal(signal.SIGTERM, signal_handler)
-signal.signal(signal.SIGINT, signal_handler)
+def install_signal_handlers():
+    """Stops playback cleanly on SIGTERM/SIGINT. Called by the command line entry points, not on import."""
+    signal.signal(signal.SIGTERM, signal_handler)
+    signal.signal(signal.SIGINT, signal_handler)
 
 def play_audio(file_path):
-    global child_process
+    import audio_engine
     file_path = os.path.abspath(file_path)
     if not os.path.exists(file_path):
         print(f"Error: File not found: {file_path}")
@@ -74,63 +59,25 @@ def play_audio(file_path):
 
     print(f"Playing: {file_path}")
 
-    # 1. Try Pygame (Best Python-native option)
-    # Requires: pip install pygame
+    # The engine tries Pygame first (mixer initialized once per process), then a
+    # system player (paplay, mpg123, afplay, aplay, ffplay, flatpak-spawn) discovered once.
     try:
-        # Suppress pygame welcome message
-        os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = "hide"
-        import pygame
-        pygame.mixer.init()
-        pygame.mixer.music.load(file_path)
-        pygame.mixer.music.play()
-        
-        # Keep script running while music plays
-        while pygame.mixer.music.get_busy():
-            time.sleep(0.1)
-        return
-    except ImportError:
-        pass # Pygame not installed, try fallbacks
-    except Exception as e:
-        print(f"Pygame playback failed: {e}")
-
-    # 2. Try System Players (Linux/macOS fallback)
-    # paplay = PulseAudio (Standard on Fedora/Ubuntu)
-    # aplay = ALSA (Linux)
-    # afplay = macOS
-    # ffplay = FFmpeg
-    players = [
-        ("paplay", []),
-        ("mpg123", []),
-        ("afplay", []),
-        ("aplay", []),
-        ("ffplay", ["-nodisp", "-autoexit", "-hide_banner"]),
-    ]
+        audio_engine.get_engine().play([file_path])
+    except audio_engine.NoPlayerError:
+        print("Error: Could not play audio. Please install 'pygame' (pip install pygame).")
+        sys.exit(1)
 
-    for player_cmd, args in players:
-        if shutil.which(player_cmd):
-            try:
-                child_process = subprocess.Popen([player_cmd] + args + [file_path], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-                child_process.wait()
-                return
-            except (subprocess.CalledProcessError, FileNotFoundError):
-                continue
+def add_arguments(parser):
+    parser.add_argument("file", help="Path to the audio file to play")
 
-    # 3. Flatpak Fallback (For VS Code sandbox)
-    if shutil.which("flatpak-spawn"):
-        print("Detecting Flatpak environment. Attempting to play on host...")
-        try:
-            child_process = subprocess.Popen(["flatpak-spawn", "--host", "paplay", file_path], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-            child_process.wait()
-            return
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            print("Failed to play via flatpak-spawn.")
+def run(args):
+    install_signal_handlers()
+    play_audio(args.file)
 
-    print("Error: Could not play audio. Please install 'pygame' (pip install pygame).")
-    sys.exit(1)
+def main():
+    parser = args_utils.init_parser(DESCRIPTION)
+    add_arguments(parser)
+    run(parser.parse_args())
 
 if __name__ == "__main__":
-    parser = args_utils.init_parser("Simple Audio Player")
-    parser.add_argument("file", help="Path to the audio file to play")
-    args = parser.parse_args()
-
-    play_audio(args.file)
+    main()
@@ -0,0 +1,254 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# --- Script Summary ---
+# Responsibility: Pronunciation lexicons: substitutions or phonetic respellings ("Nguyen" -> "Win") applied
+#                 to the text before it is synthesized. There is one global lexicon and each character in
+#                 characters.json can add or override entries with a "Lexicon" object. All terms are compiled
+#                 into one Aho-Corasick automaton, so applying tens of thousands of entries costs one pass
+#                 over the text. The cache key is taken over the substituted text, so editing an entry only
+#                 re-synthesizes lines that contain it.
+# Usage: import pronunciation
+#   pronunciation.get_lexicon().apply("Dr. Nguyen uses nginx")     -> "Dr. Win uses engine x"
+#   pronunciation.for_character("Narrator - Deep").apply(text)
+#   python pronunciation.py add Nguyen Win                           (edit the global lexicon)
+#   python pronunciation.py test "Dr. Nguyen uses nginx" [--character ALIAS]
+# Global lexicon: <user data>/pronunciation.json (or TTS_LEXICON), a JSON object of term -> replacement.
+# Matching ignores case and only replaces whole words (a term must not be part of a longer word).
+# ----------------------
+
+# Copyright (C) 2025 steve.rock@wheelhouser.com
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#===============================================================================================================
+
+import argparse
+import collections
+import json
+import os
+import sys
+import threading
+import app_paths
+
+def default_lexicon_path():
+    return os.environ.get("TTS_LEXICON") or os.path.join(app_paths.user_data_dir(), "pronunciation.json")
+
+def _fold(ch):
+    # Per-character lowercase that never changes the length, so match positions map back onto the text
+    low = ch.lower()
+    return low if len(low) == 1 else ch
+
+def _is_word(ch):
+    return ch.isalnum() or ch == "_"
+
+class Lexicon:
+    """A compiled set of term -> replacement entries. Immutable once built; empty lexicons are falsy."""
+
+    def __init__(self, entries=None):
+        self.entries = {}
+        for term, replacement in (entries or {}).items():
+            key = "".join(_fold(c) for c in str(term).strip())
+            if key:
+                self.entries[key] = str(replacement)
+        self._compile()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _compile(self):
+        # Trie: node -> {char: child}; 'terminal' holds the term ending at a node (or None)
+        goto = [{}]
+        terminal = [None]
+        for term in self.entries:
+            node = 0
+            for ch in term:
+                child = goto[node].get(ch)
+                if child is None:
+                    child = len(goto)
+                    goto[node][ch] = child
+                    goto.append({})
+                    terminal.append(None)
+                node = child
+            terminal[node] = term
+
+        # Failure links (longest proper suffix that is also a trie path) and output links
+        # (nearest node on the failure chain that ends a term), built breadth-first
+        fail = [0] * len(goto)
+        output = [0] * len(goto)
+        queue = collections.deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in goto[node].items():
+                state = fail[node]
+                while state and ch not in goto[state]:
+                    state = fail[state]
+                target = goto[state].get(ch, 0)
+                fail[child] = target if target != child else 0
+                output[child] = fail[child] if terminal[fail[child]] is not None else output[fail[child]]
+                queue.append(child)
+        self._goto, self._fail, self._terminal, self._output = goto, fail, terminal, output
+
+    def matches(self, text):
+        """Yields (start, end, term) for every whole-word occurrence of a term, leftmost-longest, not overlapping."""
+        if not self.entries:
+            return
+        goto, fail, terminal, output = self._goto, self._fail, self._terminal, self._output
+        longest = {}  # start -> end of the longest whole-word match starting there
+        node = 0
+        n = len(text)
+        for i, ch in enumerate(text):
+            ch = _fold(ch)
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            end = i + 1
+            if end < n and _is_word(text[end]) and _is_word(text[i]):
+                continue  # Inside a word: nothing may end here
+            state = node if terminal[node] is not None else output[node]
+            while state:
+                start = end - len(terminal[state])
+                if start == 0 or not (_is_word(text[start - 1]) and _is_word(text[start])):
+                    if end > longest.get(start, 0):
+                        longest[start] = end
+                state = output[state]
+        position = 0
+        for start in sorted(longest):
+            if start >= position:
+                end = longest[start]
+                yield start, end, "".join(_fold(c) for c in text[start:end])
+                position = end
+
+    def apply(self, text):
+        """Returns 'text' with every term replaced by its respelling."""
+        if not self.entries:
+            return text
+        parts, position = [], 0
+        for start, end, term in self.matches(text):
+            parts.append(text[position:start])
+            parts.append(self.entries[term])
+            position = end
+        if not parts:
+            return text
+        parts.append(text[position:])
+        return "".join(parts)
+
+    def merged(self, entries):
+        """A new Lexicon with 'entries' added on top (they win over existing terms)."""
+        combined = dict(self.entries)
+        combined.update({"".join(_fold(c) for c in str(k).strip()): str(v) for k, v in entries.items()})
+        return Lexicon(combined)
+
+EMPTY = Lexicon()
+
+def load_entries(path=None):
+    """Reads a lexicon file: a JSON object of term -> replacement. Missing file: {}."""
+    path = path or default_lexicon_path()
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        print(f"Ignoring pronunciation lexicon {path}: {e}")
+        return {}
+    if not isinstance(data, dict):
+        print(f"Ignoring pronunciation lexicon {path}: expected a JSON object of term -> replacement.")
+        return {}
+    return data
+
+def save_entries(entries, path=None):
+    import tts_engine
+    path = path or default_lexicon_path()
+    data = json.dumps(dict(sorted(entries.items(), key=lambda kv: kv[0].lower())), ensure_ascii=False, indent=2)
+    tts_engine.write_atomic(path, data.encode("utf-8"))
+
+_lock = threading.Lock()
+_global = {"path": None, "stamp": None, "lexicon": EMPTY}
+_per_character = {}  # (global stamp, character entries as a sorted tuple) -> Lexicon
+
+def get_lexicon():
+    """The global lexicon, compiled once and rebuilt only when its file changes (one os.stat per call)."""
+    path = default_lexicon_path()
+    try:
+        st = os.stat(path)
+        stamp = (path, st.st_mtime_ns, st.st_size)
+    except OSError:
+        stamp = (path, None, None)
+    with _lock:
+        if _global["stamp"] != stamp:
+            _global["lexicon"] = Lexicon(load_entries(path)) if stamp[1] is not None else EMPTY
+            _global["stamp"] = stamp
+            _per_character.clear()
+        return _global["lexicon"]
+
+def for_character(character):
+    """
+    The global lexicon plus the character's own "Lexicon" entries. 'character' is a character dict or an
+    Alias/ReferenceID; unknown characters and None get the global lexicon.
+    """
+    base = get_lexicon()
+    if character is not None and not isinstance(character, dict):
+        import character_library
+        character = character_library.get_store().get(str(character))
+    entries = (character or {}).get("Lexicon") or {}
+    if not entries:
+        return base
+    key = (_global["stamp"], tuple(sorted(entries.items())))
+    with _lock:
+        lexicon = _per_character.get(key)
+        if lexicon is None:
+            lexicon = _per_character[key] = base.merged(entries)
+        return lexicon
+
+def main():
+    parser = argparse.ArgumentParser(description="Edit and test the global pronunciation lexicon.")
+    parser.add_argument("--file", help="Lexicon file (default: TTS_LEXICON or the user data dir)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("add", help="Add or change an entry")
+    p.add_argument("term")
+    p.add_argument("replacement", help="Substitution or phonetic respelling, e.g. 'Win' for 'Nguyen'")
+    p = sub.add_parser("remove", help="Remove an entry")
+    p.add_argument("term")
+    sub.add_parser("list", help="Print every entry")
+    p = sub.add_parser("test", help="Print text as it will be sent to the engine")
+    p.add_argument("text", help="Text or path to a text file")
+    p.add_argument("--character", help="Also apply this character's entries (Alias or ReferenceID)")
+    args = parser.parse_args()
+
+    if args.file:
+        os.environ["TTS_LEXICON"] = args.file
+    path = default_lexicon_path()
+    entries = load_entries(path)
+
+    if args.command == "add":
+        entries = {k: v for k, v in entries.items() if k.lower() != args.term.lower()}
+        entries[args.term] = args.replacement
+        save_entries(entries, path)
+        print(f"{args.term} -> {args.replacement} ({len(entries)} entries in {path})")
+    elif args.command == "remove":
+        remaining = {k: v for k, v in entries.items() if k.lower() != args.term.lower()}
+        if len(remaining) == len(entries):
+            print(f"'{args.term}' is not in {path}.")
+            sys.exit(1)
+        save_entries(remaining, path)
+        print(f"Removed '{args.term}' ({len(remaining)} entries left).")
+    elif args.command == "list":
+        for term, replacement in sorted(entries.items(), key=lambda kv: kv[0].lower()):
+            print(f"{term} -> {replacement}")
+    elif args.command == "test":
+        import args_utils
+        print(for_character(args.character).apply(args_utils.get_text_content(args.text)))
+
+if __name__ == "__main__":
+    main()
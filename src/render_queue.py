@@ -0,0 +1,459 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# --- Script Summary ---
+# Responsibility: Durable render queue. Jobs live in SQLite, a single daemon works through them with a
+#                 bounded pool, every state change is committed, and an interrupted daemon resumes where
+#                 it stopped. Submit from the CLI (or the GUI's "Queue Render..." button), watch with status.
+# Usage: python render_queue.py {daemon,submit,submit-file,status,list,cancel,retry} ...
+# Examples:
+#   python render_queue.py daemon --workers 4 &
+#   python render_queue.py submit --text "Hello" --voice en-US-GuyNeural --outfile out/hello.mp3
+#   python render_queue.py submit --text "Hello" --character "Narrator - Deep" --variation Calm --outfile out/calm.mp3
+#   python render_queue.py submit-file lines.txt --voice en-US-AriaNeural --output-dir out/ --batch chapter1
+#   python render_queue.py status
+#   python render_queue.py cancel --batch chapter1
+# ----------------------
+
+# Copyright (C) 2025 steve.rock@wheelhouser.com
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#===============================================================================================================
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import sqlite3
+import sys
+import time
+import app_paths
+import args_utils
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+QUEUED, RUNNING, CANCELLING, DONE, FAILED, CANCELLED = "queued", "running", "cancelling", "done", "failed", "cancelled"
+STATES = (QUEUED, RUNNING, CANCELLING, DONE, FAILED, CANCELLED)
+DEFAULT_MAX_ATTEMPTS = 3
+POLL_SECONDS = 1.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    state       TEXT NOT NULL DEFAULT 'queued',
+    text        TEXT NOT NULL,
+    voice       TEXT NOT NULL,
+    pitch       TEXT NOT NULL DEFAULT '+0Hz',
+    rate        TEXT NOT NULL DEFAULT '+0%',
+    volume      TEXT NOT NULL DEFAULT '+0%',
+    outfile     TEXT NOT NULL,
+    character   TEXT,
+    variation   TEXT,
+    batch       TEXT,
+    priority    INTEGER NOT NULL DEFAULT 0,
+    attempts    INTEGER NOT NULL DEFAULT 0,
+    error       TEXT,
+    created_at  REAL NOT NULL,
+    started_at  REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_pending ON jobs (state, priority DESC, id);
+CREATE INDEX IF NOT EXISTS jobs_batch ON jobs (batch);
+"""
+
+def default_db_path():
+    return os.environ.get("TTS_QUEUE_DB") or os.path.join(app_paths.user_data_dir(), "render_queue.db")
+
+class RenderQueue:
+    """The SQLite job table. Safe to open from several processes (WAL mode); one daemon runs the jobs."""
+
+    def __init__(self, path=None):
+        self.path = path or default_db_path()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    # --- Submitting ---
+    def submit_many(self, jobs, batch=None, priority=0):
+        """
+        Adds jobs in one transaction. Each job is a dict with text, voice, outfile and optionally
+        pitch, rate, volume, character, variation. Returns the new ids.
+        """
+        now = time.time()
+        ids = []
+        with self.db:
+            self.db.execute("BEGIN IMMEDIATE")
+            for job in jobs:
+                cur = self.db.execute(
+                    "INSERT INTO jobs (text, voice, pitch, rate, volume, outfile, character, variation, batch,"
+                    " priority, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (job["text"], job["voice"], job.get("pitch", "+0Hz"), job.get("rate", "+0%"),
+                     job.get("volume", "+0%"), os.path.abspath(job["outfile"]), job.get("character"),
+                     job.get("variation"), job.get("batch", batch), job.get("priority", priority), now))
+                ids.append(cur.lastrowid)
+        return ids
+
+    def submit(self, text, voice, outfile, **options):
+        return self.submit_many([dict(options, text=text, voice=voice, outfile=outfile)])[0]
+
+    # --- Inspecting ---
+    def counts(self, batch=None):
+        sql = "SELECT state, COUNT(*) FROM jobs" + (" WHERE batch = ?" if batch else "") + " GROUP BY state"
+        return dict(self.db.execute(sql, (batch,) if batch else ()).fetchall())
+
+    def jobs(self, state=None, batch=None, limit=20):
+        where, params = [], []
+        if state:
+            where.append("state = ?")
+            params.append(state)
+        if batch:
+            where.append("batch = ?")
+            params.append(batch)
+        sql = "SELECT * FROM jobs" + (" WHERE " + " AND ".join(where) if where else "") + " ORDER BY id DESC LIMIT ?"
+        return self.db.execute(sql, params + [limit]).fetchall()
+
+    def get(self, job_id):
+        return self.db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+
+    # --- Control ---
+    def cancel(self, ids=None, batch=None):
+        """Cancels queued jobs outright and asks the daemon to stop running ones. Returns the number affected."""
+        if ids:
+            where, params = f"id IN ({','.join('?' * len(ids))})", list(ids)
+        elif batch:
+            where, params = "batch = ?", [batch]
+        else:
+            where, params = "1", []
+        with self.db:
+            self.db.execute("BEGIN IMMEDIATE")
+            n = self.db.execute(f"UPDATE jobs SET state = ?, finished_at = ? WHERE state = ? AND {where}",
+                                [CANCELLED, time.time(), QUEUED] + params).rowcount
+            n += self.db.execute(f"UPDATE jobs SET state = ? WHERE state = ? AND {where}",
+                                 [CANCELLING, RUNNING] + params).rowcount
+        return n
+
+    def retry(self, ids=None, batch=None):
+        """Re-queues failed and cancelled jobs. Returns the number re-queued."""
+        where, params = "1", []
+        if ids:
+            where, params = f"id IN ({','.join('?' * len(ids))})", list(ids)
+        elif batch:
+            where, params = "batch = ?", [batch]
+        with self.db:
+            return self.db.execute(
+                f"UPDATE jobs SET state = ?, attempts = 0, error = NULL, started_at = NULL, finished_at = NULL"
+                f" WHERE state IN (?, ?) AND {where}", [QUEUED, FAILED, CANCELLED] + params).rowcount
+
+    # --- Daemon side ---
+    def recover(self):
+        """Puts jobs left running by a daemon that died back in the queue. Returns how many."""
+        with self.db:
+            self.db.execute("BEGIN IMMEDIATE")
+            n = self.db.execute("UPDATE jobs SET state = ? WHERE state = ?", (QUEUED, RUNNING)).rowcount
+            self.db.execute("UPDATE jobs SET state = ?, finished_at = ? WHERE state = ?",
+                            (CANCELLED, time.time(), CANCELLING))
+        return n
+
+    def claim(self, n):
+        """Atomically moves up to 'n' queued jobs to running and returns them."""
+        if n <= 0:
+            return []
+        with self.db:
+            self.db.execute("BEGIN IMMEDIATE")
+            return self.db.execute(
+                "UPDATE jobs SET state = ?, started_at = ?, attempts = attempts + 1 WHERE id IN"
+                " (SELECT id FROM jobs WHERE state = ? ORDER BY priority DESC, id LIMIT ?) RETURNING *",
+                (RUNNING, time.time(), QUEUED, n)).fetchall()
+
+    def cancel_requested(self, ids):
+        if not ids:
+            return []
+        rows = self.db.execute(f"SELECT id FROM jobs WHERE state = ? AND id IN ({','.join('?' * len(ids))})",
+                               [CANCELLING] + list(ids)).fetchall()
+        return [r[0] for r in rows]
+
+    def finish(self, job_id, state, error=None):
+        with self.db:
+            self.db.execute("UPDATE jobs SET state = ?, error = ?, finished_at = ? WHERE id = ?",
+                            (state, error, time.time(), job_id))
+
+    def requeue(self, job_id, error=None):
+        with self.db:
+            self.db.execute("UPDATE jobs SET state = ?, error = ? WHERE id = ?", (QUEUED, error, job_id))
+
+    def release(self, job_id):
+        """Puts a job interrupted by daemon shutdown back in the queue, giving back the attempt claim() counted."""
+        with self.db:
+            self.db.execute("UPDATE jobs SET state = ?, attempts = MAX(0, attempts - 1) WHERE id = ?",
+                            (QUEUED, job_id))
+
+class DaemonLock:
+    """Non-blocking exclusive lock on '<db>.daemon.lock' so only one daemon works a queue."""
+
+    def __init__(self, db_path):
+        self.path = db_path + ".daemon.lock"
+        self.fd = None
+
+    def acquire(self):
+        self.fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if fcntl:
+                fcntl.flock(self.fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                msvcrt.locking(self.fd, msvcrt.LK_NBLCK, 1)
+        except OSError:
+            os.close(self.fd)
+            self.fd = None
+            return False
+        return True
+
+    def release(self):
+        if self.fd is not None:
+            os.close(self.fd)  # Closing drops the lock
+            self.fd = None
+
+async def run_daemon(queue, workers, max_attempts=DEFAULT_MAX_ATTEMPTS, exit_when_idle=False, synthesizer=None):
+    """Works through the queue with at most 'workers' concurrent jobs until SIGINT/SIGTERM."""
+    import pronunciation
+    import tts_engine
+    synthesizer = synthesizer or tts_engine.Synthesizer(concurrency=workers)
+    loop = asyncio.get_running_loop()
+    stopping = asyncio.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stopping.set)
+        except (NotImplementedError, RuntimeError):  # Windows / not the main thread
+            pass
+
+    recovered = queue.recover()
+    if recovered:
+        print(f"Resuming {recovered} job(s) interrupted by the last shutdown.")
+
+    running = {}  # job id -> task
+
+    async def run_job(job):
+        try:
+            await synthesizer.save(job["outfile"], job["text"], job["voice"],
+                                   pitch=job["pitch"], rate=job["rate"], volume=job["volume"],
+                                   lexicon=pronunciation.for_character(job["character"]))
+        except asyncio.CancelledError:
+            if stopping.is_set():
+                queue.release(job["id"])  # Daemon shutdown: resume it next time, without using up an attempt
+            else:
+                queue.finish(job["id"], CANCELLED)
+            return
+        except Exception as e:
+            if job["attempts"] < max_attempts:
+                queue.requeue(job["id"], str(e))
+                print(f"[retry] #{job['id']} (attempt {job['attempts']}/{max_attempts}): {e}")
+            else:
+                queue.finish(job["id"], FAILED, str(e))
+                print(f"[FAIL] #{job['id']} {job['outfile']}: {e}")
+            return
+        queue.finish(job["id"], DONE)
+        print(f"[ OK ] #{job['id']} {job['outfile']}")
+
+    while not stopping.is_set():
+        for job_id in queue.cancel_requested(list(running)):
+            running[job_id].cancel()
+
+        for job in queue.claim(workers - len(running)):
+            running[job["id"]] = asyncio.create_task(run_job(job))
+
+        if not running and exit_when_idle:
+            break
+
+        stop_wait = asyncio.create_task(stopping.wait())
+        done, _ = await asyncio.wait(list(running.values()) + [stop_wait], timeout=POLL_SECONDS,
+                                     return_when=asyncio.FIRST_COMPLETED)
+        stop_wait.cancel()
+        for job_id in [i for i, t in running.items() if t.done()]:
+            del running[job_id]
+
+    if running:
+        print(f"Stopping; {len(running)} running job(s) will resume on the next start.")
+        for task in running.values():
+            task.cancel()
+        await asyncio.gather(*running.values(), return_exceptions=True)
+
+def read_job_file(path, voice=None, output_dir=None, character=None, variation=None):
+    """
+    Reads jobs from a .jsonl file (one object per line: text, outfile and voice or character/variation)
+    or a plain text file (one line of text per job, written to <output_dir>/line_00001.mp3, ...).
+    """
+    import character_library
+    store = character_library.get_store()
+    jobs = []
+    with open(path, "r", encoding="utf-8") as f:
+        for n, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            if path.lower().endswith(".jsonl"):
+                job = json.loads(line)
+            else:
+                if not output_dir:
+                    raise ValueError("--output-dir is required for plain text job files.")
+                job = {"text": line, "outfile": os.path.join(output_dir, f"line_{n:05d}.mp3")}
+            job.setdefault("character", character)
+            job.setdefault("variation", variation)
+            if job.get("character"):
+                char = store.get(job["character"])
+                if not char:
+                    raise ValueError(f"Line {n}: character '{job['character']}' not found.")
+                job["voice"], job["pitch"], job["rate"], job["volume"] = \
+                    character_library.voice_settings(char, job.get("variation"))
+            job.setdefault("voice", voice)
+            if not job.get("voice") or not job.get("text") or not job.get("outfile"):
+                raise ValueError(f"Line {n}: each job needs text, outfile and a voice or character.")
+            jobs.append(job)
+    return jobs
+
+def print_status(queue, batch=None):
+    counts = queue.counts(batch)
+    total = sum(counts.values())
+    finished = counts.get(DONE, 0) + counts.get(FAILED, 0) + counts.get(CANCELLED, 0)
+    print(f"Queue: {queue.path}" + (f" (batch {batch})" if batch else ""))
+    print("  " + "  ".join(f"{s}: {counts.get(s, 0)}" for s in STATES))
+    if total:
+        print(f"  {finished}/{total} finished ({finished * 100 // total}%)")
+    failed = queue.jobs(state=FAILED, batch=batch, limit=5)
+    if failed:
+        print("Recent failures:")
+        for job in failed:
+            print(f"  #{job['id']} {job['outfile']}: {job['error']}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Durable SQLite-backed render queue.")
+    parser.add_argument("--db", default=None, help="Queue database (default: TTS_QUEUE_DB or the user data dir)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("daemon", help="Run queued jobs; resumes interrupted work on start")
+    p.add_argument("--workers", type=int, default=4, help="Concurrent jobs (default: 4)")
+    p.add_argument("--max-attempts", type=int, default=DEFAULT_MAX_ATTEMPTS,
+                   help=f"Tries per job before it is marked failed (default: {DEFAULT_MAX_ATTEMPTS})")
+    p.add_argument("--exit-when-idle", action="store_true", help="Exit once the queue is empty")
+
+    p = sub.add_parser("submit", help="Queue one line")
+    p.add_argument("--text", required=True, help="The text to synthesize or path to a text file")
+    p.add_argument("--outfile", required=True, help="Output MP3 path")
+    p.add_argument("--voice", help="Voice ShortName (or use --character)")
+    p.add_argument("--character", help="Character alias or ReferenceID")
+    p.add_argument("--variation", help="Character variation (default: Baseline)")
+    args_utils.add_pitch_rate_args(p)
+    args_utils.add_volume_arg(p)
+    p.add_argument("--batch", help="Batch name for status/cancel")
+    p.add_argument("--priority", type=int, default=0, help="Higher runs first (default: 0)")
+
+    p = sub.add_parser("submit-file", help="Queue many lines from a .jsonl or plain text file")
+    p.add_argument("file")
+    p.add_argument("--voice", help="Voice for lines that don't specify one")
+    p.add_argument("--character", help="Character for lines that don't specify a voice")
+    p.add_argument("--variation", help="Character variation (default: Baseline)")
+    p.add_argument("--output-dir", help="Output directory for plain text files")
+    p.add_argument("--batch", help="Batch name (default: the file name)")
+    p.add_argument("--priority", type=int, default=0)
+
+    p = sub.add_parser("status", help="Show job counts and recent failures")
+    p.add_argument("--batch")
+
+    p = sub.add_parser("list", help="List jobs, newest first")
+    p.add_argument("--state", choices=STATES)
+    p.add_argument("--batch")
+    p.add_argument("-n", type=int, default=20)
+
+    for name, help_text in (("cancel", "Cancel queued/running jobs"), ("retry", "Re-queue failed/cancelled jobs")):
+        p = sub.add_parser(name, help=help_text)
+        p.add_argument("ids", nargs="*", type=int)
+        p.add_argument("--batch")
+        p.add_argument("--all", action="store_true", help="Apply to every job")
+
+    args = parser.parse_args()
+    queue = RenderQueue(args.db)
+
+    if args.command == "daemon":
+        lock = DaemonLock(queue.path)
+        if not lock.acquire():
+            print(f"Error: a daemon is already running for {queue.path}.")
+            sys.exit(1)
+        print(f"Render queue daemon on {queue.path} with {args.workers} worker(s). Ctrl-C to stop.")
+        try:
+            import tts_profiling
+            with tts_profiling.profiled("render-queue"), tts_profiling.traced_memory("render-queue"):
+                asyncio.run(run_daemon(queue, args.workers, args.max_attempts, args.exit_when_idle))
+        finally:
+            lock.release()
+        print_status(queue)
+
+    elif args.command == "submit":
+        job = {"text": args_utils.get_text_content(args.text), "outfile": args.outfile, "pitch": args.pitch,
+               "rate": args.rate, "volume": args.volume, "voice": args.voice}
+        if args.character:
+            import character_library
+            char = character_library.get_store().get(args.character)
+            if not char:
+                print(f"Error: Character '{args.character}' not found.")
+                sys.exit(1)
+            try:
+                job["voice"], job["pitch"], job["rate"], job["volume"] = \
+                    character_library.voice_settings(char, args.variation)
+            except KeyError:
+                print(f"Error: Variation '{args.variation}' not found for '{args.character}'.")
+                sys.exit(1)
+            job.update(character=char.get("Alias"), variation=args.variation)
+        if not job["voice"]:
+            print("Error: --voice or --character is required.")
+            sys.exit(1)
+        job_id = queue.submit_many([job], batch=args.batch, priority=args.priority)[0]
+        print(f"Queued job #{job_id}.")
+
+    elif args.command == "submit-file":
+        try:
+            jobs = read_job_file(args.file, args.voice, args.output_dir, args.character, args.variation)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        batch = args.batch or os.path.basename(args.file)
+        ids = queue.submit_many(jobs, batch=batch, priority=args.priority)
+        print(f"Queued {len(ids)} job(s) as batch '{batch}'.")
+
+    elif args.command == "status":
+        print_status(queue, args.batch)
+
+    elif args.command == "list":
+        for job in queue.jobs(args.state, args.batch, args.n):
+            print(f"#{job['id']:<6} {job['state']:<10} {job['voice']:<28} {job['outfile']}"
+                  + (f"  ({job['error']})" if job["error"] else ""))
+
+    elif args.command in ("cancel", "retry"):
+        if not (args.ids or args.batch or args.all):
+            print("Error: give job ids, --batch or --all.")
+            sys.exit(1)
+        action = queue.cancel if args.command == "cancel" else queue.retry
+        n = action(ids=args.ids or None, batch=args.batch)
+        print(f"{'Cancelled' if args.command == 'cancel' else 'Re-queued'} {n} job(s).")
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,8 @@
 # Examples:
 #   python review_samples.py ./samples
 #   python review_samples.py ./output --saved-folder keepers --rejected-folder trash
+#   python review_samples.py ./sweep        # a packed sweep (samples.pack): plays from the pack, records
+#                                           # decisions in its index and extracts saved samples to 'saved'
 # ----------------------
 
 # Copyright (C) 2025 steve.rock@wheelhouser.com
@@ -33,31 +35,102 @@
 #===============================================================================================================
 
 import os
-import shutil
 import sys
 import args_utils
 
-# Ensure we can import play_audio from the current directory
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+DESCRIPTION = "Review audio samples: Play, Save, or Reject."
 
-try:
-    from play_audio import play_audio
-except ImportError:
-    print("Error: play_audio.py not found. Please ensure it is in the same directory.")
-    sys.exit(1)
-
-def main():
-    parser = args_utils.init_parser("Review audio samples: Play, Save, or Reject.")
+def add_arguments(parser):
     parser.add_argument("directory", help="Directory containing audio files to review")
     parser.add_argument("--saved-folder", default="saved", help="Name of the subfolder for saved files")
     parser.add_argument("--rejected-folder", default="rejected", help="Name of the subfolder for rejected files")
-    args = parser.parse_args()
+    parser.add_argument("--prefetch", type=int, default=3, help="Number of upcoming files to decode ahead (default: 3)")
+
+def review_pack(args):
+    """Reviews a packed sweep. Entries already reviewed (saved or rejected) are skipped on the next run."""
+    import audio_engine
+    import sample_pack
+    import triage
+    import tts_engine
+
+    pack = sample_pack.SamplePack(args.directory)
+    names = [n for n in pack.names() if not (pack.meta(n) or {}).get("review")]
+    if not names:
+        print(f"No unreviewed samples in '{pack.pack_path}'.")
+        return
+
+    saved_dir = os.path.join(args.directory, args.saved_folder)
+    print(f"Found {len(names)} unreviewed samples in {pack.pack_path}. Starting review...")
+    print("Controls (single key, no Enter needed): (s)ave, (r)eject, (p)lay-again, (q)uit")
+
+    engine = audio_engine.get_engine()
+    clips = {}
+
+    def clip(name):
+        # Played straight from the mapped pack; nothing is written to disk
+        if name not in clips:
+            clips[name] = audio_engine.MemoryClip(pack.get(name))
+        return clips[name]
+
+    try:
+        for i, name in enumerate(names):
+            engine.prefetch([clip(n) for n in names[i + 1:i + 1 + args.prefetch]])
+
+            print(f"\nSample: {name}")
+            engine.start([clip(name)])
+
+            while True:
+                print("Action [(s)ave, (r)eject, (p)lay-again, (q)uit]: ", end="", flush=True)
+                try:
+                    choice = triage.read_key().lower().strip()
+                except EOFError:
+                    print("\nEnd of input. Exiting review.")
+                    return
+                print(choice)
+                if not choice:
+                    continue
+
+                if choice == 's':
+                    engine.stop()
+                    tts_engine.write_atomic(os.path.join(saved_dir, name), clip(name).data)
+                    pack.update_meta(name, review="saved")
+                    print(" -> Saved.")
+                    break
+                elif choice == 'r':
+                    engine.stop()
+                    pack.update_meta(name, review="rejected")
+                    print(" -> Rejected.")
+                    break
+                elif choice == 'p':
+                    engine.start([clip(name)])
+                    continue
+                elif choice == 'q':
+                    print("Exiting review.")
+                    return
+                else:
+                    print("Invalid option.")
+            clips.pop(name, None)
+
+        print("\nAll samples reviewed!")
+    finally:
+        engine.stop()
+        clips.clear()
+        pack.close()
+
+def run(args):
+    import audio_engine
+    import sample_pack
+    import triage
 
     source_dir = args.directory
     if not os.path.isdir(source_dir):
         print(f"Error: Directory '{source_dir}' does not exist.")
         sys.exit(1)
 
+    if sample_pack.is_pack(source_dir):
+        review_pack(args)
+        return
+
     # Define subdirectories
     saved_dir = os.path.join(source_dir, args.saved_folder)
     rejected_dir = os.path.join(source_dir, args.rejected_folder)
@@ -67,45 +140,69 @@ def main():
     os.makedirs(rejected_dir, exist_ok=True)
 
     # Get list of audio files
-    audio_extensions = ('.mp3', '.wav', '.ogg', '.m4a')
-    files = [f for f in os.listdir(source_dir) 
-             if f.lower().endswith(audio_extensions) and os.path.isfile(os.path.join(source_dir, f))]
-    
-    files.sort()
+    files = triage.list_audio_files(source_dir)
 
     if not files:
         print(f"No audio files found in '{source_dir}' to review.")
         return
 
     print(f"Found {len(files)} files. Starting review...")
-    print("Controls: (s)ave, (r)eject, (p)lay-again, (q)uit")
+    print("Controls (single key, no Enter needed): (s)ave, (r)eject, (p)lay-again, (q)uit")
+
+    engine = audio_engine.get_engine()
+    moves = triage.MoveQueue()
+    paths = [os.path.join(source_dir, f) for f in files]
+
+    try:
+        for i, filename in enumerate(files):
+            filepath = paths[i]
+
+            # Decode the next few clips while this one plays
+            engine.prefetch(paths[i + 1:i + 1 + args.prefetch])
 
-    for filename in files:
-        filepath = os.path.join(source_dir, filename)
-        
-        while True:
             print(f"\nFile: {filename}")
-            play_audio(filepath)
-
-            choice = input("Action [(s)ave, (r)eject, (p)lay-again, (q)uit]: ").lower().strip()
-
-            if choice == 's':
-                shutil.move(filepath, os.path.join(saved_dir, filename))
-                print(" -> Saved.")
-                break
-            elif choice == 'r':
-                shutil.move(filepath, os.path.join(rejected_dir, filename))
-                print(" -> Rejected.")
-                break
-            elif choice == 'p':
-                continue
-            elif choice == 'q':
-                print("Exiting review.")
-                sys.exit(0)
-            else:
-                print("Invalid option.")
-
-    print("\nAll files reviewed!")
+            engine.start([filepath])
+
+            while True:
+                print("Action [(s)ave, (r)eject, (p)lay-again, (q)uit]: ", end="", flush=True)
+                try:
+                    choice = triage.read_key().lower().strip()
+                except EOFError:
+                    print("\nEnd of input. Exiting review.")
+                    return
+                print(choice)
+                if not choice:
+                    continue
+
+                if choice == 's':
+                    engine.stop()
+                    moves.submit(filepath, os.path.join(saved_dir, filename))
+                    print(" -> Saved.")
+                    break
+                elif choice == 'r':
+                    engine.stop()
+                    moves.submit(filepath, os.path.join(rejected_dir, filename))
+                    print(" -> Rejected.")
+                    break
+                elif choice == 'p':
+                    engine.start([filepath])
+                    continue
+                elif choice == 'q':
+                    print("Exiting review.")
+                    return
+                else:
+                    print("Invalid option.")
+
+        print("\nAll files reviewed!")
+    finally:
+        engine.stop()
+        # Apply any queued moves before exiting
+        moves.close()
+
+def main():
+    parser = args_utils.init_parser(DESCRIPTION)
+    add_arguments(parser)
+    run(parser.parse_args())
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,267 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# --- Script Summary ---
+# Responsibility: Packed sample archives. Instead of one small MP3 per voice per run, samples are appended
+#                 to one data file (samples.pack) and an append-only index (samples.idx, one JSON line per
+#                 entry: name, offset, length, metadata). Readers map the data file with mmap and hand out
+#                 slices of it, so review and playback never open thousands of files, and copying or
+#                 syncing a sweep means two files.
+# Usage: python sample_pack.py <list|extract|import> <directory> [options]
+# Examples:
+#   python sample_voices.py "Hello world" 1,5,10 --output-dir sweep --pack      # writes sweep/samples.pack
+#   python sample_pack.py list sweep
+#   python sample_pack.py extract sweep --output-dir sweep_files                 # plain MP3s again
+#   python sample_pack.py extract sweep sample_005_en-US-GuyNeural.mp3 --output-dir .
+#   python sample_pack.py import old_sweep_folder                                # pack existing MP3s
+#   python review_samples.py sweep                                               # reviews the pack
+# A later entry with the same name replaces the earlier one (the old bytes stay in the data file).
+# ----------------------
+
+# Copyright (C) 2025 steve.rock@wheelhouser.com
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#===============================================================================================================
+
+import argparse
+import contextlib
+import json
+import mmap
+import os
+import sys
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+PACK_FILE = "samples.pack"
+INDEX_FILE = "samples.idx"
+DESCRIPTION = "List, extract or create packed sample archives (samples.pack + samples.idx)."
+
+def is_pack(directory):
+    return os.path.isfile(os.path.join(directory, INDEX_FILE))
+
+def check_name(name):
+    """Entry names become file names on extract, so they must be plain file names. Raises ValueError."""
+    if not name or name in (".", "..") or os.path.isabs(name) or "/" in name or "\\" in name:
+        raise ValueError(f"Invalid sample name {name!r}: must be a plain file name")
+    return name
+
+class SamplePack:
+    """
+    One archive directory. Appends are serialized with an advisory lock on the data file, so several
+    processes can add to the same pack; readers pick up new entries on the next lookup.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.pack_path = os.path.join(directory, PACK_FILE)
+        self.index_path = os.path.join(directory, INDEX_FILE)
+        self._lock = threading.Lock()
+        self._entries = {}      # name -> (offset, length, meta), in index order
+        self._index_pos = 0     # Bytes of the index already read
+        self._map = None
+        self._map_file = None
+
+    # --- Reading ---
+    def _refresh(self):
+        """Reads index lines appended since the last call. A torn last line (crashed writer) is skipped."""
+        try:
+            with open(self.index_path, "rb") as f:
+                f.seek(self._index_pos)
+                tail = f.read()
+        except FileNotFoundError:
+            return
+        end = tail.rfind(b"\n") + 1
+        for line in tail[:end].splitlines():
+            try:
+                entry = json.loads(line)
+                self._entries[entry["name"]] = (entry["offset"], entry["length"], entry.get("meta", {}))
+            except (ValueError, KeyError, TypeError):
+                continue
+        self._index_pos += end
+
+    def _view(self, offset, length):
+        if self._map is None or offset + length > len(self._map):
+            # First read, or the pack grew since it was mapped
+            self._close_map()
+            self._map_file = open(self.pack_path, "rb")
+            self._map = mmap.mmap(self._map_file.fileno(), 0, access=mmap.ACCESS_READ)
+        return memoryview(self._map)[offset:offset + length]
+
+    def _close_map(self):
+        if self._map is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                pass  # A caller still holds a slice; it is released with the last reference
+            self._map_file.close()
+            self._map = self._map_file = None
+
+    def names(self):
+        with self._lock:
+            self._refresh()
+            return list(self._entries)
+
+    def meta(self, name):
+        with self._lock:
+            self._refresh()
+            entry = self._entries.get(name)
+            return entry[2] if entry else None
+
+    def __contains__(self, name):
+        with self._lock:
+            self._refresh()
+            return name in self._entries
+
+    def __len__(self):
+        with self._lock:
+            self._refresh()
+            return len(self._entries)
+
+    def get(self, name):
+        """The entry's bytes as a read-only memoryview into the mapped pack (no copy). KeyError if missing."""
+        with self._lock:
+            self._refresh()
+            offset, length, _ = self._entries[name]
+            return self._view(offset, length)
+
+    def close(self):
+        with self._lock:
+            self._close_map()
+
+    # --- Writing ---
+    @contextlib.contextmanager
+    def _appending(self):
+        """Holds the cross-process append lock (on the data file) and yields the data file, opened for append."""
+        os.makedirs(self.directory, exist_ok=True)
+        with self._lock, open(self.pack_path, "ab") as f:
+            f.seek(0)  # msvcrt locks a byte at the current position; appends still go to the end
+            if fcntl:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            else:
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield f
+            finally:
+                if fcntl:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+                else:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def _append_index(self, name, offset, length, meta):
+        line = json.dumps({"name": name, "offset": offset, "length": length, "meta": meta}, ensure_ascii=False)
+        with open(self.index_path, "a", encoding="utf-8") as index:
+            index.write(line + "\n")
+
+    def add(self, name, data, **meta):
+        """Appends one entry. The data goes in first, so the index never points at bytes that aren't there."""
+        check_name(name)
+        with self._appending() as f:
+            offset = f.seek(0, os.SEEK_END)
+            f.write(data)
+            f.flush()
+            self._append_index(name, offset, len(data), meta)
+
+    def update_meta(self, name, **meta):
+        """Records new metadata for an entry (e.g. a review decision) without copying its bytes."""
+        with self._appending():
+            self._refresh()
+            offset, length, old = self._entries[name]
+            self._append_index(name, offset, length, dict(old, **meta))
+
+    def extract(self, output_dir, names=None):
+        """
+        Writes entries (default: all) to output_dir as plain files. Returns the number written.
+        Raises ValueError for a name that is not a plain file name (e.g. "../x.mp3" from a tampered index).
+        """
+        import tts_engine
+        names = [check_name(name) for name in names or self.names()]
+        for name in names:
+            tts_engine.write_atomic(os.path.join(output_dir, name), self.get(name))
+        return len(names)
+
+def add_arguments(parser):
+    sub = parser.add_subparsers(dest="pack_command", required=True)
+    p = sub.add_parser("list", help="List the samples in a pack")
+    p.add_argument("directory")
+    p.add_argument("--long", "-l", action="store_true", help="Show size and metadata")
+    p = sub.add_parser("extract", help="Write samples back out as plain files")
+    p.add_argument("directory")
+    p.add_argument("names", nargs="*", help="Samples to extract (default: all)")
+    p.add_argument("--output-dir", help="Where to write them (default: the pack directory)")
+    p = sub.add_parser("import", help="Pack the audio files of a folder (the files are left in place)")
+    p.add_argument("directory")
+    p.add_argument("--delete", action="store_true", help="Delete each file once it is in the pack")
+    p.add_argument("--replace", action="store_true",
+                   help="Re-pack files whose names are already in the pack (default: skip them)")
+
+def run(args):
+    pack = SamplePack(args.directory)
+    if args.pack_command != "import" and not is_pack(args.directory):
+        print(f"Error: no {INDEX_FILE} in '{args.directory}'.")
+        sys.exit(1)
+
+    if args.pack_command == "list":
+        for name in pack.names():
+            if args.long:
+                size = len(pack.get(name))
+                print(f"{name}  {size:>9,d} bytes  {json.dumps(pack.meta(name), ensure_ascii=False)}")
+            else:
+                print(name)
+
+    elif args.pack_command == "extract":
+        missing = [n for n in args.names if n not in pack]
+        if missing:
+            print(f"Error: not in the pack: {', '.join(missing)}")
+            sys.exit(1)
+        try:
+            n = pack.extract(args.output_dir or args.directory, args.names or None)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        print(f"Extracted {n} sample(s) to {args.output_dir or args.directory}.")
+
+    elif args.pack_command == "import":
+        import triage
+        files = triage.list_audio_files(args.directory)
+        packed = skipped = 0
+        for name in files:
+            path = os.path.join(args.directory, name)
+            with open(path, "rb") as f:
+                data = f.read()
+            if name in pack and not args.replace:
+                skipped += 1
+                if pack.get(name) != data:
+                    continue  # Different from the packed copy: never delete it
+            else:
+                pack.add(name, data)
+                packed += 1
+            if args.delete:
+                os.remove(path)
+        print(f"Packed {packed} file(s) into {pack.pack_path}"
+              + (f", skipped {skipped} already packed (--replace to re-pack)." if skipped else "."))
+    pack.close()
+
+def main():
+    parser = argparse.ArgumentParser(description=DESCRIPTION)
+    add_arguments(parser)
+    run(parser.parse_args())
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,7 @@
 # Examples:
 #   python sample_voices.py "Hello world" "1,5,10" --output-dir samples
 #   python sample_voices.py "Testing pitch" "12" --pitch="+50Hz"
+#   python sample_voices.py "Hello world" "1,5,10" --output-dir sweep --pack   # one samples.pack, see sample_pack.py
 # ----------------------
 
 # Copyright (C) 2025 steve.rock@wheelhouser.com
@@ -34,41 +35,29 @@
 
 import json
 import os
-import asyncio
-import edge_tts
 import args_utils
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 VOICES_FILE = os.path.join(SCRIPT_DIR, "voices.json")
+DESCRIPTION = "Generate audio samples using Voice IDs."
 
-async def main():
-    parser = args_utils.init_parser("Generate audio samples using Voice IDs.")
-    args_utils.add_text_arg(parser)
-    parser.add_argument("ids", help="Comma-separated list of Voice IDs (e.g. 1,5,10)")
-    args_utils.add_pitch_rate_args(parser)
-    parser.add_argument("--output-dir", default=".", help="Directory to save output files")
-    args = parser.parse_args()
-
+def sample_jobs(ids, output_dir="."):
+    """
+    Returns (outfile, ShortName) for each Voice ID in 'ids' (strings), named sample_NNN_<ShortName>.mp3
+    in output_dir, or None if voices.json is missing. Unknown IDs are reported and skipped.
+    """
     if not os.path.exists(VOICES_FILE):
         print(f"Error: {VOICES_FILE} not found. Please run jsonify_voices.py first.")
-        return
+        return None
 
     with open(VOICES_FILE, "r", encoding="utf-8") as f:
         voices = json.load(f)
 
-    if args.output_dir:
-        os.makedirs(args.output_dir, exist_ok=True)
-
     # Create a lookup dictionary for ID -> Voice
     voice_map = {str(v.get("ID")): v for v in voices if "ID" in v}
 
-    selected_ids = [x.strip() for x in args.ids.split(",")]
-
-    print(f"Generating samples for IDs: {selected_ids}")
-
-    text_content = args_utils.get_text_content(args.text)
-
-    for vid in selected_ids:
+    jobs = []
+    for vid in ids:
         voice = voice_map.get(vid)
         if not voice:
             print(f"Skipping ID {vid}: Not found in voices.json")
@@ -76,14 +65,92 @@ async def main():
 
         short_name = voice["ShortName"]
         # Create a filename like: sample_001_en-US-GuyNeural.mp3
-        outfile = os.path.join(args.output_dir, f"sample_{vid.zfill(3)}_{short_name}.mp3")
-        
+        jobs.append((os.path.join(output_dir, f"sample_{vid.zfill(3)}_{short_name}.mp3"), short_name))
+    return jobs
+
+async def generate_samples(text_content, ids, output_dir=".", pitch="+0Hz", rate="+0%", in_order=False,
+                           pack=False):
+    """
+    Writes one sample per Voice ID in 'ids' (strings) to output_dir. Used by batch_generate.py too.
+    Samples render concurrently, the slowest predicted voices first (see tts_scheduler.py), unless 'in_order'.
+    With 'pack' they are appended to output_dir/samples.pack instead of written as separate files;
+    samples already in the pack with the same text and settings are skipped.
+    """
+    import tts_engine
+    import tts_scheduler
+    print(f"Generating samples for IDs: {ids}")
+    jobs = sample_jobs(ids, output_dir)
+    if jobs is None:
+        return
+
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    synthesizer = tts_engine.get_synthesizer()
+    archive = None
+    if pack:
+        import sample_pack
+        archive = sample_pack.SamplePack(output_dir or ".")
+
+    def predict(job):
+        return tts_scheduler.predict_synthesis(text_content, job[1], pitch, rate, synthesizer=synthesizer)
+
+    async def render(job):
+        outfile, short_name = job
+        name = os.path.basename(outfile)
+        key = synthesizer.key_for(text_content, short_name, pitch, rate)
+        if archive is not None and (archive.meta(name) or {}).get("key") == key:
+            print(f"Skipping {name}: already in the pack.")
+            return
         print(f"Generating {outfile} ({short_name})...")
         try:
-            communicate = edge_tts.Communicate(text_content, short_name, pitch=args.pitch, rate=args.rate)
-            await communicate.save(outfile)
+            if archive is not None:
+                data = await synthesizer.synthesize(text_content, short_name, pitch=pitch, rate=rate)
+                archive.add(name, data, voice=short_name, text=text_content, pitch=pitch, rate=rate, key=key)
+            else:
+                # Written atomically, so Ctrl-C never leaves a truncated sample behind
+                await synthesizer.save(outfile, text_content, short_name, pitch=pitch, rate=rate)
         except Exception as e:
             print(f"Failed to generate {outfile}: {e}")
 
+    if in_order:
+        elapsed = await tts_scheduler.run_longest_first(jobs, render, None, synthesizer.concurrency)
+        estimate = ""
+    else:
+        estimate = tts_scheduler.estimate_makespan([predict(job) for job in jobs], synthesizer.concurrency)
+        elapsed = await tts_scheduler.run_longest_first(jobs, render, predict, synthesizer.concurrency)
+        estimate = f" (estimated {estimate:.1f}s)"
+    if archive is not None:
+        archive.close()
+    if jobs:
+        print(f"Finished {len(jobs)} samples in {elapsed:.1f}s{estimate}.")
+
+def add_arguments(parser):
+    args_utils.add_text_arg(parser)
+    parser.add_argument("ids", help="Comma-separated list of Voice IDs (e.g. 1,5,10)")
+    args_utils.add_pitch_rate_args(parser)
+    parser.add_argument("--output-dir", default=".", help="Directory to save output files")
+    add_order_argument(parser)
+    add_pack_argument(parser)
+
+def add_order_argument(parser):
+    parser.add_argument("--in-order", action="store_true",
+                        help="Render in the given order instead of slowest predicted voice first")
+
+def add_pack_argument(parser):
+    parser.add_argument("--pack", action="store_true",
+                        help="Append samples to <output-dir>/samples.pack instead of writing one file each")
+
+def run(args):
+    import tts_engine
+    selected_ids = [x.strip() for x in args.ids.split(",")]
+    tts_engine.run_cli(generate_samples(args_utils.get_text_content(args.text), selected_ids,
+                                        args.output_dir, args.pitch, args.rate, args.in_order, args.pack))
+
+def main():
+    parser = args_utils.init_parser(DESCRIPTION)
+    add_arguments(parser)
+    run(parser.parse_args())
+
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    main()
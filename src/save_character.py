@@ -36,9 +36,10 @@ import os
 import sys
 import re
 import args_utils
+import character_library
 
-VOICES_FILE = "/home/user/projects/Text-to-Speech/src/voices.json"
-LIBRARY_FILE = "/home/user/projects/Text-to-Speech/voice-library/characters.json"
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+VOICES_FILE = os.path.join(SCRIPT_DIR, "voices.json")
 
 # Offsets relative to the "Calm" (Baseline) settings
 # Format: (Rate Offset, Pitch Offset, Volume Offset, Style)
@@ -118,23 +119,10 @@ def main():
         print(f"Error: Voice ID {args.voice_id} not found in voices.json.")
         sys.exit(1)
 
-    # 2. Load or Initialize Library
-    if os.path.exists(LIBRARY_FILE):
-        with open(LIBRARY_FILE, 'r', encoding='utf-8') as f:
-            try:
-                library = json.load(f)
-            except json.JSONDecodeError:
-                library = []
-    else:
-        os.makedirs(os.path.dirname(LIBRARY_FILE), exist_ok=True)
-        library = []
-
-    # 3. Determine ReferenceID
-    next_id = 1
-    if library:
-        next_id = max(c.get("ReferenceID", 0) for c in library) + 1
+    # 2. Resolve the shared library (same file the GUI uses)
+    library_file = character_library.resolve_library_path()
 
-    # 4. Generate Variations
+    # 3. Generate Variations
     variations = {}
     
     print(f"Generating variations based on baseline: Rate={args.rate}, Pitch={args.pitch}, Vol={args.volume}")
@@ -157,9 +145,9 @@ def main():
             "Image": ""
         }
 
-    # 5. Construct Character Object
+    # 4. Construct Character Object (ReferenceID is assigned under the library lock)
     new_character = {
-        "ReferenceID": next_id,
+        "ReferenceID": 0,
         "Alias": args.alias,
         "Engine": args.engine,
         "VoiceID": int(args.voice_id),
@@ -176,23 +164,21 @@ def main():
         "Variations": variations
     }
 
-    # 6. Save
-    # Check if alias already exists and update it, or append new
-    existing_index = next((i for i, c in enumerate(library) if c["Alias"] == args.alias), -1)
-    
-    if existing_index >= 0:
-        print(f"Updating existing character: {args.alias}")
-        # Preserve ID if updating
-        new_character["ReferenceID"] = library[existing_index]["ReferenceID"]
-        library[existing_index] = new_character
-    else:
-        print(f"Adding new character: {args.alias} (ID: {next_id})")
-        library.append(new_character)
+    # 5. Save
+    # Update the existing alias (preserving its ID) or append new, all under one lock
+    try:
+        _, updated = character_library.update_library(
+            lambda library: character_library.upsert_character(library, new_character), library_file)
+    except json.JSONDecodeError as e:
+        print(f"Error: Failed to decode {library_file} ({e}). Fix or restore it; nothing was written.")
+        sys.exit(1)
 
-    with open(LIBRARY_FILE, 'w', encoding='utf-8') as f:
-        json.dump(library, f, indent=4)
+    if updated:
+        print(f"Updated existing character: {args.alias}")
+    else:
+        print(f"Added new character: {args.alias} (ID: {new_character['ReferenceID']})")
 
-    print(f"Character saved to {LIBRARY_FILE}")
+    print(f"Character saved to {library_file}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,407 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# --- Script Summary ---
+# Responsibility: Render queue kept in a plain directory, so worker processes on this machine and on
+#                 others that mount the same share can split a big batch. A job is one JSON file that
+#                 moves between pending/, leased/, done/ and failed/ by atomic rename: whoever renames
+#                 it into leased/ owns it. Workers renew their leases while they render; any worker
+#                 puts leases that stopped being renewed (crashed or disconnected worker) back in pending/.
+# Usage: python shared_queue.py <command> <work_dir> [options]
+# Examples:
+#   python shared_queue.py submit-samples /mnt/share/sweep "Hello there" --gender Male --output-dir male_samples
+#   python shared_queue.py submit-file /mnt/share/book chapter1.jsonl
+#   python shared_queue.py worker /mnt/share/sweep --workers 4 --output-root /mnt/share/renders
+#   python shared_queue.py status /mnt/share/sweep
+#   python shared_queue.py retry /mnt/share/sweep
+# Relative outfiles are resolved against the worker's --output-root (default: its current directory),
+# so hosts that mount the share at different paths still write into the same layout.
+# ----------------------
+
+# Copyright (C) 2025 steve.rock@wheelhouser.com
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#===============================================================================================================
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import signal
+import socket
+import sys
+import time
+import args_utils
+
+PENDING, LEASED, DONE, FAILED = "pending", "leased", "done", "failed"
+STATES = (PENDING, LEASED, DONE, FAILED)
+DEFAULT_LEASE_SECONDS = 120
+DEFAULT_MAX_ATTEMPTS = 3
+POLL_SECONDS = 1.0
+
+def default_worker_id():
+    host = socket.gethostname().replace("@", "_").replace(os.sep, "_")
+    return f"{host}-{os.getpid()}"
+
+def _is_job_file(name):
+    # write_atomic's temp files start with a dot
+    return name.endswith(".json") and not name.startswith(".")
+
+class SharedQueue:
+    """The work directory. Every method is safe to call from several processes on several hosts at once."""
+
+    def __init__(self, directory, lease_seconds=DEFAULT_LEASE_SECONDS):
+        self.directory = directory
+        self.lease_seconds = lease_seconds
+        for state in STATES:
+            os.makedirs(os.path.join(directory, state), exist_ok=True)
+
+    def _path(self, state, name):
+        return os.path.join(self.directory, state, name)
+
+    def _names(self, state):
+        try:
+            return sorted(n for n in os.listdir(os.path.join(self.directory, state)) if _is_job_file(n))
+        except FileNotFoundError:
+            return []
+
+    def _write(self, state, name, job):
+        import tts_engine
+        tts_engine.write_atomic(self._path(state, name), json.dumps(job, ensure_ascii=False).encode("utf-8"))
+
+    def now(self):
+        """The file server's clock (the mtime of a file touched just now), so hosts' clocks need not agree."""
+        path = os.path.join(self.directory, ".clock")
+        try:
+            with open(path, "a"):
+                pass
+            os.utime(path)
+            return os.stat(path).st_mtime
+        except OSError:
+            return time.time()
+
+    # --- Submitting ---
+    def submit_many(self, jobs, costs=None):
+        """
+        Adds jobs (dicts with text, voice, outfile and optionally pitch/rate/volume). Workers take pending
+        files in name order, and names start with the inverted predicted cost, so the longest jobs go first.
+        """
+        token = f"{int(time.time()):x}{os.urandom(3).hex()}"  # Unique across submitters
+        for n, job in enumerate(jobs):
+            cost = costs[n] if costs else 0.0
+            rank = max(0, 999999 - int(cost * 1000))
+            job = dict(job, attempts=0)
+            self._write(PENDING, f"{rank:06d}-{token}-{n:06d}.json", job)
+        return len(jobs)
+
+    def counts(self):
+        return {state: len(self._names(state)) for state in STATES}
+
+    def leases(self):
+        """(job name, worker id, seconds since the lease was last renewed) for every leased job."""
+        now = self.now()
+        result = []
+        for name in self._names(LEASED):
+            with contextlib.suppress(OSError):
+                st = os.stat(self._path(LEASED, name))
+                stem, _, worker = name[:-5].partition("@")
+                result.append((stem, worker, now - max(st.st_mtime, st.st_ctime)))
+        return result
+
+    def failures(self, limit=5):
+        jobs = []
+        for name in self._names(FAILED)[:limit]:
+            with contextlib.suppress(OSError, ValueError):
+                with open(self._path(FAILED, name), "r", encoding="utf-8") as f:
+                    jobs.append(json.load(f))
+        return jobs
+
+    def retry(self):
+        """Moves every failed job back to pending with its attempts reset."""
+        n = 0
+        for name in self._names(FAILED):
+            try:
+                with open(self._path(FAILED, name), "r", encoding="utf-8") as f:
+                    job = json.load(f)
+                self._write(PENDING, name, dict(job, attempts=0, error=None))
+                os.remove(self._path(FAILED, name))
+                n += 1
+            except (OSError, ValueError):
+                continue
+        return n
+
+    # --- Workers ---
+    def claim(self, worker_id, n, max_attempts=DEFAULT_MAX_ATTEMPTS):
+        """Leases up to 'n' pending jobs. Returns [(lease path, job)]."""
+        claimed = []
+        for name in self._names(PENDING):
+            if len(claimed) >= n:
+                break
+            lease = self._path(LEASED, f"{name[:-5]}@{worker_id}.json")
+            try:
+                os.rename(self._path(PENDING, name), lease)  # Only one worker's rename succeeds
+                os.utime(lease)  # The lease starts now (rename keeps the submit time as mtime)
+            except OSError:
+                continue
+            try:
+                with open(lease, "r", encoding="utf-8") as f:
+                    job = json.load(f)
+            except (OSError, ValueError) as e:
+                self._finish(lease, FAILED, {"error": f"Unreadable job file: {e}"})
+                continue
+            job["attempts"] = job.get("attempts", 0) + 1
+            job["worker"] = worker_id
+            if job["attempts"] > max_attempts:
+                # Its leases kept expiring, e.g. it crashes every worker that takes it
+                job["error"] = job.get("error") or f"Gave up after {max_attempts} attempts."
+                self._finish(lease, FAILED, job)
+                continue
+            self._write(LEASED, os.path.basename(lease), job)
+            claimed.append((lease, job))
+        return claimed
+
+    def renew(self, lease):
+        """Extends a lease. False if it was lost (another worker put it back after it expired)."""
+        try:
+            os.utime(lease)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def _finish(self, lease, state, job):
+        stem = os.path.basename(lease).partition("@")[0]
+        self._write(state, stem + ".json", job)
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(lease)
+        if state != PENDING:
+            # If the lease expired while this worker still finished, nobody needs to render it again
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(self._path(PENDING, stem + ".json"))
+
+    def complete(self, lease, job, seconds):
+        self._finish(lease, DONE, dict(job, error=None, seconds=round(seconds, 3)))
+
+    def fail(self, lease, job, error, max_attempts=DEFAULT_MAX_ATTEMPTS):
+        """Puts the job back in pending, or in failed once it used up its attempts. Returns the new state."""
+        state = PENDING if job["attempts"] < max_attempts else FAILED
+        self._finish(lease, state, dict(job, error=error))
+        return state
+
+    def release(self, lease, job):
+        """Returns a job this worker is giving up (shutdown) to pending without counting an attempt."""
+        self._finish(lease, PENDING, dict(job, attempts=job["attempts"] - 1))
+
+    def reap(self):
+        """Puts leases that were not renewed for lease_seconds back in pending. Returns [(job name, worker)]."""
+        now = self.now()
+        reaped = []
+        for name in self._names(LEASED):
+            lease = self._path(LEASED, name)
+            try:
+                st = os.stat(lease)
+                # ctime changes on rename too, so a lease that was claimed a moment ago never looks stale
+                if now - max(st.st_mtime, st.st_ctime) <= self.lease_seconds:
+                    continue
+                stem, _, worker = name[:-5].partition("@")
+                os.rename(lease, self._path(PENDING, stem + ".json"))  # Only one reaper wins
+            except OSError:
+                continue
+            reaped.append((stem, worker))
+        return reaped
+
+    def idle(self):
+        return not self._names(PENDING) and not self._names(LEASED)
+
+async def run_worker(queue, workers, max_attempts=DEFAULT_MAX_ATTEMPTS, exit_when_idle=False, output_root=None,
+                     worker_id=None, synthesizer=None):
+    """Renders jobs from the work directory with at most 'workers' concurrent jobs until SIGINT/SIGTERM."""
+    import pronunciation
+    import tts_engine
+    synthesizer = synthesizer or tts_engine.Synthesizer(concurrency=workers)
+    worker_id = worker_id or default_worker_id()
+    loop = asyncio.get_running_loop()
+    stopping = asyncio.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stopping.set)
+        except (NotImplementedError, RuntimeError):  # Windows / not the main thread
+            pass
+
+    running = {}  # lease path -> (job, task)
+
+    async def run_job(lease, job):
+        outfile = job["outfile"]
+        if output_root and not os.path.isabs(outfile):
+            outfile = os.path.join(output_root, outfile)
+        started = time.perf_counter()
+        try:
+            await synthesizer.save(outfile, job["text"], job["voice"], pitch=job.get("pitch") or "+0Hz",
+                                   rate=job.get("rate") or "+0%", volume=job.get("volume") or "+0%",
+                                   lexicon=pronunciation.for_character(job.get("character")))
+        except asyncio.CancelledError:
+            if stopping.is_set():
+                queue.release(lease, job)  # Let another worker have it right away
+            return  # Otherwise the lease was lost and the job is someone else's now
+        except Exception as e:
+            state = queue.fail(lease, job, str(e), max_attempts)
+            print(f"[{'retry' if state == PENDING else 'FAIL'}] {job['outfile']} "
+                  f"(attempt {job['attempts']}/{max_attempts}): {e}")
+            return
+        queue.complete(lease, job, time.perf_counter() - started)
+        print(f"[ OK ] {job['outfile']}")
+
+    last_renew = last_reap = time.monotonic()
+    reaped = queue.reap()  # Leases left behind by a worker that died since the last run
+    while not stopping.is_set():
+        now = time.monotonic()
+        if now - last_renew >= queue.lease_seconds / 3:
+            last_renew = now
+            for lease, (job, task) in running.items():
+                if not queue.renew(lease):
+                    print(f"[lost] {job['outfile']}: lease expired; another worker will render it.")
+                    task.cancel()
+        if now - last_reap >= queue.lease_seconds / 2:
+            last_reap = now
+            reaped = queue.reap()
+        for stem, worker in reaped:
+            print(f"[requeue] {stem}: lease of {worker} expired.")
+        reaped = []
+
+        for lease, job in queue.claim(worker_id, workers - len(running), max_attempts):
+            running[lease] = (job, asyncio.create_task(run_job(lease, job)))
+
+        if not running and exit_when_idle and queue.idle():
+            break
+
+        stop_wait = asyncio.create_task(stopping.wait())
+        await asyncio.wait([task for _, task in running.values()] + [stop_wait], timeout=POLL_SECONDS,
+                           return_when=asyncio.FIRST_COMPLETED)
+        stop_wait.cancel()
+        for lease in [l for l, (_, task) in running.items() if task.done()]:
+            del running[lease]
+
+    if running:
+        print(f"Stopping; returning {len(running)} running job(s) to the queue.")
+        for _, task in running.values():
+            task.cancel()
+        await asyncio.gather(*(task for _, task in running.values()), return_exceptions=True)
+
+def print_status(queue):
+    counts = queue.counts()
+    total = sum(counts.values())
+    print(f"Work directory: {queue.directory}")
+    print("  " + "  ".join(f"{s}: {counts[s]}" for s in STATES))
+    if total:
+        finished = counts[DONE] + counts[FAILED]
+        print(f"  {finished}/{total} finished ({finished * 100 // total}%)")
+    leases = queue.leases()
+    if leases:
+        print("Leases:")
+        for stem, worker, age in leases[:10]:
+            stale = "  (expired)" if age > queue.lease_seconds else ""
+            print(f"  {stem} {worker} renewed {age:.0f}s ago{stale}")
+    failed = queue.failures()
+    if failed:
+        print("Failures:")
+        for job in failed:
+            print(f"  {job.get('outfile')}: {job.get('error')}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Render queue in a shared directory, for workers on several hosts.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("worker", help="Render jobs until stopped; run one per host (or several)")
+    p.add_argument("work_dir")
+    p.add_argument("--workers", type=int, default=4, help="Concurrent jobs in this process (default: 4)")
+    p.add_argument("--max-attempts", type=int, default=DEFAULT_MAX_ATTEMPTS,
+                   help=f"Tries per job before it is moved to failed/ (default: {DEFAULT_MAX_ATTEMPTS})")
+    p.add_argument("--output-root", help="Directory relative outfiles are written under (default: current)")
+    p.add_argument("--worker-id", help="Name shown in leases (default: <host>-<pid>)")
+    p.add_argument("--exit-when-idle", action="store_true", help="Exit once no job is pending or leased")
+
+    p = sub.add_parser("submit-file", help="Queue lines from a .jsonl or plain text file (see render_queue.py)")
+    p.add_argument("work_dir")
+    p.add_argument("file")
+    p.add_argument("--voice", help="Voice for lines that don't specify one")
+    p.add_argument("--character", help="Character for lines that don't specify a voice")
+    p.add_argument("--variation", help="Character variation (default: Baseline)")
+    p.add_argument("--output-dir", help="Output directory for plain text files")
+
+    p = sub.add_parser("submit-samples", help="Queue a voice sweep, written like sample_voices.py")
+    p.add_argument("work_dir")
+    args_utils.add_text_arg(p)
+    group = p.add_mutually_exclusive_group(required=True)
+    group.add_argument("--ids", help="Comma-separated Voice IDs from voices.json")
+    group.add_argument("--gender", choices=["Male", "Female"], help="Every voice of this gender")
+    p.add_argument("--output-dir", default=".", help="Sample directory (relative to the workers' --output-root)")
+    args_utils.add_pitch_rate_args(p)
+
+    for name, help_text in (("status", "Show job counts, leases and failures"),
+                            ("retry", "Move failed jobs back to pending")):
+        p = sub.add_parser(name, help=help_text)
+        p.add_argument("work_dir")
+
+    for p in sub.choices.values():
+        p.add_argument("--lease", type=float, default=DEFAULT_LEASE_SECONDS,
+                       help=f"Seconds before an unrenewed lease is re-queued (default: {DEFAULT_LEASE_SECONDS})")
+
+    args = parser.parse_args()
+    queue = SharedQueue(args.work_dir, args.lease)
+
+    if args.command == "worker":
+        worker_id = args.worker_id or default_worker_id()
+        print(f"Worker {worker_id} on {queue.directory} with {args.workers} job slot(s). Ctrl-C to stop.")
+        import tts_profiling
+        with tts_profiling.profiled("shared-worker"), tts_profiling.traced_memory("shared-worker"):
+            asyncio.run(run_worker(queue, args.workers, args.max_attempts, args.exit_when_idle,
+                                   args.output_root, worker_id))
+        print_status(queue)
+
+    elif args.command in ("submit-file", "submit-samples"):
+        import tts_scheduler
+        if args.command == "submit-file":
+            import render_queue
+            try:
+                jobs = render_queue.read_job_file(args.file, args.voice, args.output_dir, args.character,
+                                                  args.variation)
+            except (OSError, ValueError) as e:
+                print(f"Error: {e}")
+                sys.exit(1)
+        else:
+            import sample_voices
+            if args.gender:
+                with open(sample_voices.VOICES_FILE, "r", encoding="utf-8") as f:
+                    ids = [str(v["ID"]) for v in json.load(f) if v.get("Gender") == args.gender and "ID" in v]
+            else:
+                ids = [x.strip() for x in args.ids.split(",")]
+            samples = sample_voices.sample_jobs(ids, args.output_dir)
+            if samples is None:
+                sys.exit(1)
+            text = args_utils.get_text_content(args.text)
+            jobs = [{"text": text, "voice": short_name, "pitch": args.pitch, "rate": args.rate, "outfile": outfile}
+                    for outfile, short_name in samples]
+        # Longest predicted first across all workers, as in sample_voices.py
+        costs = [tts_scheduler.get_latency_model().predict(job["voice"], len(job["text"])) for job in jobs]
+        n = queue.submit_many(jobs, costs)
+        print(f"Queued {n} job(s) in {queue.directory}.")
+
+    elif args.command == "status":
+        print_status(queue)
+
+    elif args.command == "retry":
+        print(f"Re-queued {queue.retry()} job(s).")
+
+if __name__ == "__main__":
+    main()
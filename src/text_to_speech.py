@@ -32,23 +32,29 @@
 #
 #===========================================================================================
 
+import time
+_MODULE_START = time.perf_counter()  # Origin for --profile-startup
 import sys
 import os
 import json
 import re
-import time
-import subprocess
-import shutil
+import argparse
+import queue
+import stat
+import collections
 import warnings
 from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                                QHBoxLayout, QPushButton, QLabel, QFileDialog, QComboBox, QTextEdit,
                                QSpinBox, QMessageBox, QGridLayout, QGroupBox, QTabWidget, QInputDialog,
-                               QScrollArea, QRadioButton, QButtonGroup, QListWidget, QAbstractItemView, QListView, QLineEdit,
-                               QSizePolicy)
-from PySide6.QtGui import QPixmap, QIcon, QPalette, QColor
-from PySide6.QtCore import Qt, QThread, Signal, QSettings, QPoint, QTimer, QStandardPaths
-import asyncio
-import edge_tts
+                               QScrollArea, QRadioButton, QButtonGroup, QAbstractItemView, QListView, QLineEdit,
+                               QSizePolicy, QTableView, QHeaderView, QStyledItemDelegate, QCheckBox,
+                               QDockWidget)
+from PySide6.QtGui import QPixmap, QIcon, QPalette, QColor, QShortcut, QKeySequence, QPainter, QPen
+from PySide6.QtCore import (Qt, QObject, QThread, Signal, QSettings, QPoint, QTimer, QStandardPaths, QFileSystemWatcher,
+                            QAbstractTableModel, QModelIndex, QLineF)
+import character_library
+import triage
+import tts_profiling
 
 # Suppress the specific UserWarning from pygame about pkg_resources
 warnings.filterwarnings("ignore", category=UserWarning, message=".*pkg_resources is deprecated.*")
@@ -263,6 +269,19 @@ DARK_STYLESHEET = """
                 border: 1px solid #555555;
             }
             
+            /* Playback file table */
+            QTableView {
+                background-color: #252627;
+                border: 1px solid #555555;
+                selection-background-color: #2A82DA;
+            }
+            QHeaderView::section {
+                background-color: #323232;
+                border: none;
+                border-right: 1px solid #555555;
+                padding: 4px;
+            }
+
             /* Vertical ScrollBar Style */
             QScrollBar:vertical {
                 border: none;
@@ -403,44 +422,274 @@ class LimitedComboBox(QComboBox):
 #=====================================================================================================
 #--- Worker Thread ---
 #=====================================================================================================
-class GenerationWorker(QThread):
+class GenerationWorker(QObject):
+    """
+    One synthesis job, saved to 'outfile' or, when that is None, kept in memory as 'result' (MP3 bytes).
+    It runs as a task on the shared tts_engine loop; stop() really cancels it:
+    the Edge TTS stream is closed and, since output is written atomically, no partial file is left.
+    Signals are re-emitted on the UI thread, so plain lambdas connected to them are safe.
+    """
     finished = Signal(bool, str)
+    progress = Signal(float)
+    # Raised on the loop thread, delivered to this (UI-thread) object
+    _loop_done = Signal()
+    _loop_progress = Signal(float)
+
+    QUEUED, RUNNING, DONE, FAILED, CANCELLED = "Queued", "Running", "Done", "Failed", "Cancelled"
 
-    def __init__(self, text, outfile, voice, pitch, rate, volume):
+    def __init__(self, text, outfile, voice, pitch, rate, volume, label="", lexicon=None):
         super().__init__()
         self.text = text
+        self.lexicon = lexicon  # Pronunciation lexicon; None = the global one
         self.outfile = outfile
         self.voice = voice
         self.pitch = pitch
         self.rate = rate
         self.volume = volume
-        self._is_running = True
+        self.label = label or os.path.basename(outfile or "")
+        self.lane = None
+        self.job = None
+        self.result = None
+        self.state = self.QUEUED
+        self.fraction = 0.0
+        self.error = ""
+        self.queued_at = time.monotonic()
+        self.started_at = None
+        self.finished_at = None
+        self._loop_done.connect(self._on_done)
+        self._loop_progress.connect(self._on_progress)
+
+    def start(self):
+        import tts_engine
+        self.state = self.RUNNING
+        self.started_at = time.monotonic()
+        synthesizer = tts_engine.get_synthesizer()
+        options = dict(pitch=self.pitch, rate=self.rate, volume=self.volume, on_progress=self._loop_progress.emit,
+                       lexicon=self.lexicon)
+        if self.outfile:
+            coro = synthesizer.save(self.outfile, self.text, self.voice, **options)
+        else:
+            coro = synthesizer.synthesize(self.text, self.voice, **options)
+        self.job = tts_engine.get_runner().submit(coro)
+        self.job.add_done_callback(lambda _: self._loop_done.emit())
+
+    def _on_progress(self, fraction):
+        self.fraction = fraction
+        self.progress.emit(fraction)
+
+    def _on_done(self):
+        self.finished_at = time.monotonic()
+        if self.job.cancelled():
+            self.state = self.CANCELLED
+            self.finished.emit(True, "Operation cancelled by user.")
+        elif self.job.exception() is not None:
+            self.state = self.FAILED
+            self.error = str(self.job.exception())
+            self.finished.emit(False, self.error)
+        else:
+            self.state = self.DONE
+            self.fraction = 1.0
+            self.result = self.job.result()
+            self.finished.emit(True, "")
 
-    async def _do_generation(self):
-        """Asynchronously generates the audio file using edge_tts."""
-        communicate = edge_tts.Communicate(
-            self.text, self.voice, pitch=self.pitch, rate=self.rate, volume=self.volume
-        )
-        await communicate.save(self.outfile)
+    def isRunning(self):
+        return self.state in (self.QUEUED, self.RUNNING)
+
+    def stop(self):
+        if self.state == self.QUEUED:
+            # Never started: nothing to cancel on the loop
+            self.state = self.CANCELLED
+            self.finished_at = time.monotonic()
+            self.finished.emit(True, "Operation cancelled by user.")
+            return
+        if self.job is None or self.job.done():
+            return
+        self.job.cancel()  # Its latency is recorded as tts_job_cancel_seconds
+
+class GenerationQueue(QObject):
+    """
+    Runs GenerationWorkers on a small pool. Interactive jobs (previews) are always started before
+    bulk jobs (saves), and bulk jobs never take the last slot, so a preview never waits behind saves.
+    """
+    INTERACTIVE, BULK = 0, 1
+    job_added = Signal(object)
+    job_changed = Signal(object)
+
+    def __init__(self, max_workers=None, parent=None):
+        super().__init__(parent)
+        self._max_workers = max_workers  # None: the synthesizer's limit, read when the first job starts
+        self._lanes = {self.INTERACTIVE: collections.deque(), self.BULK: collections.deque()}
+        self._running = set()
+
+    def submit(self, worker, lane=BULK):
+        worker.lane = lane
+        worker.finished.connect(lambda *_: self._on_finished(worker))
+        worker.progress.connect(lambda _: self.job_changed.emit(worker))
+        self._lanes[lane].append(worker)
+        self.job_added.emit(worker)
+        self._pump()
+        return worker
+
+    def cancel(self, worker):
+        queued = self._lanes.get(worker.lane)
+        if queued is not None and worker in queued:
+            queued.remove(worker)
+        worker.stop()
+
+    def cancel_lane(self, lane):
+        for worker in list(self._lanes[lane]) + [w for w in self._running if w.lane == lane]:
+            self.cancel(worker)
+
+    def cancel_all(self):
+        for lane in self._lanes:
+            self.cancel_lane(lane)
+
+    def running_count(self):
+        return len(self._running)
+
+    @property
+    def max_workers(self):
+        if self._max_workers is None:
+            import tts_engine
+            self._max_workers = tts_engine.DEFAULT_CONCURRENCY
+        return max(2, self._max_workers)
+
+    def _pump(self):
+        while len(self._running) < self.max_workers:
+            bulk_running = sum(1 for w in self._running if w.lane == self.BULK)
+            if self._lanes[self.INTERACTIVE]:
+                worker = self._lanes[self.INTERACTIVE].popleft()
+            elif self._lanes[self.BULK] and bulk_running < self.max_workers - 1:
+                worker = self._lanes[self.BULK].popleft()
+            else:
+                break
+            self._running.add(worker)
+            worker.start()
+            self.job_changed.emit(worker)
+
+    def _on_finished(self, worker):
+        import tts_metrics
+        self._running.discard(worker)
+        started = worker.started_at
+        tts_metrics.get_metrics().record_job(
+            "interactive" if worker.lane == self.INTERACTIVE else "bulk", worker.state.lower(),
+            queue_wait=(started - worker.queued_at) if started else None,
+            duration=(worker.finished_at - started) if started and worker.finished_at else None)
+        self.job_changed.emit(worker)
+        self._pump()
+
+class JobListModel(QAbstractTableModel):
+    """Rows for the Jobs panel: one per GenerationWorker, newest last."""
+    COLUMNS = ["Job", "Lane", "State", "Progress", "Waited", "Took"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._jobs = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._jobs)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        job = self._jobs[index.row()]
+        col = index.column()
+        if role == Qt.ToolTipRole:
+            return job.error or job.outfile
+        if role != Qt.DisplayRole:
+            return None
+        now = time.monotonic()
+        if col == 0:
+            return job.label
+        if col == 1:
+            return "Preview" if job.lane == GenerationQueue.INTERACTIVE else "Save"
+        if col == 2:
+            return job.state
+        if col == 3:
+            return f"{job.fraction * 100:.0f}%" if job.started_at else ""
+        if col == 4:
+            return f"{(job.started_at or now) - job.queued_at:.1f}s" if job.started_at or job.isRunning() else ""
+        if col == 5:
+            return f"{(job.finished_at or now) - job.started_at:.1f}s" if job.started_at else ""
+        return None
+
+    def add_job(self, job):
+        row = len(self._jobs)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._jobs.append(job)
+        self.endInsertRows()
+
+    def job_at(self, row):
+        return self._jobs[row]
+
+    def refresh(self, job=None):
+        """Repaints one job's row, or every unfinished row (for the live timings)."""
+        rows = [self._jobs.index(job)] if job in self._jobs else \
+               [i for i, j in enumerate(self._jobs) if j.isRunning()]
+        for row in rows:
+            self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.COLUMNS) - 1))
+
+    def clear_finished(self):
+        self.beginResetModel()
+        self._jobs = [j for j in self._jobs if j.isRunning()]
+        self.endResetModel()
+
+#=====================================================================================================
+#--- Variation Batch Worker Thread ---
+#=====================================================================================================
+class VariationRenderWorker(QThread):
+    """
+    Renders one line for every variation of a character concurrently via the shared Synthesizer. The
+    batch runs as one job on the shared AsyncRunner, so it counts against the same concurrency limit as
+    every other request and stop() cancels it like any other job.
+    """
+    progress = Signal(int, int)          # done, total
+    rendered = Signal(list)              # [(alias, variation, outfile, error), ...]
+
+    def __init__(self, character, text, output_dir, file_name):
+        super().__init__()
+        self.character = character
+        self.text = text
+        self.output_dir = output_dir
+        self.file_name = file_name
+        self.job = None
+        self._done = 0
 
     def run(self):
+        import character_lines
+        import tts_engine
+        total = len(self.character.get("Variations", {}))
+
+        def on_result(alias, var_name, outfile, error):
+            self._done += 1
+            self.progress.emit(self._done, total)
+
+        import asyncio
+        self.job = tts_engine.get_runner().submit(character_lines.render_variations(
+            [self.character], self.text, self.output_dir, self.file_name, on_result=on_result))
+        if self.isInterruptionRequested():
+            self.job.cancel(wait=0)  # stop() ran before the job existed
         try:
-            # Run the async generation function in a new event loop
-            asyncio.run(self._do_generation())
-            
-            if not self._is_running:
-                self.finished.emit(True, "Operation cancelled by user.")
-                return
-
-            self.finished.emit(True, "")
+            with tts_profiling.traced_memory("variations"):
+                results = self.job.result()
+        except asyncio.CancelledError:
+            results = [(self.character.get("Alias", ""), "*", "", "Cancelled.")]
         except Exception as e:
-            if self._is_running:
-                self.finished.emit(False, str(e))
+            results = [(self.character.get("Alias", ""), "*", "", str(e))]
+        self.rendered.emit(results)
 
     def stop(self):
-        self._is_running = False
-        # Note: This won't interrupt a running edge-tts network operation,
-        # but it will prevent subsequent steps if checked.
+        self.requestInterruption()
+        if self.job is not None:
+            self.job.cancel()
 
 #=====================================================================================================
 #--- Playback Worker Thread ---
@@ -449,118 +698,397 @@ class PlaybackWorker(QThread):
     def __init__(self, files):
         super().__init__()
         self.files = files
-        self.playback_process = None
-        self.is_running = True
 
     def run(self):
         """
-        Plays a list of audio files. This logic is moved from play_audio.py to
-        avoid creating a subprocess that re-launches the app, and to allow for
-        immediate stopping of playback.
+        Plays a list of audio files through the shared AudioEngine, which keeps the mixer
+        open between runs, queues files gaplessly and stops instantly when asked.
         """
-        for file_path in self.files:
-            if not self.is_running:
-                break
-            
-            file_path = os.path.abspath(file_path)
-            if not os.path.exists(file_path):
-                print(f"Error: File not found: {file_path}")
+        import audio_engine
+        try:
+            audio_engine.get_engine().play(self.files)
+        except audio_engine.NoPlayerError as e:
+            print(f"Error: {e}")
+
+    def stop(self):
+        import audio_engine
+        audio_engine.get_engine().stop()
+
+#=====================================================================================================
+#--- Playback Folder Listing ---
+#=====================================================================================================
+class FileScanWorker(QThread):
+    """Lists a folder with os.scandir off the UI thread, streaming entries to the model in batches."""
+    batch = Signal(list)    # [(name, size, mtime_ns), ...]
+    failed = Signal(str)
+
+    BATCH_SIZE = 500
+
+    def __init__(self, directory, meta_cache):
+        super().__init__()
+        self.directory = directory
+        self.meta_cache = meta_cache
+
+    def run(self):
+        try:
+            dir_mtime = os.stat(self.directory).st_mtime_ns
+            cached = self.meta_cache.listing(dir_mtime)
+            entries = []
+            for name, st in (self._scan() if cached is None else self._restat(cached)):
+                if self.isInterruptionRequested():
+                    return
+                entries.append((name, st.st_size, st.st_mtime_ns))
+                if len(entries) % self.BATCH_SIZE == 0:
+                    self.batch.emit(entries[-self.BATCH_SIZE:])
+            remainder = len(entries) % self.BATCH_SIZE
+            if remainder:
+                self.batch.emit(entries[-remainder:])
+            if entries != cached:
+                self.meta_cache.set_listing(entries, dir_mtime)
+                self.meta_cache.save()
+        except OSError as e:
+            self.failed.emit(str(e))
+
+    def _scan(self):
+        """Full listing: (name, stat) for the audio files in the folder."""
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.lower().endswith(triage.AUDIO_EXTENSIONS) and entry.is_file():
+                    yield entry.name, entry.stat()
+
+    def _restat(self, cached):
+        """
+        The folder's file names haven't changed, but a file rewritten in place keeps its name:
+        stat each cached name again instead of trusting the stored size and mtime.
+        """
+        for name, _, _ in cached:
+            try:
+                st = os.stat(os.path.join(self.directory, name))
+            except FileNotFoundError:
                 continue
+            if stat.S_ISREG(st.st_mode):
+                yield name, st
+
+class MetadataWorker(QThread):
+    """Reads duration/bitrate with mutagen for the rows the view asks for, caching results per folder."""
+    ready = Signal(str, dict)
+
+    def __init__(self, directory, meta_cache):
+        super().__init__()
+        self.directory = directory
+        self.meta_cache = meta_cache
+        self._queue = queue.Queue()
+        self._requested = set()
+
+    def request(self, entries):
+        """Queues (name, size, mtime_ns) entries that haven't been asked for yet."""
+        for entry in entries:
+            if entry[0] not in self._requested:
+                self._requested.add(entry[0])
+                self._queue.put(entry)
+
+    def stop(self):
+        self.requestInterruption()
+        self._queue.put(None)
 
-            # 1. Try Pygame
+    def run(self):
+        import audio_metadata
+        while not self.isInterruptionRequested():
             try:
-                os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = "hide"
-                import pygame
-                pygame.mixer.init()
-                pygame.mixer.music.load(file_path)
-                pygame.mixer.music.play()
-                
-                while pygame.mixer.music.get_busy():
-                    if not self.is_running:
-                        pygame.mixer.music.stop()
-                        break
-                    time.sleep(0.1)
-                
-                if not self.is_running:
-                    break
+                entry = self._queue.get(timeout=1.0)
+            except queue.Empty:
+                # Idle: persist what we've learned so far
+                self.meta_cache.save()
                 continue
-            except ImportError:
-                pass
-            except Exception as e:
-                print(f"Pygame playback failed: {e}")
-
-            # 2. Try System Players
-            players = [
-                ("paplay", []), ("mpg123", []), ("afplay", []), ("aplay", []),
-                ("ffplay", ["-nodisp", "-autoexit", "-hide_banner"]),
-            ]
-
-            player_found = False
-            for player_cmd, args in players:
-                if shutil.which(player_cmd):
-                    try:
-                        self.playback_process = subprocess.Popen(
-                            [player_cmd] + args + [file_path],
-                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
-                        )
-                        
-                        while self.playback_process.poll() is None:
-                            if not self.is_running:
-                                self.playback_process.terminate()
-                                break
-                            time.sleep(0.1)
-
-                        if not self.is_running:
-                            break
-                        
-                        player_found = True
-                        break
-                    except (subprocess.CalledProcessError, FileNotFoundError):
-                        continue
-            
-            if not self.is_running:
+            if entry is None:
                 break
-            if player_found:
-                continue
+            name, size, mtime_ns = entry
+            meta = self.meta_cache.get(name, mtime_ns, size)
+            if meta is None:
+                meta = audio_metadata.probe(os.path.join(self.directory, name))
+                self.meta_cache.put(name, mtime_ns, size, meta)
+            self.ready.emit(name, meta)
+        self.meta_cache.save()
 
-            # 3. Flatpak Fallback
-            if shutil.which("flatpak-spawn"):
-                try:
-                    self.playback_process = subprocess.Popen(
-                        ["flatpak-spawn", "--host", "paplay", file_path],
-                        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
-                    )
-                    
-                    while self.playback_process.poll() is None:
-                        if not self.is_running:
-                            self.playback_process.terminate()
-                            break
-                        time.sleep(0.1)
-
-                    if not self.is_running:
-                        break
-                    continue
-                except (subprocess.CalledProcessError, FileNotFoundError):
-                    print("Failed to play via flatpak-spawn.")
+class WaveformWorker(QThread):
+    """Computes waveform thumbnails off the UI thread. Lower priority numbers are served first."""
+    ready = Signal(str, object)   # path (or MemoryClip.name), peaks (numpy array)
+
+    PRIORITY_VISIBLE = 0
+    PRIORITY_BACKGROUND = 1
+
+    def __init__(self):
+        super().__init__()
+        self._queue = queue.PriorityQueue()
+        self._seq = 0
+        self._done = set()
+
+    def request(self, paths, priority=PRIORITY_BACKGROUND):
+        """Queues paths (or MemoryClips); asking again with a lower priority number moves them ahead."""
+        for path in paths:
+            if getattr(path, "name", path) not in self._done:
+                self._seq += 1
+                self._queue.put((priority, self._seq, path))
 
-            print("Error: Could not play audio. Please install 'pygame' or a CLI player.")
+    def forget(self, path):
+        """Allows a path to be recomputed (e.g. a preview file that was overwritten)."""
+        self._done.discard(path)
 
     def stop(self):
-        self.is_running = False
-        # For Pygame, the loop in run() will see the flag and stop.
-        # For subprocess, we terminate it directly.
-        if self.playback_process and self.playback_process.poll() is None:
+        self.requestInterruption()
+        self._queue.put((-1, 0, None))
+
+    def run(self):
+        import waveform
+        while not self.isInterruptionRequested():
+            _, _, path = self._queue.get()
+            if path is None:
+                break
+            name = getattr(path, "name", path)
+            if name in self._done:
+                continue
+            self._done.add(name)
+            try:
+                peaks = waveform.get_peaks(path)
+            except Exception as e:
+                print(f"Waveform failed for {name}: {e}")
+                peaks = None
+            if peaks is not None:
+                self.ready.emit(name, peaks)
+
+def paint_peaks(painter, rect, peaks, color):
+    """Draws min/max peaks as one vertical line per pixel column inside 'rect'."""
+    width = rect.width()
+    if width <= 0 or peaks is None or len(peaks) == 0:
+        return
+    mid = rect.top() + rect.height() / 2.0
+    half = rect.height() / 2.0
+    n = len(peaks)
+    lines = []
+    for x in range(width):
+        lo, hi = peaks[min(n - 1, x * n // width)]
+        px = rect.left() + x
+        lines.append(QLineF(px, mid - hi * half, px, mid - lo * half))
+    painter.save()
+    painter.setPen(QPen(color, 1))
+    painter.drawLines(lines)
+    painter.restore()
+
+class WaveformDelegate(QStyledItemDelegate):
+    """Paints the peaks stored in Qt.UserRole of the waveform column."""
+
+    def paint(self, painter, option, index):
+        super().paint(painter, option, index)
+        peaks = index.data(Qt.UserRole)
+        if peaks is not None:
+            paint_peaks(painter, option.rect.adjusted(2, 3, -2, -3), peaks, QColor("#00BFFF"))
+
+class WaveformWidget(QWidget):
+    """Stand-alone waveform strip (used for the latest preview on the Characters tab)."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.peaks = None
+        self.setMinimumHeight(48)
+        self.setMaximumHeight(48)
+
+    def set_peaks(self, peaks):
+        self.peaks = peaks
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor("#252627"))
+        paint_peaks(painter, self.rect().adjusted(4, 4, -4, -4), self.peaks, QColor("#00BFFF"))
+
+class AudioFileModel(QAbstractTableModel):
+    """Rows of audio files in the playback folder, with lazily filled metadata and waveform columns."""
+    COL_NAME, COL_WAVEFORM, COL_DURATION, COL_SIZE, COL_BITRATE = range(5)
+    HEADERS = ["Name", "Waveform", "Duration", "Size", "Bitrate"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []      # [{"name", "size", "mtime", "meta"}]
+        self._index = {}     # name -> row
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self._rows[index.row()]
+        col = index.column()
+        if role == Qt.DisplayRole:
+            meta = row["meta"] or {}
+            if col == self.COL_NAME:
+                return row["name"]
+            import audio_metadata
+            if col == self.COL_DURATION:
+                return audio_metadata.format_duration(meta.get("duration"))
+            if col == self.COL_SIZE:
+                return audio_metadata.format_size(row["size"])
+            if col == self.COL_BITRATE:
+                return audio_metadata.format_bitrate(meta.get("bitrate"))
+        elif role == Qt.UserRole and col == self.COL_WAVEFORM:
+            return row.get("wave")
+        elif role == Qt.TextAlignmentRole and col != self.COL_NAME:
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        return None
+
+    def _reindex(self):
+        self._index = {r["name"]: i for i, r in enumerate(self._rows)}
+
+    def clear(self):
+        self.beginResetModel()
+        self._rows = []
+        self._index = {}
+        self.endResetModel()
+
+    def append_entries(self, entries):
+        if not entries:
+            return
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(entries) - 1)
+        for name, size, mtime_ns in entries:
+            self._index[name] = len(self._rows)
+            self._rows.append({"name": name, "size": size, "mtime": mtime_ns, "meta": None})
+        self.endInsertRows()
+
+    def sort_by_name(self):
+        self.layoutAboutToBeChanged.emit()
+        self._rows.sort(key=lambda r: r["name"])
+        self._reindex()
+        self.layoutChanged.emit()
+
+    def names(self):
+        return [r["name"] for r in self._rows]
+
+    def name_at(self, row):
+        return self._rows[row]["name"]
+
+    def row_of(self, name):
+        return self._index.get(name, -1)
+
+    def entry(self, row):
+        r = self._rows[row]
+        return (r["name"], r["size"], r["mtime"])
+
+    def needs_metadata(self, row):
+        return self._rows[row]["meta"] is None
+
+    def set_metadata(self, name, meta):
+        row = self.row_of(name)
+        if row < 0:
+            return
+        self._rows[row]["meta"] = meta
+        self.dataChanged.emit(self.index(row, self.COL_DURATION), self.index(row, self.COL_BITRATE))
+
+    def set_waveform(self, name, peaks):
+        row = self.row_of(name)
+        if row < 0:
+            return
+        self._rows[row]["wave"] = peaks
+        self.dataChanged.emit(self.index(row, self.COL_WAVEFORM), self.index(row, self.COL_WAVEFORM))
+
+    def take(self, name):
+        """Removes a row by name and returns its data (for undo), or None."""
+        row = self.row_of(name)
+        if row < 0:
+            return None
+        self.beginRemoveRows(QModelIndex(), row, row)
+        data = self._rows.pop(row)
+        self._reindex()
+        self.endRemoveRows()
+        return data
+
+    def insert_sorted(self, data):
+        """Re-inserts a row previously returned by take(), keeping name order."""
+        row = next((i for i, r in enumerate(self._rows) if r["name"] > data["name"]), len(self._rows))
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._rows.insert(row, data)
+        self._reindex()
+        self.endInsertRows()
+
+#=====================================================================================================
+#--- Startup ---
+#=====================================================================================================
+class StartupProfile:
+    """Phase timings for --profile-startup, measured from the start of this module's imports."""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._last = _MODULE_START
+        self.phases = []
+
+    def mark(self, phase):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.phases.append((phase, now - self._last, now - _MODULE_START))
+        self._last = now
+
+    def report(self):
+        if not self.enabled:
+            return
+        print("Startup profile (ms):")
+        print(f"  {'phase':<34}{'step':>9}{'total':>9}")
+        for phase, step, total in self.phases:
+            print(f"  {phase:<34}{step * 1000:>9.1f}{total * 1000:>9.1f}")
+
+def read_voices(voices_path):
+    """Reads the voice catalog. Safe to call off the UI thread."""
+    if not voices_path or not os.path.exists(voices_path):
+        return []
+    try:
+        with open(voices_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"Failed to load voices from {voices_path}: {e}")
+        return []
+
+class StartupLoader(QThread):
+    """Reads voices.json and characters.json (and warms up the audio mixer) after the window is shown."""
+    voices_loaded = Signal(list)
+    characters_loaded = Signal(object)   # list, or None if the library couldn't be read
+
+    def __init__(self, voices_path, characters_path):
+        super().__init__()
+        self.voices_path = voices_path
+        self.characters_path = characters_path
+
+    def run(self):
+        self.voices_loaded.emit(read_voices(self.voices_path))
+
+        characters = None
+        if self.characters_path and os.path.exists(self.characters_path):
             try:
-                self.playback_process.terminate()
+                characters = character_library.load_library(self.characters_path)
             except Exception as e:
-                print(f"Error terminating playback process: {e}")
+                print(f"Failed to load characters: {e}")
+        self.characters_loaded.emit(characters)
+
+        # Import the audio engine and pygame and open the mixer now rather than on the first Preview
+        import audio_engine
+        audio_engine.get_engine().warm_up()
 
 #=====================================================================================================
 #--- Main Application Class ---
 #=====================================================================================================
 class TextToSpeechApp(QMainWindow):
-    def __init__(self):
+    review_restored = Signal(str, str)   # filename, error ("" if ok): an undone review move finished
+
+    def __init__(self, profile=None):
         super().__init__()
+        self.profile = profile or StartupProfile()
 
         # Initialize Settings
         self.settings = QSettings("Wheelhouser", "TextToSpeech")
@@ -573,6 +1101,20 @@ class TextToSpeechApp(QMainWindow):
         if os.path.exists(icon_path):
             self.setWindowIcon(QIcon(icon_path))
         
+        # Background waveform thumbnails (Playback list and Characters preview)
+        self.waveform_worker = WaveformWorker()
+        self.waveform_worker.ready.connect(self.on_waveform_ready)
+        self.waveform_worker.start()
+
+        # Previews and saves share one job queue (see the Jobs panel)
+        self.generation_queue = GenerationQueue(parent=self)
+        self.preview_worker = None
+        # Last preview as in-memory MP3 (audio_engine.MemoryClip) and the params it was made from
+        self.preview_clip = None
+        self.preview_params = None
+
+        self.profile.mark("window setup")
+
         # --- Main Tabs ---
         self.tabs = QTabWidget()
         self.setCentralWidget(self.tabs)
@@ -592,19 +1134,35 @@ class TextToSpeechApp(QMainWindow):
         self.setup_playback_tab()
         self.tabs.addTab(self.playback_tab, "Playback")
 
+        # Jobs panel
+        self.setup_jobs_panel()
+        self.profile.mark("build tabs")
+
         # Data storage
         self.characters_data = []
         self.all_voices = []
         self.language_map = {}
 
-        # Initialize paths and load data
+        # Initialize paths; the catalog and library are read in the background once the window is up
         self._init_paths()
-        # Load Data
-        self.load_voices()
-        self.load_characters()
+        self.voice_combo.addItem("Loading voices...")
+        self.voice_combo.setEnabled(False)
+        self.char_combo.addItem("Loading characters...")
+        self.char_combo.setEnabled(False)
+        self.startup_loader = StartupLoader(self.voices_path, self.characters_lib_path)
+        self.startup_loader.voices_loaded.connect(self.load_voices)
+        self.startup_loader.characters_loaded.connect(self.on_startup_characters_loaded)
+        QTimer.singleShot(0, self._start_deferred_loading)
         
-        self.worker = None
         self.playback_worker = None
+        self.variation_worker = None
+
+        # Review Mode state (Playback tab)
+        self.review_files = []
+        self.review_index = 0
+        self.review_history = []  # (index, filename, model row) per decision, for undo
+        self.review_restored.connect(self._on_review_restored)
+        self.review_moves = None  # triage.MoveQueue, created on first use
         
         # Restore playback folder
         self.current_playback_folder = self.settings.value("last_playback_dir", "")
@@ -620,6 +1178,35 @@ class TextToSpeechApp(QMainWindow):
         self.variation_update_timer.setInterval(750)  # 750ms delay after last change
         self.variation_update_timer.timeout.connect(self._perform_variation_update)
 
+        # Watch characters.json so edits made by CLI tools (or another window) show up live
+        self.library_reload_timer = QTimer(self)
+        self.library_reload_timer.setSingleShot(True)
+        self.library_reload_timer.setInterval(200)  # Coalesce bursts of change notifications
+        self.library_reload_timer.timeout.connect(self._reload_changed_characters)
+        self.library_watcher = QFileSystemWatcher(self)
+        self.library_watcher.fileChanged.connect(lambda _: self.library_reload_timer.start())
+        self.library_watcher.directoryChanged.connect(lambda _: self.library_reload_timer.start())
+        self._watch_library()
+
+        # Speculative preview: synthesize into the cache once edits have been idle for a moment
+        self.speculative_job = None
+        self.speculative_key = None
+        self.speculative_timer = QTimer(self)
+        self.speculative_timer.setSingleShot(True)
+        self.speculative_timer.setInterval(600)
+        self.speculative_timer.timeout.connect(self._run_speculative_preview)
+        enabled = self.settings.value("speculative_preview", False, type=bool)
+        for check in (self.speculative_check, self.char_speculative_check):
+            check.setChecked(enabled)
+            check.toggled.connect(self.set_speculative_preview)
+        for signal in (self.text_input.textChanged, self.voice_combo.currentIndexChanged,
+                       self.pitch_spin.valueChanged, self.rate_spin.valueChanged, self.vol_spin.valueChanged,
+                       self.char_text_input.textChanged, self.char_combo.currentIndexChanged,
+                       self.var_combo.currentIndexChanged, self.char_pitch_spin.valueChanged,
+                       self.char_rate_spin.valueChanged, self.char_vol_spin.valueChanged,
+                       self.tabs.currentChanged):
+            signal.connect(self.schedule_speculative_preview)
+
     def _init_paths(self):
         """Initializes paths for read-only data and read-write user library."""
         # --- voices.json (read-only) ---
@@ -635,24 +1222,10 @@ class TextToSpeechApp(QMainWindow):
                 break
 
         # --- characters.json (read-write) ---
-        # Use a standard, user-writable location for character data
-        app_data_path = QStandardPaths.writableLocation(QStandardPaths.AppDataLocation)
-        os.makedirs(app_data_path, exist_ok=True)
-        self.characters_lib_path = os.path.join(app_data_path, "characters.json")
-
-        # If user library doesn't exist, copy it from the bundle/source if available
-        if not os.path.exists(self.characters_lib_path):
-            template_path = None
-            template_paths = [
-                resource_path("voice-library/characters.json"),
-                os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "voice-library", "characters.json")
-            ]
-            for p in template_paths:
-                if os.path.exists(p):
-                    template_path = p
-                    break
-            if template_path:
-                shutil.copy2(template_path, self.characters_lib_path)
+        # Shared with save_character.py / character_lines.py through character_library.
+        # Older versions kept the library in Qt's default AppDataLocation; migrate it on first run.
+        legacy_path = os.path.join(QStandardPaths.writableLocation(QStandardPaths.AppDataLocation), "characters.json")
+        self.characters_lib_path = character_library.resolve_library_path(legacy_paths=[legacy_path])
 
     def setup_general_tab(self):
         # Main layout for the tab
@@ -675,6 +1248,11 @@ class TextToSpeechApp(QMainWindow):
         self.about_button.setObjectName("aboutButton")
         self.about_button.clicked.connect(self.show_about_dialog)
         
+        self.speculative_check = QCheckBox("Pre-synthesize previews while editing")
+        self.speculative_check.setToolTip("Synthesizes the preview in the background once you stop typing, "
+                                          "so Preview and Save are instant.")
+
+        top_bar_layout.addWidget(self.speculative_check)
         top_bar_layout.addStretch()
         top_bar_layout.addWidget(self.about_button)
         layout.addLayout(top_bar_layout)
@@ -854,6 +1432,9 @@ class TextToSpeechApp(QMainWindow):
         self.char_text_input = QTextEdit()
         self.char_text_input.setPlaceholderText("Character lines...")
         text_layout.addWidget(self.char_text_input)
+        self.char_waveform = WaveformWidget()
+        self.char_waveform.setToolTip("Waveform of the last preview")
+        text_layout.addWidget(self.char_waveform)
         text_group.setLayout(text_layout)
         layout.addWidget(text_group, 1)
 
@@ -867,16 +1448,75 @@ class TextToSpeechApp(QMainWindow):
         self.char_save_btn.setMinimumHeight(40)
         self.char_save_btn.clicked.connect(lambda: self.save_audio(mode="character"))
         
+        self.render_all_btn = QPushButton("Render All Variations...")
+        self.render_all_btn.setMinimumHeight(40)
+        self.render_all_btn.clicked.connect(self.render_all_variations)
+
+        self.queue_render_btn = QPushButton("Queue Render...")
+        self.queue_render_btn.setMinimumHeight(40)
+        self.queue_render_btn.setToolTip("Add every variation to the durable render queue (run 'render_queue.py daemon')")
+        self.queue_render_btn.clicked.connect(self.queue_all_variations)
+
         self.delete_char_btn = QPushButton("Delete Character")
         self.delete_char_btn.setMinimumHeight(40)
         self.delete_char_btn.clicked.connect(self.delete_character)
 
         action_layout.addWidget(self.char_preview_btn)
         action_layout.addWidget(self.char_save_btn)
+        action_layout.addWidget(self.render_all_btn)
+        action_layout.addWidget(self.queue_render_btn)
         action_layout.addWidget(self.delete_char_btn)
         layout.addLayout(action_layout)
 
+        self.char_speculative_check = QCheckBox("Pre-synthesize previews while editing")
+        self.char_speculative_check.setToolTip(self.speculative_check.toolTip())
+        layout.addWidget(self.char_speculative_check)
+
+    def setup_jobs_panel(self):
+        """Dockable list of queued, running and finished generation jobs."""
+        self.jobs_model = JobListModel(self)
+        self.generation_queue.job_added.connect(self.jobs_model.add_job)
+        self.generation_queue.job_changed.connect(self.jobs_model.refresh)
+
+        panel = QWidget()
+        layout = QVBoxLayout(panel)
+        layout.setContentsMargins(4, 4, 4, 4)
+
+        self.jobs_view = QTableView()
+        self.jobs_view.setModel(self.jobs_model)
+        self.jobs_view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.jobs_view.verticalHeader().setVisible(False)
+        self.jobs_view.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.jobs_model.rowsInserted.connect(lambda *_: self.jobs_view.scrollToBottom())
+        layout.addWidget(self.jobs_view)
+
+        buttons = QHBoxLayout()
+        cancel_btn = QPushButton("Cancel Selected")
+        cancel_btn.clicked.connect(self.cancel_selected_jobs)
+        clear_btn = QPushButton("Clear Finished")
+        clear_btn.clicked.connect(self.jobs_model.clear_finished)
+        buttons.addWidget(cancel_btn)
+        buttons.addWidget(clear_btn)
+        buttons.addStretch()
+        layout.addLayout(buttons)
+
+        self.jobs_dock = QDockWidget("Jobs", self)
+        self.jobs_dock.setObjectName("jobsDock")
+        self.jobs_dock.setWidget(panel)
+        self.addDockWidget(Qt.BottomDockWidgetArea, self.jobs_dock)
+
+        # Live "Waited"/"Took" timings while anything is queued or running
+        self.jobs_timer = QTimer(self)
+        self.jobs_timer.setInterval(500)
+        self.jobs_timer.timeout.connect(lambda: self.jobs_model.refresh())
+        self.jobs_timer.start()
+
+    def cancel_selected_jobs(self):
+        for index in self.jobs_view.selectionModel().selectedRows():
+            self.generation_queue.cancel(self.jobs_model.job_at(index.row()))
+
     def setup_playback_tab(self):
+        import waveform
         layout = QVBoxLayout(self.playback_tab)
         
         # Top bar
@@ -889,11 +1529,37 @@ class TextToSpeechApp(QMainWindow):
         top_layout.addWidget(self.folder_label, 1)
         layout.addLayout(top_layout)
         
-        # List
-        self.file_list = QListWidget()
+        # List (model filled in batches by FileScanWorker; metadata filled for visible rows only)
+        self.file_model = AudioFileModel(self)
+        self.file_list = QTableView()
+        self.file_list.setModel(self.file_model)
+        self.file_list.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.file_list.setSelectionMode(QAbstractItemView.ExtendedSelection)
-        self.file_list.itemDoubleClicked.connect(self.play_single_item)
+        self.file_list.setShowGrid(False)
+        self.file_list.setWordWrap(False)
+        self.file_list.verticalHeader().setVisible(False)
+        # Fixed row heights keep scrolling O(1) for huge folders
+        self.file_list.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        header = self.file_list.horizontalHeader()
+        header.setSectionResizeMode(AudioFileModel.COL_NAME, QHeaderView.Stretch)
+        for col in (AudioFileModel.COL_DURATION, AudioFileModel.COL_SIZE, AudioFileModel.COL_BITRATE):
+            header.setSectionResizeMode(col, QHeaderView.Fixed)
+            header.resizeSection(col, 100)
+        header.setSectionResizeMode(AudioFileModel.COL_WAVEFORM, QHeaderView.Fixed)
+        header.resizeSection(AudioFileModel.COL_WAVEFORM, waveform.DEFAULT_COLUMNS)
+        self.file_list.setItemDelegateForColumn(AudioFileModel.COL_WAVEFORM, WaveformDelegate(self.file_list))
+        self.file_list.doubleClicked.connect(self.play_single_item)
         layout.addWidget(self.file_list)
+
+        self.scan_worker = None
+        self.metadata_worker = None
+        self.visible_metadata_timer = QTimer(self)
+        self.visible_metadata_timer.setSingleShot(True)
+        self.visible_metadata_timer.setInterval(100)
+        self.visible_metadata_timer.timeout.connect(self.request_visible_rows)
+        self.file_list.verticalScrollBar().valueChanged.connect(lambda _: self.visible_metadata_timer.start())
+        self.file_model.rowsInserted.connect(lambda *_: self.visible_metadata_timer.start())
+        self.file_model.layoutChanged.connect(lambda *_: self.visible_metadata_timer.start())
         
         # Controls
         ctrl_layout = QHBoxLayout()
@@ -906,11 +1572,44 @@ class TextToSpeechApp(QMainWindow):
         self.stop_btn = QPushButton("Stop")
         self.stop_btn.clicked.connect(self.stop_playback)
         
+        self.review_btn = QPushButton("Review Mode")
+        self.review_btn.setCheckable(True)
+        self.review_btn.toggled.connect(self.toggle_review_mode)
+
         ctrl_layout.addWidget(self.play_selected_btn)
         ctrl_layout.addWidget(self.play_all_btn)
         ctrl_layout.addWidget(self.stop_btn)
+        ctrl_layout.addWidget(self.review_btn)
         layout.addLayout(ctrl_layout)
 
+        # Review controls (shown only in Review Mode)
+        self.review_widget = QWidget()
+        review_layout = QHBoxLayout(self.review_widget)
+        review_layout.setContentsMargins(0, 0, 0, 0)
+        self.review_label = QLabel("")
+        self.review_label.setObjectName("PathLabel")
+        review_layout.addWidget(self.review_label, 1)
+
+        review_actions = [
+            ("Save (S)", "S", lambda: self.review_decide(self.REVIEW_SAVED_FOLDER)),
+            ("Reject (R)", "R", lambda: self.review_decide(self.REVIEW_REJECTED_FOLDER)),
+            ("Replay (P)", "P", self.review_replay),
+            ("Undo (U)", "U", self.review_undo),
+        ]
+        self.review_shortcuts = []
+        for label, key, handler in review_actions:
+            btn = QPushButton(label)
+            btn.clicked.connect(handler)
+            review_layout.addWidget(btn)
+            shortcut = QShortcut(QKeySequence(key), self.playback_tab)
+            shortcut.setContext(Qt.WidgetWithChildrenShortcut)
+            shortcut.setEnabled(False)
+            shortcut.activated.connect(handler)
+            self.review_shortcuts.append(shortcut)
+
+        self.review_widget.setVisible(False)
+        layout.addWidget(self.review_widget)
+
     def open_playback_folder(self):
         last_dir = self.settings.value("last_playback_dir", "")
         folder = QFileDialog.getExistingDirectory(self, "Select Audio Folder", last_dir)
@@ -921,44 +1620,87 @@ class TextToSpeechApp(QMainWindow):
             self.refresh_file_list()
 
     def refresh_file_list(self):
-        self.file_list.clear()
+        """Starts a background listing of the playback folder; rows stream into the model in batches."""
+        import audio_metadata
+        if self.scan_worker and self.scan_worker.isRunning():
+            self.scan_worker.requestInterruption()
+            self.scan_worker.wait()
+        if self.metadata_worker and self.metadata_worker.isRunning():
+            self.metadata_worker.stop()
+            self.metadata_worker.wait()
+        self.file_model.clear()
         if not self.current_playback_folder:
             return
-            
-        exts = ('.mp3', '.wav', '.ogg', '.m4a')
-        try:
-            files = [f for f in os.listdir(self.current_playback_folder) 
-                     if f.lower().endswith(exts)]
-            files.sort()
-            self.file_list.addItems(files)
-        except Exception as e:
-            QMessageBox.warning(self, "Error", f"Failed to list files: {e}")
 
-    def play_single_item(self, item):
-        self.start_playback([item.text()])
+        meta_cache = audio_metadata.DirectoryMetadataCache(self.current_playback_folder)
+        metadata_worker = MetadataWorker(self.current_playback_folder, meta_cache)
+        scan_worker = FileScanWorker(self.current_playback_folder, meta_cache)
+
+        # Signals already queued by workers of a previous folder are ignored
+        metadata_worker.ready.connect(
+            lambda name, meta: metadata_worker is self.metadata_worker and self.file_model.set_metadata(name, meta))
+        scan_worker.batch.connect(
+            lambda entries: scan_worker is self.scan_worker and self.file_model.append_entries(entries))
+        scan_worker.finished.connect(lambda: scan_worker is self.scan_worker and self.on_scan_finished())
+        scan_worker.failed.connect(lambda msg: QMessageBox.warning(self, "Error", f"Failed to list files: {msg}"))
+
+        self.metadata_worker = metadata_worker
+        self.scan_worker = scan_worker
+        metadata_worker.start()
+        scan_worker.start()
+
+    def on_scan_finished(self):
+        """Sorts the finished listing and queues waveforms for every row behind the visible ones."""
+        self.file_model.sort_by_name()
+        self.waveform_worker.request([os.path.join(self.current_playback_folder, n) for n in self.file_model.names()],
+                                     WaveformWorker.PRIORITY_BACKGROUND)
+
+    def request_visible_rows(self):
+        """Asks the metadata and waveform workers for the rows currently on screen first."""
+        count = self.file_model.rowCount()
+        if not count or not self.metadata_worker:
+            return
+        first = max(self.file_list.rowAt(0), 0)
+        last = self.file_list.rowAt(self.file_list.viewport().height() - 1)
+        if last < 0:
+            last = count - 1
+        rows = range(first, last + 1)
+        self.metadata_worker.request([self.file_model.entry(r) for r in rows if self.file_model.needs_metadata(r)])
+        self.waveform_worker.request([os.path.join(self.current_playback_folder, self.file_model.name_at(r)) for r in rows],
+                                     WaveformWorker.PRIORITY_VISIBLE)
+
+    def on_waveform_ready(self, path, peaks):
+        """Routes a finished thumbnail to the playback list or the Characters tab preview strip."""
+        if self.current_playback_folder and os.path.normpath(os.path.dirname(path)) == os.path.normpath(self.current_playback_folder):
+            self.file_model.set_waveform(os.path.basename(path), peaks)
+        if self.preview_clip is not None and path == self.preview_clip.name:
+            self.char_waveform.set_peaks(peaks)
+
+    def play_single_item(self, index):
+        self.start_playback([self.file_model.name_at(index.row())])
 
     def play_selected(self):
-        items = self.file_list.selectedItems()
-        if not items:
+        rows = sorted({i.row() for i in self.file_list.selectionModel().selectedRows()})
+        if not rows:
             return
-        files = [i.text() for i in items]
+        files = [self.file_model.name_at(r) for r in rows]
         self.start_playback(files)
 
     def play_all(self):
-        count = self.file_list.count()
-        if count == 0:
+        files = self.file_model.names()
+        if not files:
             return
-        files = [self.file_list.item(i).text() for i in range(count)]
         self.start_playback(files)
 
     def start_playback(self, filenames):
+        import audio_engine
         if self.playback_worker and self.playback_worker.isRunning():
             self.playback_worker.stop()
             self.playback_worker.wait()
             
         full_paths = []
         for f in filenames:
-            if os.path.isabs(f):
+            if isinstance(f, audio_engine.MemoryClip) or os.path.isabs(f):
                 full_paths.append(f)
             else:
                 full_paths.append(os.path.join(self.current_playback_folder, f))
@@ -967,13 +1709,138 @@ class TextToSpeechApp(QMainWindow):
         self.playback_worker.start()
 
     def stop_playback(self):
-        # Stop playback from the Playback tab
+        import audio_engine
+        # Stop playback from the Playback tab (including Review Mode)
         if self.playback_worker and self.playback_worker.isRunning():
             self.playback_worker.stop()
+        audio_engine.get_engine().stop()
         
-        # Also stop any active generation/preview from other tabs
-        if self.worker and self.worker.isRunning():
-            self.worker.stop()
+        # Also stop any preview being generated; saves are cancelled from the Jobs panel
+        self.generation_queue.cancel_lane(GenerationQueue.INTERACTIVE)
+
+    # --- Review Mode ---
+    # Same folder convention as review_samples.py
+    REVIEW_SAVED_FOLDER = "saved"
+    REVIEW_REJECTED_FOLDER = "rejected"
+    REVIEW_PREFETCH = 3
+
+    def toggle_review_mode(self, enabled):
+        """Enters or leaves keyboard-driven review of the current playback folder."""
+        import audio_engine
+        if enabled:
+            files = self.file_model.names()
+            if not self.current_playback_folder or not files:
+                QMessageBox.information(self, "Review Mode", "Open a folder with audio files to review.")
+                self.review_btn.setChecked(False)
+                return
+            if self.review_moves is None:
+                self.review_moves = triage.MoveQueue()
+            self.review_files = files
+            self.review_index = 0
+            self.review_history = []
+
+        self.review_widget.setVisible(enabled)
+        for shortcut in self.review_shortcuts:
+            shortcut.setEnabled(enabled)
+        for btn in (self.play_selected_btn, self.play_all_btn, self.open_folder_btn):
+            btn.setEnabled(not enabled)
+
+        if enabled:
+            self.file_list.setFocus()
+            self._review_play_current()
+        else:
+            audio_engine.get_engine().stop()
+            self.review_label.setText("")
+
+    def _review_path(self, filename, folder=None):
+        base = self.current_playback_folder
+        return os.path.join(base, folder, filename) if folder else os.path.join(base, filename)
+
+    def _review_play_current(self):
+        """Plays the clip under review (cutting any previous one) and decodes the next few in the background."""
+        import audio_engine
+        engine = audio_engine.get_engine()
+        if self.review_index >= len(self.review_files):
+            engine.stop()
+            self.review_label.setText(f"All {len(self.review_files)} files reviewed.")
+            return
+
+        filename = self.review_files[self.review_index]
+        self.review_label.setText(f"Reviewing {self.review_index + 1}/{len(self.review_files)}: {filename}")
+        row = self.file_model.row_of(filename)
+        if row >= 0:
+            self.file_list.selectRow(row)
+
+        if self.playback_worker and self.playback_worker.isRunning():
+            self.playback_worker.stop()
+        upcoming = self.review_files[self.review_index + 1:self.review_index + 1 + self.REVIEW_PREFETCH]
+        engine.prefetch([self._review_path(f) for f in upcoming])
+        engine.start([self._review_path(filename)])
+
+    def review_decide(self, folder):
+        """Moves the current clip into 'folder' (off the UI thread) and cuts straight to the next one."""
+        import audio_engine
+        if self.review_index >= len(self.review_files):
+            return
+        audio_engine.get_engine().stop()
+        filename = self.review_files[self.review_index]
+        self.review_moves.submit(self._review_path(filename), self._review_path(filename, folder))
+        self.review_history.append((self.review_index, filename, self.file_model.take(filename)))
+
+        self.review_index += 1
+        self._review_play_current()
+
+    def review_replay(self):
+        self._review_play_current()
+
+    def review_undo(self):
+        """Reverts the last save/reject and returns to that clip once the file is back (off the UI thread)."""
+        import audio_engine
+        if not self.review_history:
+            return
+        index, filename, row_data = self.review_history.pop()
+
+        # Put it back in sorted position
+        if row_data:
+            self.file_model.insert_sorted(row_data)
+
+        self.review_index = index
+        audio_engine.get_engine().stop()
+        self.review_label.setText(f"Restoring {filename}...")
+
+        def restored(move):
+            # On the move thread. Only a failed move *back* matters: a cancelled or failed original never left
+            failed = move.undoes is not None and move.state == triage.Move.FAILED
+            self.review_restored.emit(filename, str(move.error) if failed else "")
+
+        # Cancels the move if it hasn't run yet; otherwise the move back runs on the worker
+        self.review_moves.undo(on_done=restored)
+
+    def _on_review_restored(self, filename, error):
+        if error:
+            QMessageBox.warning(self, "Review Mode", f"Could not move {filename} back: {error}")
+        if (self.review_btn.isChecked() and self.review_index < len(self.review_files)
+                and self.review_files[self.review_index] == filename):
+            self._review_play_current()
+
+    def closeEvent(self, event):
+        """Stops audio and applies any queued review moves before exiting."""
+        import audio_engine
+        audio_engine.get_engine().stop()
+        if self.speculative_job is not None:
+            self.speculative_job.cancel(wait=0)
+        self.generation_queue.cancel_all()
+        if self.review_moves is not None:
+            self.review_moves.close()
+        if self.scan_worker and self.scan_worker.isRunning():
+            self.scan_worker.requestInterruption()
+            self.scan_worker.wait()
+        for worker in (self.variation_worker, self.metadata_worker, self.waveform_worker):
+            if worker and worker.isRunning():
+                worker.stop()
+                worker.wait()
+        super().closeEvent(event)
+
     def on_language_changed(self):
         """Updates the country filter when the language changes."""
         selected_language_code = self.language_filter_combo.currentData()
@@ -1004,20 +1871,32 @@ class TextToSpeechApp(QMainWindow):
         # Trigger an update of the voice list
         self.update_voice_list()
 
-    def load_voices(self):
-        """Loads voices from voices.json."""
-        voices = []
-        if self.voices_path and os.path.exists(self.voices_path):
-            try:
-                with open(self.voices_path, 'r', encoding='utf-8') as f:
-                    voices = json.load(f)
-            except Exception as e:
-                print(f"Failed to load voices from {self.voices_path}: {e}")
-        
+    def _start_deferred_loading(self):
+        """Runs on the first event-loop turn, i.e. after the window has been shown."""
+        self.profile.mark("first event loop turn")
+        self.startup_loader.start()
+
+    def on_startup_characters_loaded(self, characters):
+        self.profile.mark("read catalog + library (background)")
+        if characters is None and self.characters_lib_path and os.path.exists(self.characters_lib_path):
+            self.char_combo.clear()
+            self.char_combo.addItem("Error: could not read characters.json")
+        else:
+            self.load_characters(characters)
+        self.profile.mark("populate characters")
+        self.profile.report()
+
+    def load_voices(self, voices=None):
+        """Populates the voice filters and list from voices.json (or from an already-read catalog)."""
+        if voices is None:
+            voices = read_voices(self.voices_path)
+
+        self.voice_combo.clear()
         if not voices:
             self.voice_combo.addItem("Error: voices.json not found or invalid")
             self.voice_combo.setEnabled(False)
             return
+        self.voice_combo.setEnabled(True)
         
         # Process locales to build language and country maps
         for v in voices:
@@ -1141,21 +2020,23 @@ class TextToSpeechApp(QMainWindow):
             display_text = self.format_voice_display_name(v)
             self.voice_combo.addItem(display_text, v.get("ShortName"))
 
-    def load_characters(self):
-        """Loads characters from characters.json."""
-        if not self.characters_lib_path or not os.path.exists(self.characters_lib_path):
+    def load_characters(self, characters=None):
+        """Loads characters from characters.json (or from an already-read library)."""
+        if characters is None and (not self.characters_lib_path or not os.path.exists(self.characters_lib_path)):
             # This can happen on first run if no template exists. The file will be created on save.
             self.characters_data = []
+            self.char_combo.clear()
             self.char_combo.addItem("Error: characters.json not found")
             self.char_combo.setEnabled(False)
             return
 
-        try:
-            with open(self.characters_lib_path, 'r', encoding='utf-8') as f:
-                self.characters_data = json.load(f)
-        except Exception as e:
-            print(f"Failed to load characters: {e}")
-            return
+        if characters is None:
+            try:
+                characters = character_library.load_library(self.characters_lib_path)
+            except Exception as e:
+                print(f"Failed to load characters: {e}")
+                return
+        self.characters_data = characters
 
         # Sort characters by ReferenceID
         self.characters_data.sort(key=lambda x: x.get("ReferenceID", 0))
@@ -1170,6 +2051,75 @@ class TextToSpeechApp(QMainWindow):
         if self.characters_data:
             self.on_character_changed(0)
 
+    def _watch_library(self):
+        """(Re-)registers characters.json with the watcher. Atomic renames replace the file, which drops the watch."""
+        paths = [self.characters_lib_path, os.path.dirname(self.characters_lib_path)]
+        watched = set(self.library_watcher.files() + self.library_watcher.directories())
+        missing = [p for p in paths if p not in watched and os.path.exists(p)]
+        if missing:
+            self.library_watcher.addPaths(missing)
+
+    def _reload_changed_characters(self):
+        """Applies external library edits to the combo box, touching only characters that changed."""
+        self._watch_library()
+        try:
+            new_data = character_library.load_library(self.characters_lib_path)
+        except Exception as e:
+            print(f"Failed to reload characters: {e}")
+            return
+
+        added, changed, removed = character_library.diff_libraries(self.characters_data, new_data)
+        if not (added or changed or removed):
+            return
+
+        current = self.char_combo.currentData()
+        current_id = current.get("ReferenceID") if current else None
+
+        self.char_combo.blockSignals(True)
+        for char in removed:
+            idx = self._char_index(char.get("ReferenceID"))
+            if idx >= 0:
+                self.char_combo.removeItem(idx)
+                self.characters_data.pop(idx)
+
+        for char in changed:
+            idx = self._char_index(char.get("ReferenceID"))
+            if idx >= 0:
+                self.characters_data[idx] = char
+                self.char_combo.setItemText(idx, char.get("Alias", "Unknown"))
+                self.char_combo.setItemData(idx, char)
+
+        for char in added:
+            # Keep the list sorted by ReferenceID, matching load_characters()
+            rid = char.get("ReferenceID", 0)
+            idx = next((i for i, c in enumerate(self.characters_data) if c.get("ReferenceID", 0) > rid), len(self.characters_data))
+            self.characters_data.insert(idx, char)
+            self.char_combo.insertItem(idx, char.get("Alias", "Unknown"), char)
+        self.char_combo.blockSignals(False)
+        self.char_combo.setEnabled(bool(self.characters_data))
+
+        # Refresh the detail widgets only if the selected character was affected
+        new_index = self._char_index(current_id)
+        if new_index < 0:
+            if self.characters_data:
+                self.char_combo.setCurrentIndex(0)
+                self.on_character_changed(0)
+        else:
+            if new_index != self.char_combo.currentIndex():
+                self.char_combo.blockSignals(True)
+                self.char_combo.setCurrentIndex(new_index)
+                self.char_combo.blockSignals(False)
+            if any(c.get("ReferenceID") == current_id for c in changed) and not self.variation_update_timer.isActive():
+                char = self.characters_data[new_index]
+                self.char_desc_label.setText(f"Description: {char.get('Description', '')}")
+                self.on_variation_changed(self.var_combo.currentIndex())
+
+    def _char_index(self, reference_id):
+        """Returns the combo/list index of a character by ReferenceID, or -1."""
+        if reference_id is None:
+            return -1
+        return next((i for i, c in enumerate(self.characters_data) if c.get("ReferenceID") == reference_id), -1)
+
     def create_character(self):
         """Creates a new character based on current General tab settings."""
         # 1. Get Basic Info
@@ -1230,20 +2180,7 @@ class TextToSpeechApp(QMainWindow):
             QMessageBox.critical(self, "Error", "Could not find voice details in voices.json.")
             return
 
-        # 4. Load Library to determine ID
-        library = []
-        if os.path.exists(self.characters_lib_path):
-            try:
-                with open(self.characters_lib_path, 'r', encoding='utf-8') as f:
-                    library = json.load(f)
-            except Exception: 
-                pass
-
-        next_id = 1
-        if library:
-            next_id = max((c.get("ReferenceID", 0) for c in library), default=0) + 1
-
-        # 5. Generate Variations
+        # 4. Generate Variations
         variations = {}
         for name, (rate_off, pitch_off, vol_off, style) in VARIATION_TEMPLATES.items():
             variations[name] = {
@@ -1254,9 +2191,9 @@ class TextToSpeechApp(QMainWindow):
                 "Image": ""
             }
 
-        # 6. Construct Object
+        # 5. Construct Object (ReferenceID is assigned under the library lock)
         new_character = {
-            "ReferenceID": next_id,
+            "ReferenceID": 0,
             "Alias": alias,
             "Engine": "edge-tts",
             "VoiceID": voice_data.get("ID", 0),
@@ -1273,16 +2210,13 @@ class TextToSpeechApp(QMainWindow):
             "Variations": variations
         }
 
-        # 7. Save (Update if exists, else append)
-        existing_index = next((i for i, c in enumerate(library) if c["Alias"] == alias), -1)
-        if existing_index >= 0:
-            new_character["ReferenceID"] = library[existing_index]["ReferenceID"]
-            library[existing_index] = new_character
-        else:
-            library.append(new_character)
-
-        with open(self.characters_lib_path, 'w', encoding='utf-8') as f:
-            json.dump(library, f, indent=4)
+        # 6. Save (Update if exists, else append)
+        try:
+            character_library.update_library(
+                lambda library: character_library.upsert_character(library, new_character), self.characters_lib_path)
+        except Exception as e:
+            QMessageBox.critical(self, "Save Error", f"Failed to save characters.json.\n\n{e}")
+            return
 
         self.load_characters() # Refresh UI
         QMessageBox.information(self, "Success", f"Character '{alias}' saved successfully!")
@@ -1302,13 +2236,14 @@ class TextToSpeechApp(QMainWindow):
                                      QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
 
         if reply == QMessageBox.Yes:
-            # Remove from the internal list
-            self.characters_data.pop(current_index)
+            reference_id = char_data.get("ReferenceID")
+
+            def remove_character(library):
+                """Drops this character from the on-disk library, keeping other processes' edits."""
+                library[:] = [c for c in library if c.get("ReferenceID") != reference_id]
 
-            # Save the updated library back to the file
             try:
-                with open(self.characters_lib_path, 'w', encoding='utf-8') as f:
-                    json.dump(self.characters_data, f, indent=4)
+                character_library.update_library(remove_character, self.characters_lib_path)
                 self.load_characters() # Refresh UI
                 QMessageBox.information(self, "Success", f"Character '{alias}' has been deleted.")
             except Exception as e:
@@ -1406,17 +2341,26 @@ class TextToSpeechApp(QMainWindow):
         else:
             return
 
-        # Save the entire library back to the file
+        def apply_variation(library):
+            """Patches just this variation in the on-disk library."""
+            for c in library:
+                if c.get("ReferenceID") == char_to_update.get("ReferenceID"):
+                    c.setdefault("Variations", {})[var_name] = dict(char_to_update["Variations"][var_name])
+
+        # Save the change back to the file
         try:
-            with open(self.characters_lib_path, 'w', encoding='utf-8') as f:
-                json.dump(self.characters_data, f, indent=4)
+            character_library.update_library(apply_variation, self.characters_lib_path)
             # Also update the data stored in the combobox item to keep it in sync
             self.char_combo.setItemData(self.char_combo.currentIndex(), char_to_update)
         except Exception as e:
             QMessageBox.critical(self, "Save Error", f"Failed to save characters.json.\n\n{e}")
 
-    def preview_audio(self, mode="general"):
-        """Generates audio to a temp file and plays it."""
+    def _generation_params(self, mode):
+        """
+        Returns (text, voice, pitch, rate, volume) for the General or Characters tab, or None if no
+        character/variation is selected. In character mode the variation spin boxes are used, so a
+        preview reflects edits that haven't been written to characters.json yet.
+        """
         if mode == "general":
             text = self.text_input.toPlainText().strip()
             voice = self.voice_combo.currentData()
@@ -1428,59 +2372,110 @@ class TextToSpeechApp(QMainWindow):
             char = self.char_combo.currentData()
             var_name = self.var_combo.currentText()
             if not char or not var_name:
-                QMessageBox.warning(self, "Selection Error", "Please select a character and variation.")
-                return
+                return None
             voice = char.get("ShortName")
-            settings = char.get("Variations", {}).get(var_name, {})
-            pitch = settings.get("Pitch", "+0Hz")
-            rate = settings.get("Rate", "+0%")
-            volume = settings.get("Volume", "+0%")
+            pitch = f"{self.char_pitch_spin.value():+d}Hz"
+            rate = f"{self.char_rate_spin.value():+d}%"
+            volume = f"{self.char_vol_spin.value():+d}%"
+        return text, voice, pitch, rate, volume
+
+    def _lexicon(self, mode):
+        """The pronunciation lexicon for a tab: the global one, plus the character's entries on the Characters tab."""
+        import pronunciation
+        if mode == "character":
+            return pronunciation.for_character(self.char_combo.currentData())
+        return pronunciation.get_lexicon()
+
+    def set_speculative_preview(self, enabled):
+        """Keeps both tabs' checkboxes in sync and remembers the choice."""
+        for check in (self.speculative_check, self.char_speculative_check):
+            check.setChecked(enabled)
+        self.settings.setValue("speculative_preview", enabled)
+        if enabled:
+            self.schedule_speculative_preview()
+        elif self.speculative_job is not None:
+            self.speculative_job.cancel(wait=0)
+
+    def schedule_speculative_preview(self, *_):
+        """Restarts the idle debounce after any edit to the text, voice or controls."""
+        if self.speculative_check.isChecked():
+            self.speculative_timer.start()
+
+    def _run_speculative_preview(self):
+        """Synthesizes the current tab's preview into the synthesis cache, superseding older speculation."""
+        import tts_engine
+        mode = {0: "general", 1: "character"}.get(self.tabs.currentIndex())
+        params = self._generation_params(mode) if mode else None
+        if not params or not params[0] or not params[1]:
+            return
+        text, voice, pitch, rate, volume = params
+        lexicon = self._lexicon(mode)
+        synthesizer = tts_engine.get_synthesizer()
+        key = synthesizer.key_for(text, voice, pitch, rate, volume, lexicon)
+        job = self.speculative_job
+        if key == self.speculative_key and job is not None and not job.cancelled() and job.exception() is None:
+            return  # Already done or in flight; a failed attempt (e.g. a network error) is retried
+        if job is not None:
+            job.cancel(wait=0)
+
+        self.speculative_key = key
+        self.speculative_job = None
+        if synthesizer.cache.contains(key):
+            return
+        self.speculative_job = tts_engine.get_runner().submit(
+            synthesizer.synthesize(text, voice, pitch=pitch, rate=rate, volume=volume, lexicon=lexicon))
+
+    def preview_audio(self, mode="general"):
+        """Generates audio in memory and plays it."""
+        params = self._generation_params(mode)
+        if params is None:
+            QMessageBox.warning(self, "Selection Error", "Please select a character and variation.")
+            return
+        text, voice, pitch, rate, volume = params
 
         if not text or not voice:
             QMessageBox.warning(self, "Input Error", "Please enter text and select a voice.")
             return
 
-        self.temp_preview_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "temp_preview.mp3")
-
-        self.worker = GenerationWorker(text, self.temp_preview_file, voice, pitch, rate, volume)
-        self.worker.finished.connect(self.on_generation_for_preview_finished)
-
         btn = self.preview_btn if mode == "general" else self.char_preview_btn
+        worker = GenerationWorker(text, None, voice, pitch, rate, volume, label=f"Preview: {text[:40]}",
+                                  lexicon=self._lexicon(mode))
+        worker.finished.connect(lambda success, msg: self.on_generation_for_preview_finished(success, msg, worker, btn))
+
+        # Only the newest preview is worth playing
+        self.generation_queue.cancel_lane(GenerationQueue.INTERACTIVE)
+        self.preview_worker = worker
         btn.setEnabled(False)
         btn.setText("Generating...")
-        self.worker.start()
+        self.generation_queue.submit(worker, GenerationQueue.INTERACTIVE)
 
-    def on_generation_for_preview_finished(self, success, msg):
+    def on_generation_for_preview_finished(self, success, msg, worker, btn):
         """Called after generation for preview. If successful, plays the file."""
-        # Re-enable the correct button
-        current_tab_index = self.tabs.currentIndex()
-        btn = self.preview_btn if current_tab_index == 0 else self.char_preview_btn
+        import audio_engine
         btn.setEnabled(True)
         btn.setText("Preview (Play)")
+        if worker is not self.preview_worker or worker.state == GenerationWorker.CANCELLED:
+            return
 
         if success:
-            self.start_playback([self.temp_preview_file])
+            # Played straight from memory; nothing is written until the user saves
+            self.preview_clip = audio_engine.MemoryClip(worker.result)
+            self.preview_params = (worker.text, worker.voice, worker.pitch, worker.rate, worker.volume, worker.lexicon)
+            self.start_playback([self.preview_clip])
+            self.waveform_worker.request([self.preview_clip], WaveformWorker.PRIORITY_VISIBLE)
         else:
             QMessageBox.critical(self, "Generation Error", f"Failed to generate audio for preview.\n\n{msg}")
 
     def save_audio(self, mode="general"):
         """Opens save dialog and generates audio file."""
+        import tts_engine
         last_dir = self.settings.value("last_save_dir", "")
         
         # Generate default filename from text
         text = self.text_input.toPlainText() if mode == "general" else self.char_text_input.toPlainText()
         text = text.strip()
         
-        default_name = "output.mp3"
-        if text:
-            # Sanitize: keep alphanumeric, spaces, hyphens
-            safe_text = re.sub(r'[^\w\s-]', '', text)
-            # Replace spaces/hyphens with underscores
-            safe_text = re.sub(r'[-\s]+', '_', safe_text).strip('_')
-            # Truncate to 24 chars
-            safe_text = safe_text[:24]
-            if safe_text:
-                default_name = f"{safe_text}.mp3"
+        default_name = f"{self._file_stem_from_text(text)}.mp3"
 
         if mode == "character":
             char = self.char_combo.currentData()
@@ -1499,42 +2494,121 @@ class TextToSpeechApp(QMainWindow):
         self.settings.setValue("last_save_dir", os.path.dirname(file_path))
 
         # Get generation parameters
-        if mode == "general":
-            voice = self.voice_combo.currentData()
-            pitch = f"{self.pitch_spin.value():+d}Hz"
-            rate = f"{self.rate_spin.value():+d}%"
-            volume = f"{self.vol_spin.value():+d}%"
-        else: # character mode
-            char = self.char_combo.currentData()
-            var_name = self.var_combo.currentText()
-            voice = char.get("ShortName")
-            settings = char.get("Variations", {}).get(var_name, {})
-            pitch = settings.get("Pitch", "+0Hz")
-            rate = settings.get("Rate", "+0%")
-            volume = settings.get("Volume", "+0%")
+        params = self._generation_params(mode)
+        if params is None:
+            QMessageBox.warning(self, "Selection Error", "Please select a character and variation.")
+            return
+        _, voice, pitch, rate, volume = params
 
         if not text or not voice:
             QMessageBox.warning(self, "Input Error", "Please enter text and select a voice.")
             return
 
-        self.worker = GenerationWorker(text, file_path, voice, pitch, rate, volume)
-        self.worker.finished.connect(lambda success, msg: self.on_save_finished(success, msg, btn, original_text, file_path))
+        lexicon = self._lexicon(mode)
+        if self.preview_clip is not None and self.preview_params == (text, voice, pitch, rate, volume, lexicon):
+            # Same audio as the last preview: write its buffer instead of synthesizing again
+            try:
+                tts_engine.write_atomic(file_path, self.preview_clip.data)
+            except OSError as e:
+                self.on_save_finished(False, str(e), file_path)
+                return
+            self.on_save_finished(True, "", file_path)
+            return
 
-        btn = self.preview_btn if mode == "general" else self.char_preview_btn
-        
-        btn.setEnabled(False)
-        original_text = btn.text()
-        btn.setText("Generating...")
+        # Saves run concurrently in the bulk lane; progress is shown in the Jobs panel
+        worker = GenerationWorker(text, file_path, voice, pitch, rate, volume,
+                                  label=f"Save: {os.path.basename(file_path)}", lexicon=lexicon)
+        worker.finished.connect(lambda success, msg: self.on_save_finished(success, msg, file_path))
+        self.generation_queue.submit(worker, GenerationQueue.BULK)
+        self.statusBar().showMessage(f"Queued {os.path.basename(file_path)}", 3000)
+
+    def _file_stem_from_text(self, text, default="output"):
+        """Builds a short, filesystem-safe file name (without extension) from the line text."""
+        # Sanitize: keep alphanumeric, spaces, hyphens
+        safe_text = re.sub(r'[^\w\s-]', '', text)
+        # Replace spaces/hyphens with underscores
+        safe_text = re.sub(r'[-\s]+', '_', safe_text).strip('_')
+        # Truncate to 24 chars
+        return safe_text[:24] or default
+
+    def render_all_variations(self):
+        """Renders the current line for every variation of the selected character into per-variation folders."""
+        if self.variation_worker and self.variation_worker.isRunning():
+            return
+
+        char = self.char_combo.currentData()
+        text = self.char_text_input.toPlainText().strip()
+        if not char or not text:
+            QMessageBox.warning(self, "Input Error", "Please select a character and enter a line.")
+            return
+
+        last_dir = self.settings.value("last_variation_dir", self.settings.value("last_save_dir", ""))
+        output_dir = QFileDialog.getExistingDirectory(
+            self, f"Output Folder for '{char.get('Alias', '')}' (one subfolder per variation)", last_dir)
+        if not output_dir:
+            return
+        self.settings.setValue("last_variation_dir", output_dir)
 
-        self.worker.start()
+        file_name, ok = QInputDialog.getText(self, "Render All Variations", "File name (without extension):",
+                                             QLineEdit.Normal, self._file_stem_from_text(text))
+        if not ok or not file_name.strip():
+            return
+
+        self.render_all_btn.setEnabled(False)
+        self.render_all_btn.setText("Rendering...")
+        self.variation_worker = VariationRenderWorker(char, text, output_dir, file_name.strip())
+        self.variation_worker.progress.connect(
+            lambda done, total: self.render_all_btn.setText(f"Rendering {done}/{total}..."))
+        self.variation_worker.rendered.connect(lambda results: self.on_variations_rendered(results, output_dir))
+        self.variation_worker.start()
+
+    def queue_all_variations(self):
+        """Submits every variation of the current line to the durable render queue instead of rendering now."""
+        import character_lines
+        char = self.char_combo.currentData()
+        text = self.char_text_input.toPlainText().strip()
+        if not char or not text:
+            QMessageBox.warning(self, "Input Error", "Please select a character and enter a line.")
+            return
+
+        last_dir = self.settings.value("last_variation_dir", self.settings.value("last_save_dir", ""))
+        output_dir = QFileDialog.getExistingDirectory(
+            self, f"Output Folder for '{char.get('Alias', '')}' (one subfolder per variation)", last_dir)
+        if not output_dir:
+            return
+        self.settings.setValue("last_variation_dir", output_dir)
+
+        file_name, ok = QInputDialog.getText(self, "Queue Render", "File name (without extension):",
+                                             QLineEdit.Normal, self._file_stem_from_text(text))
+        if not ok or not file_name.strip():
+            return
 
-    def on_save_finished(self, success, msg, btn, original_text, file_path):
-            btn.setEnabled(True)
-            btn.setText(original_text)
+        try:
+            ids = character_lines.queue_variations([char], text, output_dir, file_name.strip())
+        except Exception as e:
+            QMessageBox.critical(self, "Queue Error", f"Could not add the jobs to the render queue.\n\n{e}")
+            return
+        self.statusBar().showMessage(
+            f"Queued {len(ids)} variation(s) as batch '{file_name.strip()}'. Run 'render_queue.py daemon' to render.", 8000)
+
+    def on_variations_rendered(self, results, output_dir):
+        self.render_all_btn.setEnabled(True)
+        self.render_all_btn.setText("Render All Variations...")
+
+        failures = [r for r in results if r[3]]
+        if failures:
+            details = "\n".join(f"{var}: {err}" for _, var, _, err in failures)
+            QMessageBox.critical(self, "Generation Error",
+                                 f"{len(failures)} of {len(results)} variations failed.\n\n{details}")
+        else:
+            QMessageBox.information(self, "Success", f"Rendered {len(results)} variations into:\n{output_dir}")
+
+    def on_save_finished(self, success, msg, file_path):
             if success:
-                # Don't show success message if user cancelled
+                # Don't show success message if user cancelled; several saves may finish in a row,
+                # so report in the status bar rather than with a modal dialog
                 if "cancelled by user" not in msg.lower():
-                    QMessageBox.information(self, "Success", f"Audio saved to:\n{file_path}")
+                    self.statusBar().showMessage(f"Audio saved to: {file_path}", 5000)
             else:
                 QMessageBox.critical(self, "Generation Error", f"Failed to save audio.\n\n{msg}")
 
@@ -1570,7 +2644,20 @@ class TextToSpeechApp(QMainWindow):
 #--- Application Entry Point ---
 #=====================================================================================================
 if __name__ == '__main__':
-    app = QApplication(sys.argv)
+    parser = argparse.ArgumentParser(description="Text to Speech Tool")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="Print a phase-by-phase startup timing breakdown to the console")
+    parser.add_argument("--profile", choices=tts_profiling.PROFILE_MODES,
+                        help="Profile the UI thread, the synthesis loop and playback (see tts_profiling.py)")
+    parser.add_argument("--stall-ms", type=int, metavar="N",
+                        help="Print the UI thread's stack whenever the event loop is blocked for more than N ms")
+    # Leave Qt's own options (e.g. -platform) to QApplication
+    args, qt_args = parser.parse_known_args()
+    profile = StartupProfile(args.profile_startup)
+    tts_profiling.configure(profile=args.profile, stall_threshold_ms=args.stall_ms)
+    profile.mark("imports")
+
+    app = QApplication(sys.argv[:1] + qt_args)
     app.setStyle("Fusion")
 
     # --- Dark Palette for correct Fusion rendering of controls like QSpinBox ---
@@ -1594,6 +2681,15 @@ if __name__ == '__main__':
     css_icon_path = resource_path(os.path.join("assets", "icons", "checkmark.png")).replace("\\", "/")
     app.setStyleSheet(DARK_STYLESHEET.replace("{css_icon_path}", css_icon_path))
 
-    window = TextToSpeechApp()
+    profile.mark("QApplication + style")
+
+    window = TextToSpeechApp(profile)
     window.show()
-    sys.exit(app.exec())
+    profile.mark("show window")
+
+    if tts_profiling.stall_ms:
+        stall_detector = tts_profiling.StallDetector(tts_profiling.stall_ms)
+        stall_detector.start()
+    with tts_profiling.profiled("ui"):
+        exit_code = app.exec()
+    sys.exit(exit_code)
@@ -0,0 +1,166 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# --- Script Summary ---
+# Responsibility: Shared pieces of the review/triage workflow: audio file listing, single-keypress
+#                 input for the terminal, and a background queue that applies save/reject moves.
+# Usage: import triage
+# ----------------------
+
+# Copyright (C) 2025 steve.rock@wheelhouser.com
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#===============================================================================================================
+
+import os
+import queue
+import shutil
+import sys
+import threading
+
+AUDIO_EXTENSIONS = ('.mp3', '.wav', '.ogg', '.m4a')
+
+def list_audio_files(directory):
+    """Returns the sorted names of audio files directly inside 'directory'."""
+    with os.scandir(directory) as entries:
+        files = [e.name for e in entries if e.name.lower().endswith(AUDIO_EXTENSIONS) and e.is_file()]
+    files.sort()
+    return files
+
+def read_key():
+    """
+    Reads a single keypress without waiting for Enter (falls back to reading a line when not a TTY).
+    A blank line returns "". Raises EOFError at the end of input, like input().
+    """
+    if not sys.stdin.isatty():
+        line = sys.stdin.readline()
+        if not line:
+            raise EOFError
+        return line.strip()[:1]
+
+    try:
+        import msvcrt
+        return msvcrt.getwch()
+    except ImportError:
+        pass
+
+    import termios
+    import tty
+    fd = sys.stdin.fileno()
+    old_settings = termios.tcgetattr(fd)
+    try:
+        tty.setcbreak(fd)
+        key = sys.stdin.read(1)
+    finally:
+        termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
+    if not key:
+        raise EOFError
+    return key
+
+class Move:
+    """One queued move. 'state' goes PENDING -> RUNNING -> DONE or FAILED, or PENDING -> CANCELLED."""
+    PENDING, RUNNING, DONE, FAILED, CANCELLED = "pending", "running", "done", "failed", "cancelled"
+
+    def __init__(self, src, dst, undoes=None, on_done=None):
+        self.src = src
+        self.dst = dst
+        self.undoes = undoes      # For a reverse move: the move it reverts
+        self.on_done = on_done    # Called with the move once it is finished, on the worker thread
+        self.state = self.PENDING
+        self.error = None
+        self.finished = threading.Event()
+
+class MoveQueue:
+    """Applies file moves in order on a background thread so the reviewer never waits on disk I/O."""
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="triage-moves", daemon=True)
+        self.errors = []
+        self.history = []  # Submitted Moves, newest last, for undo()
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            move = self._queue.get()
+            try:
+                if move is None:
+                    return
+                with self._lock:
+                    if move.state == Move.CANCELLED:
+                        continue
+                    if move.undoes is not None and move.undoes.state != Move.DONE:
+                        # The original failed, so there is nothing to move back
+                        move.state = Move.DONE
+                    else:
+                        move.state = Move.RUNNING
+                if move.state == Move.RUNNING:
+                    try:
+                        os.makedirs(os.path.dirname(move.dst), exist_ok=True)
+                        shutil.move(move.src, move.dst)
+                        move.state = Move.DONE
+                    except Exception as e:
+                        move.state, move.error = Move.FAILED, e
+                        self.errors.append(((move.src, move.dst), e))
+                        print(f"\nError moving {move.src}: {e}")
+                self._finish(move)
+            finally:
+                self._queue.task_done()
+
+    @staticmethod
+    def _finish(move):
+        move.finished.set()
+        if move.on_done:
+            move.on_done(move)
+
+    def submit(self, src, dst):
+        move = Move(src, dst)
+        self.history.append(move)
+        self._queue.put(move)
+        return move
+
+    def undo(self, on_done=None):
+        """
+        Reverts the most recent move without waiting for disk I/O. A move that hasn't started is cancelled;
+        one that failed is just forgotten; otherwise the reverse move is queued behind it (moves run in order).
+        Returns the Move whose completion means the file is back at its source (already finished unless a
+        reverse move was queued), or None if there is nothing to undo. 'on_done(move)' is called once it is
+        finished: on the worker thread, or right away if it already is.
+        """
+        if not self.history:
+            return None
+        original = self.history.pop()
+        with self._lock:
+            if original.state in (Move.PENDING, Move.FAILED):
+                if original.state == Move.PENDING:
+                    original.state = Move.CANCELLED
+                reverse = None
+            else:
+                reverse = Move(original.dst, original.src, undoes=original, on_done=on_done)
+                self._queue.put(reverse)
+        if reverse is not None:
+            return reverse
+        original.on_done = on_done
+        self._finish(original)
+        return original
+
+    def flush(self):
+        """Blocks until every submitted move has been applied."""
+        self._queue.join()
+
+    def close(self):
+        """Applies outstanding moves and stops the worker thread."""
+        self._queue.put(None)
+        self._thread.join()
@@ -0,0 +1,82 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# --- Script Summary ---
+# Responsibility: Single command line entry point for the tools in this folder. Each subcommand's module is
+#                 imported only when that subcommand runs (or asks for its --help), so start-up stays fast,
+#                 and subcommands that chain (batch -> sample, character -> speak) call each other in-process.
+# Usage: python tts.py <command> [options]     (tip: alias tts="python /path/to/src/tts.py")
+# Examples:
+#   python tts.py speak "Hello there" hello.mp3 --voice en-US-GuyNeural --play
+#   python tts.py voices --locale en-GB
+#   python tts.py sample "Hello world" 1,5,10 --output-dir samples
+#   python tts.py batch Male "Hello there" ./male_samples
+#   python tts.py character --alias Yoda --all-variations --lines "Hello" --output-dir out --file-name hello
+#   python tts.py review ./male_samples
+#   python tts.py play hello.mp3
+#   python tts.py --profile sample batch Male "Hello there" ./male_samples   # writes a flame graph profile
+# ----------------------
+
+# Copyright (C) 2025 steve.rock@wheelhouser.com
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#===============================================================================================================
+
+import argparse
+import importlib
+import sys
+
+# command -> (module, function adding its arguments, function running it, one-line help)
+COMMANDS = {
+    "speak":     ("generate_speech_edge", "add_speak_arguments", "run", "Synthesize text to an MP3 with Edge TTS"),
+    "voices":    ("generate_speech_edge", "add_voices_arguments", "run_voices", "List the voices Edge TTS offers"),
+    "sample":    ("sample_voices", "add_arguments", "run", "Render samples for Voice IDs from voices.json"),
+    "batch":     ("batch_generate", "add_arguments", "run", "Render samples for every voice of one gender"),
+    "character": ("character_lines", "add_arguments", "run", "Render a line for a character's variations"),
+    "review":    ("review_samples", "add_arguments", "run", "Play clips one by one and sort them into saved/rejected"),
+    "play":      ("play_audio", "add_arguments", "run", "Play an audio file"),
+    "pack":      ("sample_pack", "add_arguments", "run", "List, extract or import packed sample archives"),
+}
+
+def build_parser(argv):
+    """
+    Builds the parser. Only the subcommand named in 'argv' gets its arguments (and its module imported);
+    the others just need their name and help line for 'tts --help'.
+    """
+    parser = argparse.ArgumentParser(prog="tts", description="Text-to-speech tools.")
+    parser.add_argument("--profile", choices=("cprofile", "sample"),
+                        help="Profile the command: cProfile (.pstats) or stack sampling (.collapsed, for flame graphs)")
+    parser.add_argument("--trace-malloc", action="store_true",
+                        help="Report and snapshot memory allocations of batch runs with tracemalloc")
+    subparsers = parser.add_subparsers(dest="command", metavar="<command>", required=True)
+    # The command is the first positional argument ('--profile' takes a value, so skip that)
+    positionals = (a for i, a in enumerate(argv) if not a.startswith("-") and (i == 0 or argv[i - 1] != "--profile"))
+    chosen = next(positionals, None)
+    for name, (module, add_arguments, _, help_text) in COMMANDS.items():
+        subparser = subparsers.add_parser(name, help=help_text, description=help_text)
+        if name == chosen:
+            getattr(importlib.import_module(module), add_arguments)(subparser)
+    return parser
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    args = build_parser(argv).parse_args(argv)
+    if args.profile or args.trace_malloc:
+        import tts_profiling
+        tts_profiling.configure(profile=args.profile, trace_frames=25 if args.trace_malloc else None)
+    module, _, run, _ = COMMANDS[args.command]
+    getattr(importlib.import_module(module), run)(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# --- Script Summary ---
+# Responsibility: Public async API for embedding synthesis in other Python code. Every call goes through
+#                 the shared tts_engine.Synthesizer, so it gets the same concurrency limit, request
+#                 dedupe and on-disk cache as the GUI, the CLI tools and tts_server.py.
+# Usage: import tts_api
+#   audio = await tts_api.synthesize("Hello", "en-US-GuyNeural", tts_api.Prosody(pitch="-10Hz"))
+#   async for result in tts_api.synthesize_many(["One", "Two", {"text": "Three", "outfile": "3.mp3"}]):
+#       print(result.job.text, result.error or len(result.audio))
+#   async for event in tts_api.stream("Hello. Goodbye."):
+#       if isinstance(event, tts_api.Boundary): print(event.offset, event.text)
+#       else: player.feed(event.data)
+# Outside asyncio: tts_engine.get_runner().submit(tts_api.synthesize("Hello")).result()
+# ----------------------
+
+# Copyright (C) 2025 steve.rock@wheelhouser.com
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# --- Setup Instructions ---
+# Active the venv on linux/macOS:
+# python -m venv .venv
+# source .venv/bin/activate
+# pip install --upgrade pip
+# pip install edge-tts
+#===============================================================================================================
+
+import asyncio
+import collections
+import tts_engine
+
+DEFAULT_VOICE = tts_engine.DEFAULT_VOICE
+TICKS_PER_SECOND = 10_000_000  # Edge TTS reports boundary offsets in 100 ns ticks
+
+Prosody = collections.namedtuple("Prosody", "pitch rate volume", defaults=("+0Hz", "+0%", "+0%"))
+SynthesisJob = collections.namedtuple("SynthesisJob", "text voice prosody outfile",
+                                      defaults=(DEFAULT_VOICE, None, None))
+# 'audio' is the MP3 bytes (also when written to job.outfile); 'error' is the exception if it failed
+Result = collections.namedtuple("Result", "job audio error")
+AudioChunk = collections.namedtuple("AudioChunk", "data")
+# 'kind' is e.g. "SentenceBoundary"; offset and duration are in seconds from the start of the audio
+Boundary = collections.namedtuple("Boundary", "kind offset duration text")
+
+def as_prosody(prosody):
+    """Accepts None, a Prosody, a (pitch, rate, volume) tuple or a dict (lower or Capitalized keys)."""
+    if prosody is None:
+        return Prosody()
+    if isinstance(prosody, dict):
+        return Prosody(**{k: prosody.get(k, prosody.get(k.capitalize(), d))
+                          for k, d in Prosody._field_defaults.items()})
+    return Prosody(*prosody)
+
+def as_job(job):
+    """Accepts a SynthesisJob, a plain string (text with the default voice) or a dict with the same fields."""
+    if isinstance(job, SynthesisJob):
+        return job._replace(prosody=as_prosody(job.prosody))
+    if isinstance(job, str):
+        return SynthesisJob(job, prosody=Prosody())
+    if isinstance(job, dict):
+        prosody = job.get("prosody") or {k: job[k] for k in Prosody._fields if k in job}
+        return SynthesisJob(job["text"], job.get("voice") or DEFAULT_VOICE, as_prosody(prosody), job.get("outfile"))
+    raise TypeError(f"Unsupported job: {job!r}")
+
+async def synthesize(text, voice=DEFAULT_VOICE, prosody=None, *, on_progress=None, lexicon=None, synthesizer=None):
+    """
+    Returns the MP3 bytes for 'text'. 'on_progress(fraction)' follows the spoken sentences.
+    'lexicon' is a pronunciation.Lexicon (default: the global one; pronunciation.EMPTY for none).
+    """
+    synthesizer = synthesizer or tts_engine.get_synthesizer()
+    pitch, rate, volume = as_prosody(prosody)
+    return await synthesizer.synthesize(text, voice, pitch=pitch, rate=rate, volume=volume, on_progress=on_progress,
+                                        lexicon=lexicon)
+
+async def synthesize_many(jobs, concurrency=None, *, synthesizer=None):
+    """
+    Runs 'jobs' (see as_job) and yields a Result for each as it completes, in completion order.
+    At most 'concurrency' jobs are started at a time (default: the synthesizer's limit, which also
+    caps the requests that actually go to Edge TTS). Jobs are read from the iterable lazily, so it may
+    be a generator. A failed job yields a Result with 'error' set and does not stop the others.
+    Closing the generator early cancels the jobs still running.
+    """
+    synthesizer = synthesizer or tts_engine.get_synthesizer()
+    limit = max(1, concurrency or synthesizer.concurrency)
+    jobs = iter(jobs)
+
+    async def run(job):
+        try:
+            pitch, rate, volume = job.prosody
+            audio = await synthesizer.synthesize(job.text, job.voice, pitch=pitch, rate=rate, volume=volume)
+            if job.outfile:
+                tts_engine.write_atomic(job.outfile, audio)
+        except Exception as e:
+            return Result(job, None, e)
+        return Result(job, audio, None)
+
+    pending = set()
+    try:
+        while True:
+            for job in jobs:
+                pending.add(asyncio.ensure_future(run(as_job(job))))
+                if len(pending) >= limit:
+                    break
+            if not pending:
+                return
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+async def stream(text, voice=DEFAULT_VOICE, prosody=None, *, boundaries=True, chunk_size=16384, lexicon=None,
+                 synthesizer=None):
+    """
+    Yields AudioChunk(data) as MP3 arrives, interleaved with Boundary events (unless boundaries=False).
+    Cached lines are replayed from disk with their boundaries; identical concurrent streams share one fetch.
+    """
+    synthesizer = synthesizer or tts_engine.get_synthesizer()
+    pitch, rate, volume = as_prosody(prosody)
+    events = synthesizer.stream(text, voice, pitch=pitch, rate=rate, volume=volume,
+                                chunk_size=chunk_size, events=boundaries, lexicon=lexicon)
+    try:
+        async for event in events:
+            if not boundaries:
+                yield AudioChunk(event)
+            elif event["type"] == "audio":
+                yield AudioChunk(event["data"])
+            else:
+                yield Boundary(event["type"], event.get("offset", 0) / TICKS_PER_SECOND,
+                               event.get("duration", 0) / TICKS_PER_SECOND, event.get("text", ""))
+    finally:
+        await events.aclose()
@@ -0,0 +1,567 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# --- Script Summary ---
+# Responsibility: Shared Edge TTS synthesis layer. One Synthesizer per process bounds concurrency
+#                 and serves repeated requests from a content-addressed on-disk cache.
+#                 Callers outside asyncio submit jobs to a persistent loop (AsyncRunner) and can cancel them.
+# Usage: import tts_engine
+#   data = await tts_engine.get_synthesizer().synthesize("Hello", "en-US-GuyNeural", pitch="-10Hz")
+#   job = tts_engine.get_runner().submit(tts_engine.get_synthesizer().save("out.mp3", "Hello"))
+#   job.cancel()
+# ----------------------
+
+# Copyright (C) 2025 steve.rock@wheelhouser.com
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# --- Setup Instructions ---
+# Active the venv on linux/macOS:
+# python -m venv .venv
+# source .venv/bin/activate
+# pip install --upgrade pip
+# pip install edge-tts
+#===============================================================================================================
+
+import asyncio
+import collections
+import contextlib
+import contextvars
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import app_paths
+import pronunciation
+import tts_metrics
+import tts_profiling
+import tts_scheduler
+
+ENGINE_NAME = "edge-tts"
+DEFAULT_VOICE = "en-US-AriaNeural"
+DEFAULT_CONCURRENCY = int(os.environ.get("TTS_CONCURRENCY", "4"))
+# How long Job.cancel() waits for the task to unwind before returning
+CANCEL_WAIT_SECONDS = 0.05
+# Read once: os.umask() can only be queried by setting it
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+# Timing record of the upstream fetch running in the current task; the connector fills in 'connect'
+_fetch_record = contextvars.ContextVar("tts_fetch_record", default=None)
+_TimedConnector = None
+
+def _timed_connector():
+    """An aiohttp connector that records how long opening the connection took in the current fetch record."""
+    global _TimedConnector
+    if _TimedConnector is None:
+        import aiohttp
+
+        class TimedConnector(aiohttp.TCPConnector):
+            async def connect(self, *args, **kwargs):
+                start = time.perf_counter()
+                connection = await super().connect(*args, **kwargs)
+                record = _fetch_record.get()
+                if record is not None and "connect" not in record:
+                    record["connect"] = time.perf_counter() - start
+                return connection
+        _TimedConnector = TimedConnector
+    return _TimedConnector()
+
+def cache_key(text, voice, pitch="+0Hz", rate="+0%", volume="+0%", engine=ENGINE_NAME):
+    """Stable hash of everything that affects the synthesized audio."""
+    payload = json.dumps([engine, voice, pitch, rate, volume, text], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def write_atomic(path, data):
+    """Writes bytes to a temp file next to 'path' and renames it into place."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=".tts-", suffix=".part", dir=directory)
+    os.chmod(tmp_path, 0o666 & ~_UMASK)  # mkstemp creates 0600; give the file normal permissions
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+        raise
+
+class SynthesisCache:
+    """Content-addressed cache of synthesized MP3 bytes, one file per cache_key()."""
+
+    def __init__(self, directory=None):
+        self.directory = directory or os.path.join(app_paths.user_cache_dir(), "synthesis")
+
+    def path_for(self, key):
+        return os.path.join(self.directory, key[:2], f"{key}.mp3")
+
+    def get(self, key):
+        """Returns cached bytes or None."""
+        try:
+            with open(self.path_for(key), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def contains(self, key):
+        return os.path.exists(self.path_for(key))
+
+    def put(self, key, data):
+        if data:
+            write_atomic(self.path_for(key), data)
+
+    def get_boundaries(self, key):
+        """Returns the boundary events stored with a cached clip, or None if there are none."""
+        try:
+            with open(self.path_for(key)[:-4] + ".json", "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put_boundaries(self, key, events):
+        write_atomic(self.path_for(key)[:-4] + ".json", json.dumps(events, ensure_ascii=False).encode("utf-8"))
+
+def _boundaries_with_positions(events):
+    """The boundary events of a fetch, each with 'position': the audio bytes received before it."""
+    boundaries, position = [], 0
+    for event in events:
+        if event["type"] == "audio":
+            position += len(event["data"])
+        else:
+            boundaries.append(dict(event, position=position))
+    return boundaries
+
+class _InFlight:
+    """One network fetch shared by every identical request waiting on it."""
+
+    def __init__(self):
+        self.task = None
+        self.waiters = 0
+        self.listeners = []
+        self.progress = 0.0
+        self.events = []  # Audio and boundary events received so far, replayed to streams that join late
+        self._changed = asyncio.Event()
+
+    def report(self, fraction):
+        self.progress = fraction
+        for listener in list(self.listeners):
+            listener(fraction)
+
+    def push(self, event):
+        self.events.append(event)
+        self.notify()
+
+    def notify(self, *_):
+        # Wake current waiters; later ones wait on a fresh event
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def wait(self):
+        await self._changed.wait()
+
+class _Limiter:
+    """
+    A semaphore shared by every event loop in the process (asyncio.Semaphore belongs to one loop).
+    A released slot is handed straight to the oldest waiter, on that waiter's own loop.
+    """
+
+    def __init__(self, slots):
+        self._free = slots
+        self._waiters = collections.deque()  # (loop, future)
+        self._lock = threading.Lock()
+
+    async def acquire(self):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._free > 0 and not self._waiters:
+                self._free -= 1
+                return
+            future = loop.create_future()
+            self._waiters.append((loop, future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._lock:
+                try:
+                    self._waiters.remove((loop, future))
+                    future = None
+                except ValueError:
+                    pass
+            if future is not None and future.done() and not future.cancelled():
+                self.release()  # The slot arrived as we were cancelled: pass it on
+            raise
+
+    def release(self):
+        with self._lock:
+            while self._waiters:
+                loop, future = self._waiters.popleft()
+                try:
+                    loop.call_soon_threadsafe(self._grant, future)
+                    return
+                except RuntimeError:
+                    continue  # That waiter's loop is closed
+            self._free += 1
+
+    def _grant(self, future):
+        # On the waiter's loop. If it was cancelled in the meantime, the slot goes to the next one.
+        if future.done():
+            self.release()
+        else:
+            future.set_result(None)
+
+    async def __aenter__(self):
+        await self.acquire()
+
+    async def __aexit__(self, *exc):
+        self.release()
+
+class Synthesizer:
+    """
+    The shared synthesis session: every request goes through one cache and one
+    concurrency limit, regardless of which tool or thread issued it.
+    """
+
+    def __init__(self, concurrency=DEFAULT_CONCURRENCY, cache=None, use_cache=True):
+        self.concurrency = max(1, concurrency)
+        self.cache = cache if cache is not None else SynthesisCache()
+        self.use_cache = use_cache
+        # One limit across threads and event loops (the GUI's runner, asyncio.run() callers, the server)
+        self._limiter = _Limiter(self.concurrency)
+        self._inflight = {}  # (loop, key) -> _InFlight; a fetch's task lives on one loop
+
+    async def _events(self, text, voice, pitch, rate, volume):
+        """Yields the raw Edge TTS stream: {'type': 'audio', 'data': ...} and boundary events."""
+        import edge_tts  # Pulls in aiohttp; imported on first synthesis rather than at startup
+        communicate = edge_tts.Communicate(text, voice, pitch=pitch, rate=rate, volume=volume,
+                                           connector=_timed_connector())
+        async for chunk in communicate.stream():
+            yield chunk
+
+    async def _fetch(self, text, voice, pitch, rate, volume, on_progress=None, on_event=None):
+        """
+        Streams audio from Edge TTS into memory. 'on_event(event)' sees each audio chunk and
+        boundary event as it arrives and 'on_progress(fraction)' follows the boundary events.
+        """
+        chunks = []
+        spoken = 0
+        async for chunk in self._events(text, voice, pitch, rate, volume):
+            if chunk["type"] == "audio":
+                chunks.append(chunk["data"])
+            elif chunk["type"].endswith("Boundary"):
+                spoken += len(chunk.get("text", "")) + 1
+                if on_progress:
+                    on_progress(min(1.0, spoken / max(1, len(text))))
+            if on_event:
+                on_event(chunk)
+        data = b"".join(chunks)
+        if not data:
+            raise RuntimeError(f"No audio received for voice {voice}.")
+        return data
+
+    async def _fetch_and_store(self, key, text, voice, pitch, rate, volume, entry):
+        record = {"nbytes": 0}
+        queued = time.perf_counter()
+
+        def on_event(event):
+            if event["type"] == "audio":
+                if not record["nbytes"]:
+                    record["ttfb"] = time.perf_counter() - started
+                record["nbytes"] += len(event["data"])
+            entry.push(event)
+
+        outcome = "error"
+        async with self._limiter:
+            started = time.perf_counter()
+            record["queue_wait"] = started - queued
+            _fetch_record.set(record)  # This task's own context, so concurrent fetches don't mix
+            try:
+                data = await self._fetch(text, voice, pitch, rate, volume, on_progress=entry.report, on_event=on_event)
+                outcome = "ok"
+            except asyncio.CancelledError:
+                outcome = "cancelled"
+                raise
+            finally:
+                elapsed = time.perf_counter() - started
+                tts_metrics.get_metrics().record_synthesis(
+                    ENGINE_NAME, voice, outcome, len(text), record["nbytes"], record["queue_wait"],
+                    record.get("connect"), record.get("ttfb"), elapsed)
+        # Per-voice latency history, used to schedule batches longest-first
+        tts_scheduler.get_latency_model().observe(voice, len(text), elapsed)
+        if self.use_cache:
+            self.cache.put(key, data)
+            self.cache.put_boundaries(key, _boundaries_with_positions(entry.events))
+        return data
+
+    def _join(self, key, text, voice, pitch, rate, volume, on_progress=None):
+        """Returns the in-flight fetch for 'key' on this loop, starting it if needed, and registers a waiter."""
+        loop = asyncio.get_running_loop()
+        inflight_key = (loop, key)
+        entry = self._inflight.get(inflight_key)
+        tts_metrics.get_metrics().record_cache("joined" if entry is not None else "miss")
+        if entry is None:
+            entry = self._inflight[inflight_key] = _InFlight()
+            entry.task = loop.create_task(self._fetch_and_store(key, text, voice, pitch, rate, volume, entry))
+
+            def forget(_):
+                if self._inflight.get(inflight_key) is entry:
+                    del self._inflight[inflight_key]
+            entry.task.add_done_callback(forget)
+            entry.task.add_done_callback(entry.notify)
+
+        entry.waiters += 1
+        if on_progress:
+            entry.listeners.append(on_progress)
+        return entry
+
+    def _leave(self, entry, on_progress=None):
+        """Unregisters a waiter; the fetch is cancelled once nobody is waiting for it."""
+        entry.waiters -= 1
+        if on_progress:
+            entry.listeners.remove(on_progress)
+        if entry.waiters == 0 and not entry.task.done():
+            entry.task.cancel()
+
+    async def _shared_fetch(self, key, text, voice, pitch, rate, volume, on_progress=None):
+        """Joins an identical request that is already in flight instead of issuing a second one."""
+        entry = self._join(key, text, voice, pitch, rate, volume, on_progress)
+        try:
+            return await asyncio.shield(entry.task)
+        finally:
+            self._leave(entry, on_progress)
+
+    def spoken_text(self, text, lexicon=None):
+        """The text actually sent: 'text' after the pronunciation lexicon (default: the global one)."""
+        lexicon = pronunciation.get_lexicon() if lexicon is None else lexicon
+        return lexicon.apply(text)
+
+    def key_for(self, text, voice=DEFAULT_VOICE, pitch="+0Hz", rate="+0%", volume="+0%", lexicon=None):
+        """The cache key synthesize() uses for this request."""
+        return cache_key(self.spoken_text(text, lexicon), voice, pitch, rate, volume)
+
+    async def synthesize(self, text, voice=DEFAULT_VOICE, pitch="+0Hz", rate="+0%", volume="+0%", on_progress=None,
+                         lexicon=None):
+        """
+        Returns MP3 bytes for the request, from the cache when possible. 'lexicon' (a pronunciation.Lexicon,
+        default: the global one) is applied to the text first.
+        """
+        text = self.spoken_text(text, lexicon)
+        key = cache_key(text, voice, pitch, rate, volume)
+        if self.use_cache:
+            cached = self.cache.get(key)
+            if cached:
+                tts_metrics.get_metrics().record_cache("hit")
+                return cached
+        return await self._shared_fetch(key, text, voice, pitch, rate, volume, on_progress)
+
+    async def stream(self, text, voice=DEFAULT_VOICE, pitch="+0Hz", rate="+0%", volume="+0%",
+                     chunk_size=16384, events=False, lexicon=None):
+        """
+        Yields MP3 chunks as soon as Edge TTS sends them (or slices of the cached file); the complete
+        result is cached. Identical concurrent streams share one fetch, late joiners get a replay.
+        With events=True, yields the Edge TTS event dicts instead: {'type': 'audio', 'data': ...}
+        interleaved with boundary events ({'type': 'SentenceBoundary', 'offset', 'duration', 'text'}).
+        """
+        text = self.spoken_text(text, lexicon)
+        key = cache_key(text, voice, pitch, rate, volume)
+        cached = self.cache.get(key) if self.use_cache else None
+        # Clips cached before boundaries were stored are fetched again when events are wanted
+        boundaries = self.cache.get_boundaries(key) if cached and events else None
+        if cached and (boundaries is not None or not events):
+            tts_metrics.get_metrics().record_cache("hit")
+            start = 0
+            # Each boundary goes back where it arrived: after the first 'position' bytes of audio
+            for boundary in (boundaries or []) + [{"position": len(cached)}]:
+                position = boundary.pop("position")
+                for start in range(start, position, chunk_size):
+                    data = cached[start:min(start + chunk_size, position)]
+                    yield {"type": "audio", "data": data} if events else data
+                start = position
+                if boundary:
+                    yield boundary
+            return
+
+        entry = self._join(key, text, voice, pitch, rate, volume)
+        try:
+            sent = 0
+            while True:
+                while sent < len(entry.events):
+                    event = entry.events[sent]
+                    sent += 1
+                    if events:
+                        yield event
+                    elif event["type"] == "audio":
+                        yield event["data"]
+                if entry.task.done():
+                    entry.task.result()  # Re-raises a failed fetch
+                    return
+                await entry.wait()
+        finally:
+            self._leave(entry)
+
+    async def save(self, outfile, text, voice=DEFAULT_VOICE, pitch="+0Hz", rate="+0%", volume="+0%",
+                   on_progress=None, lexicon=None):
+        """Synthesizes and writes 'outfile' atomically (no partial files on failure)."""
+        data = await self.synthesize(text, voice, pitch=pitch, rate=rate, volume=volume, on_progress=on_progress,
+                                     lexicon=lexicon)
+        write_atomic(outfile, data)
+        return outfile
+
+_default_synthesizer = None
+_default_lock = threading.Lock()
+
+def get_synthesizer():
+    """Returns the process-wide Synthesizer."""
+    global _default_synthesizer
+    with _default_lock:
+        if _default_synthesizer is None:
+            _default_synthesizer = Synthesizer()
+        return _default_synthesizer
+
+class Job:
+    """
+    Handle for a coroutine running on the AsyncRunner loop. Thread-safe: cancel() and
+    the status methods may be called from any thread (e.g. the Qt UI thread).
+    """
+
+    def __init__(self, runner):
+        self._runner = runner
+        self._task = None
+        self._lock = threading.Lock()
+        self._done_event = threading.Event()
+        self._callbacks = []
+        self._cancelled = False
+        self._result = None
+        self._exception = None
+        self.submitted_at = time.monotonic()
+        self.finished_at = None
+        self.cancel_requested_at = None
+        self.cancel_latency = None  # Seconds from cancel() to the task actually finishing
+
+    # Called on the loop thread
+    def _start(self, coro):
+        if self.cancel_requested_at is not None:
+            coro.close()
+            self._finish(None)
+            return
+        self._task = self._runner.loop.create_task(coro)
+        self._task.add_done_callback(self._finish)
+
+    def _finish(self, task):
+        with self._lock:
+            self.finished_at = time.monotonic()
+            if task is None or task.cancelled():
+                self._cancelled = True
+            elif task.exception() is not None:
+                self._exception = task.exception()
+            else:
+                self._result = task.result()
+            if self.cancel_requested_at is not None:
+                self.cancel_latency = self.finished_at - self.cancel_requested_at
+                tts_metrics.get_metrics().record_cancel(self.cancel_latency)
+            callbacks, self._callbacks = self._callbacks, []
+            self._done_event.set()
+        for cb in callbacks:
+            cb(self)
+
+    def _cancel_on_loop(self):
+        if self._task is not None:
+            self._task.cancel()
+
+    # Public API (any thread)
+    def cancel(self, wait=CANCEL_WAIT_SECONDS):
+        """
+        Cancels the task; the websocket is closed as the CancelledError unwinds through edge-tts.
+        Waits up to 'wait' seconds for it to finish. Returns True if the job is finished on return.
+        """
+        if self.done():
+            return True
+        if self.cancel_requested_at is None:
+            self.cancel_requested_at = time.monotonic()
+        self._runner.loop.call_soon_threadsafe(self._cancel_on_loop)
+        return self._done_event.wait(wait)
+
+    def done(self):
+        return self._done_event.is_set()
+
+    def cancelled(self):
+        return self._cancelled
+
+    def exception(self):
+        return self._exception
+
+    def result(self, timeout=None):
+        """Blocks for the result. Raises the job's exception, or asyncio.CancelledError if cancelled."""
+        if not self._done_event.wait(timeout):
+            raise TimeoutError("Job did not finish in time.")
+        if self._cancelled:
+            raise asyncio.CancelledError()
+        if self._exception is not None:
+            raise self._exception
+        return self._result
+
+    def add_done_callback(self, callback):
+        """Calls 'callback(job)' when finished (on the loop thread, or immediately if already done)."""
+        with self._lock:
+            if not self._done_event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback(self)
+
+class AsyncRunner:
+    """A persistent asyncio loop on a daemon thread, so jobs are real tasks that can be cancelled."""
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name="tts-async-loop", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        # Every GUI preview/save runs on this loop; a profile of it is written at exit
+        with tts_profiling.profiled("async-loop"):
+            self.loop.run_forever()
+
+    def submit(self, coro):
+        """Schedules a coroutine on the loop and returns its Job."""
+        job = Job(self)
+        self.loop.call_soon_threadsafe(job._start, coro)
+        return job
+
+_default_runner = None
+
+def get_runner():
+    """Returns the process-wide AsyncRunner."""
+    global _default_runner
+    with _default_lock:
+        if _default_runner is None:
+            _default_runner = AsyncRunner()
+        return _default_runner
+
+def run_cli(coro):
+    """
+    asyncio.run() for the command-line tools. Ctrl-C cancels the running synthesis tasks
+    (closing their connections; outputs are written atomically so nothing partial is left)
+    and exits with status 130.
+    """
+    name = os.path.splitext(os.path.basename(sys.argv[0]))[0] or "cli"
+    try:
+        with tts_profiling.profiled(name), tts_profiling.traced_memory(name):
+            return asyncio.run(coro)
+    except KeyboardInterrupt:
+        print("\nCancelled.")
+        sys.exit(130)
@@ -0,0 +1,136 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# --- Script Summary ---
+# Responsibility: Load generator for tts_server.py. Runs N concurrent clients and reports
+#                 requests/sec, latency percentiles (p50/p90/p99) and time-to-first-byte.
+# Usage: python tts_loadgen.py [--url URL | --unix PATH] [-c CONCURRENCY] [-n REQUESTS] [--unique]
+# Examples:
+#   python tts_loadgen.py -c 16 -n 500                      # same line every time: measures the cached path
+#   python tts_loadgen.py -c 4 -n 40 --unique               # distinct lines: measures real synthesis
+#   python tts_loadgen.py --unix /tmp/tts.sock --character "Narrator - Deep" --variation Calm
+# Note: --unique sends every request to Edge TTS; keep -n small against the public service.
+# ----------------------
+
+# Copyright (C) 2025 steve.rock@wheelhouser.com
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#===============================================================================================================
+
+import argparse
+import asyncio
+import collections
+import sys
+import time
+import aiohttp
+
+DEFAULT_URL = "http://127.0.0.1:8765"
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return float("nan")
+    rank = max(1, int(round(pct / 100.0 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+async def run_client(session, url, payloads, results):
+    """Takes payloads off the shared queue until it is empty, recording one result per request."""
+    while True:
+        try:
+            payload = payloads.get_nowait()
+        except asyncio.QueueEmpty:
+            return
+        start = time.perf_counter()
+        ttfb = None
+        size = 0
+        try:
+            async with session.post(url, json=payload) as resp:
+                async for chunk in resp.content.iter_any():
+                    if ttfb is None:
+                        ttfb = time.perf_counter() - start
+                    size += len(chunk)
+                status = resp.status
+        except asyncio.TimeoutError:
+            status = "timeout"  # Over --timeout: reported with the other failures instead of ending the run
+        except aiohttp.ClientError as e:
+            status = type(e).__name__
+        results.append((status, time.perf_counter() - start, ttfb, size))
+
+async def run_load(args):
+    base = args.url.rstrip("/")
+    connector = aiohttp.UnixConnector(path=args.unix) if args.unix else aiohttp.TCPConnector(limit=args.concurrency)
+    if args.unix:
+        base = "http://localhost"
+
+    payloads = asyncio.Queue()
+    for i in range(args.requests):
+        text = f"{args.text} ({i})" if args.unique else args.text
+        payload = {"text": text}
+        if args.character:
+            payload.update(character=args.character, variation=args.variation)
+        else:
+            payload["voice"] = args.voice
+        payloads.put_nowait(payload)
+
+    results = []
+    timeout = aiohttp.ClientTimeout(total=args.timeout)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        start = time.perf_counter()
+        await asyncio.gather(*(run_client(session, f"{base}/synthesize", payloads, results)
+                               for _ in range(args.concurrency)))
+        wall = time.perf_counter() - start
+    return results, wall
+
+def report(results, wall, concurrency):
+    ok = [r for r in results if r[0] == 200]
+    statuses = collections.Counter(r[0] for r in results)
+    latencies = sorted(r[1] for r in ok)
+    ttfbs = sorted(r[2] for r in ok if r[2] is not None)
+    total_bytes = sum(r[3] for r in ok)
+
+    print(f"Requests:     {len(results)} ({len(ok)} ok) with {concurrency} concurrent clients in {wall:.2f}s")
+    if len(ok) != len(results):
+        print(f"Statuses:     {dict(statuses)}")
+    print(f"Throughput:   {len(ok) / wall:.1f} req/s, {total_bytes / wall / 1024:.0f} KB/s")
+    if latencies:
+        print("Latency (ms): p50 {:.1f}  p90 {:.1f}  p99 {:.1f}  max {:.1f}".format(
+            *(percentile(latencies, p) * 1000 for p in (50, 90, 99)), latencies[-1] * 1000))
+    if ttfbs:
+        print("TTFB (ms):    p50 {:.1f}  p99 {:.1f}".format(percentile(ttfbs, 50) * 1000, percentile(ttfbs, 99) * 1000))
+
+def main():
+    parser = argparse.ArgumentParser(description="Load generator for tts_server.py.")
+    parser.add_argument("--url", default=DEFAULT_URL, help=f"Server base URL (default: {DEFAULT_URL})")
+    parser.add_argument("--unix", metavar="PATH", help="Connect through a Unix socket instead")
+    parser.add_argument("-c", "--concurrency", type=int, default=8, help="Concurrent clients (default: 8)")
+    parser.add_argument("-n", "--requests", type=int, default=200, help="Total requests (default: 200)")
+    parser.add_argument("--text", default="The quick brown fox jumps over the lazy dog.", help="Line to synthesize")
+    parser.add_argument("--voice", default="en-US-AriaNeural", help="Voice ShortName (default: en-US-AriaNeural)")
+    parser.add_argument("--character", help="Character alias (uses its voice settings instead of --voice)")
+    parser.add_argument("--variation", help="Character variation (default: Baseline)")
+    parser.add_argument("--unique", action="store_true", help="Make every line distinct so no request hits the cache")
+    parser.add_argument("--timeout", type=float, default=120, help="Per-request timeout in seconds (default: 120)")
+    args = parser.parse_args()
+
+    try:
+        results, wall = asyncio.run(run_load(args))
+    except KeyboardInterrupt:
+        print("\nCancelled.")
+        sys.exit(130)
+    report(results, wall, args.concurrency)
+    if not any(r[0] == 200 for r in results):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# --- Script Summary ---
+# Responsibility: Process-wide metrics for synthesis, playback and GUI jobs. Samples are aggregated
+#                 into Prometheus histograms/counters and, optionally, appended to a JSON-lines log.
+#                 Nothing is exported unless one of the environment variables below is set.
+# Usage: import tts_metrics
+#   tts_metrics.get_metrics().record_playback(0.012, backend="pygame")
+#   print(tts_metrics.get_metrics().prometheus_text())
+# Environment:
+#   TTS_METRICS_FILE=/var/lib/node_exporter/tts.prom   Prometheus text file, rewritten every
+#                                                      TTS_METRICS_INTERVAL seconds (default 15) and at exit
+#   TTS_METRICS_PORT=9464                              Serve http://127.0.0.1:<port>/metrics
+#   TTS_METRICS_LOG=~/tts-metrics.jsonl                One JSON object per synthesis/playback/job
+#   TTS_RELEASE=1.2.0                                  Added to every log line and to tts_build_info
+# ----------------------
+
+# Copyright (C) 2025 steve.rock@wheelhouser.com
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#===============================================================================================================
+
+import atexit
+import bisect
+import json
+import os
+import threading
+import time
+
+RELEASE = os.environ.get("TTS_RELEASE", "dev")
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# name -> (type, help)
+METRICS = {
+    "tts_build_info": ("gauge", "Release this process runs (TTS_RELEASE)."),
+    "tts_synthesis_requests_total": ("counter", "Upstream synthesis requests by outcome (ok, error, cancelled)."),
+    "tts_synthesis_cache_total": ("counter", "Synthesis calls by cache result (hit, miss, joined an in-flight request)."),
+    "tts_synthesis_queue_wait_seconds": ("histogram", "Time waiting for a synthesis concurrency slot."),
+    "tts_synthesis_connect_seconds": ("histogram", "Time to open the connection to the engine (DNS, TCP, TLS)."),
+    "tts_synthesis_ttfb_seconds": ("histogram", "Time from starting the request to the first audio byte."),
+    "tts_synthesis_duration_seconds": ("histogram", "Time from starting the request to the last audio byte."),
+    "tts_synthesis_bytes_total": ("counter", "MP3 bytes received from the engine."),
+    "tts_synthesis_characters_total": ("counter", "Characters of text sent to the engine."),
+    "tts_playback_first_sound_seconds": ("histogram", "Time from a play request to the first sound starting."),
+    "tts_job_queue_wait_seconds": ("histogram", "Time a GUI generation job spent queued before it started."),
+    "tts_job_duration_seconds": ("histogram", "Time a GUI generation job ran, by final state."),
+    "tts_job_cancel_seconds": ("histogram", "Time from cancelling a synthesis job to its task having unwound."),
+    "tts_ui_stall_seconds": ("histogram", "Time the GUI event loop was blocked, for stalls over TTS_STALL_MS."),
+}
+
+def _label_text(labels):
+    if not labels:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') for _, v in labels)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(labels, escaped)) + "}"
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus sense."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+class Metrics:
+    """Thread-safe registry; the engine records from its asyncio thread, the GUI and players from theirs."""
+
+    def __init__(self, log_path=None):
+        self._lock = threading.Lock()
+        self._counters = {}    # (name, labels) -> value
+        self._histograms = {}  # (name, labels) -> Histogram
+        self._log_path = log_path
+        self._log_file = None
+        self.set("tts_build_info", 1, release=RELEASE)
+
+    # --- Recording ---
+    def set(self, name, value, **labels):
+        """Sets a gauge. Gauges and counters share storage; only their TYPE line differs."""
+        with self._lock:
+            self._counters[(name, tuple(sorted(labels.items())))] = value
+
+    def inc(self, name, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def log(self, event, **fields):
+        """Appends one JSON line when TTS_METRICS_LOG is set."""
+        if not self._log_path:
+            return
+        fields = {k: round(v, 6) if isinstance(v, float) else v for k, v in fields.items()}
+        line = json.dumps(dict(event=event, time=round(time.time(), 3), release=RELEASE, pid=os.getpid(), **fields))
+        with self._lock:
+            try:
+                if self._log_file is None:
+                    self._log_file = open(os.path.expanduser(self._log_path), "a", encoding="utf-8", buffering=1)
+                self._log_file.write(line + "\n")
+            except OSError as e:
+                print(f"Metrics log disabled: {e}")
+                self._log_path = None
+
+    def record_synthesis(self, engine, voice, outcome, characters, nbytes=0, queue_wait=None, connect=None,
+                         ttfb=None, total=None):
+        """One upstream request. Timings are seconds (None if the request ended before that point)."""
+        self.inc("tts_synthesis_requests_total", engine=engine, voice=voice, outcome=outcome)
+        self.inc("tts_synthesis_bytes_total", nbytes, engine=engine, voice=voice)
+        self.inc("tts_synthesis_characters_total", characters, engine=engine, voice=voice)
+        if queue_wait is not None:
+            self.observe("tts_synthesis_queue_wait_seconds", queue_wait, engine=engine)
+        if connect is not None:
+            self.observe("tts_synthesis_connect_seconds", connect, engine=engine)
+        if outcome == "ok":
+            # Slow voices show up in these two, so they are the only per-voice histograms
+            if ttfb is not None:
+                self.observe("tts_synthesis_ttfb_seconds", ttfb, engine=engine, voice=voice)
+            if total is not None:
+                self.observe("tts_synthesis_duration_seconds", total, engine=engine, voice=voice)
+        self.log("synthesis", engine=engine, voice=voice, outcome=outcome, characters=characters, bytes=nbytes,
+                 queue_wait=queue_wait, connect=connect, ttfb=ttfb, total=total)
+
+    def record_cache(self, result):
+        self.inc("tts_synthesis_cache_total", result=result)
+
+    def record_playback(self, first_sound, backend):
+        self.observe("tts_playback_first_sound_seconds", first_sound, backend=backend)
+        self.log("playback", backend=backend, first_sound=first_sound)
+
+    def record_job(self, lane, state, queue_wait=None, duration=None):
+        if queue_wait is not None:
+            self.observe("tts_job_queue_wait_seconds", queue_wait, lane=lane)
+        if duration is not None:
+            self.observe("tts_job_duration_seconds", duration, lane=lane, state=state)
+        self.log("job", lane=lane, state=state, queue_wait=queue_wait, duration=duration)
+
+    def record_cancel(self, latency):
+        self.observe("tts_job_cancel_seconds", latency)
+        self.log("cancel", latency=latency)
+
+    # --- Export ---
+    def prometheus_text(self):
+        """Renders everything recorded so far in the Prometheus text exposition format."""
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted((k, (h.buckets, list(h.counts), h.sum, h.count)) for k, h in self._histograms.items())
+
+        lines, described = [], set()
+
+        def describe(name):
+            if name not in described:
+                described.add(name)
+                kind, help_text = METRICS.get(name, ("untyped", ""))
+                lines.extend([f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"])
+
+        for (name, labels), value in counters:
+            describe(name)
+            lines.append(f"{name}{_label_text(labels)} {value}")
+        for (name, labels), (buckets, counts, total, count) in histograms:
+            describe(name)
+            cumulative = 0
+            for bound, n in zip(list(buckets) + ["+Inf"], counts):
+                cumulative += n
+                lines.append(f"{name}_bucket{_label_text(labels + (('le', bound),))} {cumulative}")
+            lines.append(f"{name}_sum{_label_text(labels)} {total:.6f}")
+            lines.append(f"{name}_count{_label_text(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        """Writes the Prometheus text atomically (for node_exporter's textfile collector)."""
+        import tts_engine  # tts_engine imports this module at load time
+        path = os.path.expanduser(path)
+        try:
+            tts_engine.write_atomic(path, self.prometheus_text().encode("utf-8"))
+        except OSError as e:
+            print(f"Could not write metrics to {path}: {e}")
+
+    def serve(self, port, host="127.0.0.1"):
+        """Serves /metrics on a daemon thread. Returns the server (call shutdown() to stop it)."""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = metrics.prometheus_text().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name="tts-metrics-http", daemon=True).start()
+        return server
+
+    def export_periodically(self, path, interval):
+        """Rewrites 'path' every 'interval' seconds on a daemon thread, and once more at exit."""
+        def loop():
+            while True:
+                time.sleep(interval)
+                self.write_prometheus(path)
+        threading.Thread(target=loop, name="tts-metrics-file", daemon=True).start()
+        atexit.register(self.write_prometheus, path)
+
+_metrics = None
+_metrics_lock = threading.Lock()
+
+def get_metrics():
+    """Returns the process-wide Metrics, starting the exporters configured in the environment on first use."""
+    global _metrics
+    with _metrics_lock:
+        if _metrics is None:
+            _metrics = Metrics(log_path=os.environ.get("TTS_METRICS_LOG"))
+            path = os.environ.get("TTS_METRICS_FILE")
+            if path:
+                _metrics.export_periodically(path, float(os.environ.get("TTS_METRICS_INTERVAL", "15")))
+            port = os.environ.get("TTS_METRICS_PORT")
+            if port:
+                try:
+                    _metrics.serve(int(port))
+                except (OSError, ValueError) as e:
+                    print(f"Could not serve metrics on port {port}: {e}")
+        return _metrics
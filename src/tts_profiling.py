@@ -0,0 +1,280 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# --- Script Summary ---
+# Responsibility: Opt-in profiling hooks for the hot paths: cProfile or a statistical sampler around
+#                 generation and playback work, tracemalloc snapshots around batch runs, and a detector
+#                 that prints the UI thread's stack when the Qt event loop stalls. Disabled (the default),
+#                 each hook is a flag check.
+# Usage: import tts_profiling
+#   with tts_profiling.profiled("batch"), tts_profiling.traced_memory("batch"):
+#       run_batch()
+# Environment (or the matching flags of tts.py / text_to_speech.py):
+#   TTS_PROFILE=cprofile      Deterministic profile per section -> <dir>/<name>-<pid>-<n>.pstats
+#   TTS_PROFILE=sample        Sample stacks every TTS_PROFILE_INTERVAL_MS (default 5) -> .collapsed
+#                             (flamegraph.pl, speedscope.app or inferno take this format)
+#   TTS_PROFILE_DIR=DIR       Output directory (default: <user cache>/profiles)
+#   TTS_TRACEMALLOC=25        Snapshot allocations (25 frames deep) around batch runs -> .snapshot + top diffs
+#   TTS_STALL_MS=100          GUI: print the UI thread's stack whenever it is blocked this long
+# Reading the output:
+#   python -m pstats <file>.pstats          (then: sort cumulative / stats 30)
+#   flamegraph.pl <file>.collapsed > flame.svg
+# ----------------------
+
+# Copyright (C) 2025 steve.rock@wheelhouser.com
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#===============================================================================================================
+
+import atexit
+import collections
+import contextlib
+import itertools
+import os
+import sys
+import threading
+import time
+import app_paths
+
+PROFILE_MODES = ("cprofile", "sample")
+
+mode = None             # None, "cprofile" or "sample"
+tracemalloc_frames = 0  # 0 = off
+output_dir = None
+sample_interval = 0.005
+stall_ms = 0            # 0 = off
+
+_counter = itertools.count(1)
+_NULL = contextlib.nullcontext()
+
+def configure(profile=None, trace_frames=None, directory=None, interval_ms=None, stall_threshold_ms=None):
+    """Overrides the environment settings (used by the --profile / --trace-malloc / --stall-ms flags)."""
+    global mode, tracemalloc_frames, output_dir, sample_interval, stall_ms
+    if profile is not None:
+        if profile and profile not in PROFILE_MODES:
+            print(f"Unknown profile mode '{profile}' (use {' or '.join(PROFILE_MODES)}); profiling disabled.")
+            profile = None
+        mode = profile or None
+    if trace_frames is not None:
+        tracemalloc_frames = max(0, int(trace_frames))
+    if directory is not None:
+        output_dir = directory
+    if interval_ms is not None:
+        sample_interval = max(0.001, float(interval_ms) / 1000.0)
+    if stall_threshold_ms is not None:
+        stall_ms = max(0, int(stall_threshold_ms))
+
+configure(profile=os.environ.get("TTS_PROFILE", "").lower(),
+          trace_frames=os.environ.get("TTS_TRACEMALLOC") or 0,
+          directory=os.environ.get("TTS_PROFILE_DIR") or "",
+          interval_ms=os.environ.get("TTS_PROFILE_INTERVAL_MS") or 5,
+          stall_threshold_ms=os.environ.get("TTS_STALL_MS") or 0)
+
+def _output_path(name, suffix):
+    directory = output_dir or os.path.join(app_paths.user_cache_dir(), "profiles")
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, f"{name}-{os.getpid()}-{next(_counter)}{suffix}")
+
+def collapse_stack(frame):
+    """One 'root;caller;callee' line in the collapsed-stack format used by flame graph tools."""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+class Sampler:
+    """One background thread that samples the stacks of the threads currently inside a profiled() section."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._targets = collections.defaultdict(list)  # thread id -> [Counter, ...] (nested sections)
+        self._thread = None
+
+    def add(self, thread_id, counter):
+        with self._lock:
+            self._targets[thread_id].append(counter)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="tts-profile-sampler", daemon=True)
+                self._thread.start()
+
+    def remove(self, thread_id, counter):
+        with self._lock:
+            counters = self._targets.get(thread_id, [])
+            if counter in counters:
+                counters.remove(counter)
+            if not counters:
+                self._targets.pop(thread_id, None)
+
+    def _run(self):
+        while True:
+            time.sleep(sample_interval)
+            frames = sys._current_frames()
+            with self._lock:
+                for thread_id, counters in self._targets.items():
+                    frame = frames.get(thread_id)
+                    if frame is None:
+                        continue
+                    stack = collapse_stack(frame)
+                    for counter in counters:
+                        counter[stack] += 1
+
+_sampler = Sampler()
+
+class _Section:
+    """A profiled() section. Long-lived sections still open at exit are written then."""
+
+    def __init__(self, name):
+        self.name = name
+        self.profiler = None
+        self.samples = None
+        self.thread_id = None
+        self.started = None
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        self.thread_id = threading.get_ident()
+        if mode == "cprofile":
+            import cProfile
+            self.profiler = cProfile.Profile()
+            try:
+                self.profiler.enable()
+            except ValueError:
+                # Python 3.12+ allows one cProfile at a time; TTS_PROFILE=sample covers concurrent sections
+                print(f"[profile] {self.name}: another cProfile section is active; skipped.", file=sys.stderr)
+                self.profiler = None
+                return self
+        else:
+            self.samples = collections.Counter()
+            _sampler.add(self.thread_id, self.samples)
+        _open_sections.add(self)
+        return self
+
+    def __exit__(self, *exc):
+        self.finish()
+        return False
+
+    def finish(self):
+        if self not in _open_sections:
+            return
+        _open_sections.discard(self)
+        elapsed = time.perf_counter() - self.started
+        try:
+            if self.profiler is not None:
+                self.profiler.disable()
+                path = _output_path(self.name, ".pstats")
+                self.profiler.dump_stats(path)
+            else:
+                _sampler.remove(self.thread_id, self.samples)
+                path = _output_path(self.name, ".collapsed")
+                with open(path, "w", encoding="utf-8") as f:
+                    for stack, count in self.samples.most_common():
+                        f.write(f"{stack} {count}\n")
+        except OSError as e:
+            print(f"[profile] Could not write the {self.name} profile: {e}", file=sys.stderr)
+            return
+        print(f"[profile] {self.name}: {elapsed:.2f}s -> {path}", file=sys.stderr)
+
+_open_sections = set()
+
+@atexit.register
+def _finish_open_sections():
+    for section in list(_open_sections):
+        section.finish()
+
+def profiled(name):
+    """Context manager profiling the enclosed code on this thread when TTS_PROFILE is set; a no-op otherwise."""
+    return _Section(name) if mode else _NULL
+
+@contextlib.contextmanager
+def _traced(name):
+    import tracemalloc
+    started_here = not tracemalloc.is_tracing()
+    if started_here:
+        tracemalloc.start(tracemalloc_frames)
+    before = tracemalloc.take_snapshot()
+    try:
+        yield
+    finally:
+        after = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        if started_here:
+            tracemalloc.stop()
+        print(f"[tracemalloc] {name}: current {current / 1048576:.1f} MiB, peak {peak / 1048576:.1f} MiB",
+              file=sys.stderr)
+        for stat in after.compare_to(before, "lineno")[:10]:
+            print(f"  {stat}", file=sys.stderr)
+        try:
+            path = _output_path(name, ".snapshot")
+            after.dump(path)
+            print(f"[tracemalloc] snapshot -> {path} (load with tracemalloc.Snapshot.load)", file=sys.stderr)
+        except OSError as e:
+            print(f"[tracemalloc] Could not write the snapshot: {e}", file=sys.stderr)
+
+def traced_memory(name):
+    """Context manager reporting allocations made by the enclosed code when TTS_TRACEMALLOC is set."""
+    return _traced(name) if tracemalloc_frames else _NULL
+
+class StallDetector:
+    """
+    Watches the Qt UI thread: a QTimer on that thread records a heartbeat, and a watchdog thread prints
+    the UI thread's stack (while it is still blocked) when no heartbeat arrived for 'threshold_ms'.
+    """
+
+    def __init__(self, threshold_ms):
+        self.threshold = threshold_ms / 1000.0
+        self._ui_thread_id = threading.get_ident()
+        self._last_beat = time.perf_counter()
+        self._stalled_since = None
+        self._timer = None
+        self._stop = threading.Event()
+
+    def start(self):
+        """Call on the UI thread once the QApplication exists."""
+        from PySide6.QtCore import QTimer
+        self._ui_thread_id = threading.get_ident()
+        self._timer = QTimer()
+        self._timer.timeout.connect(self._beat)
+        self._timer.start(max(1, int(self.threshold * 1000 / 4)))
+        threading.Thread(target=self._watch, name="tts-stall-detector", daemon=True).start()
+        print(f"[stall] Reporting UI stalls longer than {self.threshold * 1000:.0f} ms.", file=sys.stderr)
+
+    def stop(self):
+        self._stop.set()
+        if self._timer is not None:
+            self._timer.stop()
+
+    def _beat(self):
+        now = time.perf_counter()
+        stalled_since = self._stalled_since
+        if stalled_since is not None:
+            self._stalled_since = None
+            blocked = now - stalled_since
+            print(f"[stall] UI thread was blocked for {blocked * 1000:.0f} ms.", file=sys.stderr)
+            import tts_metrics
+            tts_metrics.get_metrics().observe("tts_ui_stall_seconds", blocked)
+        self._last_beat = now
+
+    def _watch(self):
+        while not self._stop.wait(self.threshold / 4):
+            last_beat = self._last_beat
+            if self._stalled_since is not None or time.perf_counter() - last_beat < self.threshold:
+                continue
+            self._stalled_since = last_beat
+            frame = sys._current_frames().get(self._ui_thread_id)
+            import traceback
+            stack = "".join(traceback.format_stack(frame)) if frame is not None else "  (no frame)\n"
+            print(f"[stall] UI thread blocked for more than {self.threshold * 1000:.0f} ms, currently in:\n{stack}",
+                  file=sys.stderr)
@@ -0,0 +1,215 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# --- Script Summary ---
+# Responsibility: Predicts how long a synthesis will take from its text length and the latency each voice
+#                 showed in earlier runs, and runs batches longest-predicted-first on a pool of workers so one
+#                 slow voice at the end of the list no longer stretches the whole run.
+# Usage: import tts_scheduler
+#   model = tts_scheduler.get_latency_model()
+#   model.predict("en-US-GuyNeural", len(text))            # seconds
+#   await tts_scheduler.run_longest_first(jobs, render, predict, workers=4)
+# History: every uncached Edge TTS request (from any tool) is recorded by tts_engine and kept in
+#          <user cache>/voice_latency.json (or TTS_LATENCY_FILE) for the next run.
+# ----------------------
+
+# Copyright (C) 2025 steve.rock@wheelhouser.com
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#===============================================================================================================
+
+import asyncio
+import atexit
+import heapq
+import itertools
+import json
+import os
+import threading
+import time
+import app_paths
+
+# Used until there is history: connection/handshake overhead plus streaming time per character
+DEFAULT_BASE_SECONDS = 0.6
+DEFAULT_SECONDS_PER_CHAR = 0.004
+# Older observations fade out, so the model follows the service as it gets faster or slower
+DECAY = 0.99
+VOICE_ALPHA = 0.3
+
+def default_stats_path():
+    return os.environ.get("TTS_LATENCY_FILE") or os.path.join(app_paths.user_cache_dir(), "voice_latency.json")
+
+class LatencyModel:
+    """
+    seconds = voice_factor * (base + per_char * characters)
+
+    'base' and 'per_char' are a least-squares fit over all voices (kept as decayed running sums);
+    each voice's factor is a moving average of how much slower or faster than that fit it was.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or default_stats_path()
+        self._lock = threading.Lock()
+        self._sums = [0.0] * 5   # n, sum x, sum y, sum x^2, sum xy  (x = characters, y = seconds)
+        self._voices = {}        # voice -> {"factor": float, "count": int}
+        self._observed = set()   # voices updated by this process (merged into the file on save)
+        self._dirty = False
+        self._fit = (DEFAULT_BASE_SECONDS, DEFAULT_SECONDS_PER_CHAR)
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            sums = data.get("model", {}).get("sums")
+            if isinstance(sums, list) and len(sums) == 5:
+                self._sums = [float(v) for v in sums]
+            self._voices = {v: {"factor": float(s["factor"]), "count": int(s.get("count", 1))}
+                            for v, s in data.get("voices", {}).items()}
+        except (OSError, ValueError, TypeError, KeyError, AttributeError):
+            pass
+        self._refit()
+
+    def _refit(self):
+        n, sx, sy, sxx, sxy = self._sums
+        if n < 1:
+            self._fit = (DEFAULT_BASE_SECONDS, DEFAULT_SECONDS_PER_CHAR)
+            return
+        mean_x, mean_y = sx / n, sy / n
+        variance = sxx / n - mean_x * mean_x
+        if n >= 2 and variance > 1.0:
+            per_char = max(0.0, (sxy / n - mean_x * mean_y) / variance)
+            base = max(0.0, mean_y - per_char * mean_x)
+        else:
+            # All texts about the same length: keep the default shape, scaled to what was measured
+            scale = mean_y / (DEFAULT_BASE_SECONDS + DEFAULT_SECONDS_PER_CHAR * mean_x)
+            base, per_char = DEFAULT_BASE_SECONDS * scale, DEFAULT_SECONDS_PER_CHAR * scale
+        self._fit = (base, per_char)
+
+    def _baseline(self, characters):
+        base, per_char = self._fit
+        return base + per_char * characters
+
+    def _unknown_factor(self):
+        # A voice never measured is assumed to be typical of the ones that were
+        factors = sorted(s["factor"] for s in self._voices.values())
+        return factors[len(factors) // 2] if factors else 1.0
+
+    def predict(self, voice, characters):
+        """Predicted seconds for an uncached request of 'characters' characters."""
+        with self._lock:
+            stats = self._voices.get(voice)
+            factor = stats["factor"] if stats else self._unknown_factor()
+            return factor * self._baseline(characters)
+
+    def observe(self, voice, characters, seconds):
+        """Records a completed request (time from sending it to the last audio byte)."""
+        if seconds <= 0:
+            return
+        with self._lock:
+            x, y = float(characters), float(seconds)
+            self._sums = [s * DECAY + d for s, d in zip(self._sums, (1.0, x, y, x * x, x * y))]
+            self._refit()
+            ratio = y / max(1e-3, self._baseline(characters))
+            stats = self._voices.get(voice)
+            if stats is None:
+                self._voices[voice] = {"factor": ratio, "count": 1}
+            else:
+                stats["factor"] += VOICE_ALPHA * (ratio - stats["factor"])
+                stats["count"] += 1
+            self._observed.add(voice)
+            if not self._dirty:
+                self._dirty = True
+                atexit.register(self.save)
+
+    def save(self):
+        """Writes the history, keeping voices other processes measured since it was loaded."""
+        import tts_engine
+        with self._lock:
+            if not self._dirty:
+                return
+            voices = {}
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    voices = json.load(f).get("voices", {})
+            except (OSError, ValueError, AttributeError):
+                pass
+            voices.update({v: self._voices[v] for v in self._observed})
+            data = {"version": 1, "model": {"sums": self._sums, "base": self._fit[0], "per_char": self._fit[1]},
+                    "voices": voices}
+            try:
+                tts_engine.write_atomic(self.path, json.dumps(data, indent=1, sort_keys=True).encode("utf-8"))
+            except OSError as e:
+                print(f"Could not save voice latency history to {self.path}: {e}")
+                return
+            self._dirty = False
+
+_model = None
+_model_lock = threading.Lock()
+
+def get_latency_model():
+    """Returns the process-wide LatencyModel, loaded from the history file on first use."""
+    global _model
+    with _model_lock:
+        if _model is None:
+            _model = LatencyModel()
+        return _model
+
+def predict_synthesis(text, voice, pitch="+0Hz", rate="+0%", volume="+0%", synthesizer=None):
+    """Predicted seconds for Synthesizer.synthesize(); cached lines cost (almost) nothing."""
+    import tts_engine
+    synthesizer = synthesizer or tts_engine.get_synthesizer()
+    if synthesizer.use_cache and synthesizer.cache.contains(synthesizer.key_for(text, voice, pitch, rate, volume)):
+        return 0.0
+    return get_latency_model().predict(voice, len(text))
+
+def estimate_makespan(costs, workers):
+    """How long the longest-first schedule of 'costs' takes on 'workers' workers, if the predictions hold."""
+    loads = [0.0] * max(1, workers)
+    for cost in sorted(costs, reverse=True):
+        heapq.heapreplace(loads, loads[0] + cost)
+    return max(loads)
+
+async def run_longest_first(jobs, run, predict=None, workers=4):
+    """
+    Awaits run(job) for every job with at most 'workers' running at once, always starting the job with
+    the largest predict(job) next. Predictions are made again when a job is about to start, so timings
+    that arrived meanwhile (through the latency model) re-rank what is left. Without 'predict' the jobs
+    run in the given order. Returns the wall time in seconds.
+    """
+    order = itertools.count()
+    heap = [(-(predict(job) if predict else 0.0), next(order), job) for job in jobs]
+    heapq.heapify(heap)
+
+    def next_job():
+        while heap:
+            stored, seq, job = heapq.heappop(heap)
+            if predict and heap:
+                cost = predict(job)
+                # Lazy re-ranking: if it is no longer the largest, put it back with its new cost
+                if cost < -heap[0][0]:
+                    heapq.heappush(heap, (-cost, seq, job))
+                    continue
+            return job
+        return None
+
+    async def worker():
+        while True:
+            job = next_job()
+            if job is None:
+                return
+            await run(job)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(max(1, min(workers, len(heap))))))
+    return time.perf_counter() - started
@@ -0,0 +1,194 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# --- Script Summary ---
+# Responsibility: Headless HTTP synthesis API for other local services. Streams MP3 chunks back as they
+#                 arrive, sharing one Synthesizer (concurrency limit + cache) and the character library.
+# Usage: python tts_server.py [--host 127.0.0.1] [--port 8765] [--unix /tmp/tts.sock]
+# Examples:
+#   python tts_server.py
+#   curl -o hi.mp3 "http://127.0.0.1:8765/synthesize?text=Hello&voice=en-US-GuyNeural"
+#   curl -o hi.mp3 -H "Content-Type: application/json" \
+#        -d '{"text": "Hello", "character": "Narrator - Deep", "variation": "Calm"}' http://127.0.0.1:8765/synthesize
+#   curl --unix-socket /tmp/tts.sock http://localhost/health
+#   curl http://127.0.0.1:8765/metrics             # Prometheus text
+# ----------------------
+
+# Copyright (C) 2025 steve.rock@wheelhouser.com
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# --- Setup Instructions ---
+# Active the venv on linux/macOS:
+# python -m venv .venv
+# source .venv/bin/activate
+# pip install --upgrade pip
+# pip install edge-tts   (aiohttp comes with it)
+#===============================================================================================================
+
+import argparse
+import json
+import os
+import character_library
+import pronunciation
+import tts_engine
+import tts_metrics
+import tts_profiling
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+VOICES_FILE = os.path.join(SCRIPT_DIR, "voices.json")
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+class RequestError(Exception):
+    """A client error, reported as JSON with the given HTTP status."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+def resolve_request(params, store):
+    """
+    Turns request parameters into (text, voice, pitch, rate, volume).
+    Either 'voice' (+ optional pitch/rate/volume) or 'character' (+ optional 'variation') is used.
+    """
+    text = (params.get("text") or "").strip()
+    if not text:
+        raise RequestError(400, "'text' is required.")
+
+    alias = params.get("character")
+    if alias:
+        character = store.get(alias)
+        if not character:
+            raise RequestError(404, f"Character '{alias}' not found.")
+        variation = params.get("variation")
+        try:
+            voice, pitch, rate, volume = character_library.voice_settings(character, variation)
+        except KeyError:
+            available = ", ".join(character.get("Variations", {}))
+            raise RequestError(404, f"Variation '{variation}' not found for '{alias}'. Available: {available}")
+        if not voice:
+            raise RequestError(422, f"Character '{alias}' has no voice ShortName.")
+        return text, voice, pitch, rate, volume
+
+    return (text, params.get("voice") or tts_engine.DEFAULT_VOICE, params.get("pitch", "+0Hz"),
+            params.get("rate", "+0%"), params.get("volume", "+0%"))
+
+def create_app(synthesizer=None, store=None):
+    """Builds the aiohttp application. All requests share 'synthesizer' and the character 'store'."""
+    from aiohttp import web
+
+    synthesizer = synthesizer or tts_engine.get_synthesizer()
+    store = store or character_library.get_store()
+
+    def error_response(status, message):
+        return web.json_response({"error": message}, status=status)
+
+    async def health(request):
+        return web.json_response({"status": "ok", "concurrency": synthesizer.concurrency})
+
+    async def voices(request):
+        try:
+            with open(VOICES_FILE, "r", encoding="utf-8") as f:
+                catalog = json.load(f)
+        except (OSError, ValueError) as e:
+            return error_response(500, f"Could not read voices.json: {e}")
+        return web.json_response([{k: v.get(k) for k in ("ID", "ShortName", "Gender", "Locale")} for v in catalog])
+
+    async def metrics(request):
+        return web.Response(body=tts_metrics.get_metrics().prometheus_text().encode("utf-8"),
+                            headers={"Content-Type": "text/plain; version=0.0.4; charset=utf-8"})
+
+    async def characters(request):
+        return web.json_response([
+            {"ReferenceID": c.get("ReferenceID"), "Alias": c.get("Alias"), "ShortName": c.get("ShortName"),
+             "Variations": list(c.get("Variations", {}))}
+            for c in store.characters()
+        ])
+
+    async def synthesize(request):
+        if request.method == "POST" and request.can_read_body:
+            try:
+                params = await request.json()
+            except ValueError:
+                return error_response(400, "Body must be a JSON object.")
+            if not isinstance(params, dict):
+                return error_response(400, "Body must be a JSON object.")
+        else:
+            params = dict(request.query)
+
+        try:
+            text, voice, pitch, rate, volume = resolve_request(params, store)
+        except RequestError as e:
+            return error_response(e.status, str(e))
+
+        lexicon = pronunciation.for_character(store.get(params["character"]) if params.get("character") else None)
+        hit = synthesizer.use_cache and synthesizer.cache.contains(
+            synthesizer.key_for(text, voice, pitch, rate, volume, lexicon))
+        chunks = synthesizer.stream(text, voice, pitch=pitch, rate=rate, volume=volume, lexicon=lexicon)
+        try:
+            # Wait for the first chunk before sending headers, so upstream failures become a 502
+            try:
+                first = await chunks.__anext__()
+            except Exception as e:
+                return error_response(502, f"Synthesis failed: {e}")
+
+            response = web.StreamResponse(headers={
+                "Content-Type": "audio/mpeg",
+                "X-Cache": "hit" if hit else "miss",
+                "X-Voice": voice,
+            })
+            await response.prepare(request)
+            await response.write(first)
+            async for chunk in chunks:
+                await response.write(chunk)
+            await response.write_eof()
+            return response
+        finally:
+            # Client went away or we finished: release the synthesis slot either way
+            await chunks.aclose()
+
+    app = web.Application()
+    app.router.add_get("/health", health)
+    app.router.add_get("/voices", voices)
+    app.router.add_get("/characters", characters)
+    app.router.add_get("/metrics", metrics)
+    app.router.add_get("/synthesize", synthesize)
+    app.router.add_post("/synthesize", synthesize)
+    return app
+
+def main():
+    parser = argparse.ArgumentParser(description="Local HTTP synthesis server (streams MP3).")
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"Address to bind (default: {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port to bind (default: {DEFAULT_PORT})")
+    parser.add_argument("--unix", metavar="PATH", help="Listen on a Unix socket instead of TCP")
+    parser.add_argument("--concurrency", type=int, default=tts_engine.DEFAULT_CONCURRENCY,
+                        help="Maximum simultaneous Edge TTS requests (default: TTS_CONCURRENCY or 4)")
+    parser.add_argument("--no-cache", action="store_true", help="Always synthesize; don't read or write the cache")
+    args = parser.parse_args()
+
+    from aiohttp import web
+
+    synthesizer = tts_engine.Synthesizer(concurrency=args.concurrency, use_cache=not args.no_cache)
+    app = create_app(synthesizer)
+    where = args.unix or f"http://{args.host}:{args.port}"
+    print(f"TTS server listening on {where} (concurrency {synthesizer.concurrency}). Ctrl-C to stop.")
+    with tts_profiling.profiled("server"):
+        if args.unix:
+            web.run_app(app, path=args.unix, print=None)
+        else:
+            web.run_app(app, host=args.host, port=args.port, print=None)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+
+# --- Script Summary ---
+# Responsibility: Waveform thumbnails for audio clips. Decodes to PCM, reduces it to min/max per
+#                 pixel column with NumPy and caches the result on disk keyed by the file's content hash.
+# Usage: import waveform
+#   peaks = waveform.get_peaks("clip.mp3")   # float32 array of shape (columns, 2), or None
+# ----------------------
+
+# Copyright (C) 2025 steve.rock@wheelhouser.com
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program. If not, see <https://www.gnu.org/licenses/>.
+#
+# --- Setup Instructions ---
+# Active the venv on linux/macOS:
+# python -m venv .venv
+# source .venv/bin/activate
+# pip install --upgrade pip
+# pip install numpy pygame
+#===============================================================================================================
+
+import contextlib
+import hashlib
+import os
+import wave
+import app_paths
+
+np = None  # NumPy is imported on first use; it is optional and slow to import
+_numpy_missing = False
+
+DEFAULT_COLUMNS = 160
+
+def _numpy():
+    """Imports NumPy on first call. Returns the module, or None if it isn't installed."""
+    global np, _numpy_missing
+    if np is None and not _numpy_missing:
+        try:
+            import numpy
+            np = numpy
+        except ImportError:
+            _numpy_missing = True
+    return np
+
+def content_hash(file_path):
+    """SHA-1 of the file's bytes; renamed or moved clips keep their thumbnail."""
+    h = hashlib.sha1()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def decode_pcm(file_path):
+    """Decodes a clip (path or audio_engine.MemoryClip) to a mono float32 array in [-1, 1], or None."""
+    np = _numpy()
+    if isinstance(file_path, str) and file_path.lower().endswith(".wav"):
+        try:
+            with wave.open(file_path, "rb") as w:
+                width, channels = w.getsampwidth(), w.getnchannels()
+                frames = w.readframes(w.getnframes())
+            if width == 2:
+                samples = np.frombuffer(frames, dtype=np.int16).astype(np.float32) / 32768.0
+                return samples.reshape(-1, channels).mean(axis=1)
+        except (wave.Error, EOFError, ValueError):
+            pass
+
+    # Everything else goes through the shared playback engine (uses its PCM cache)
+    import audio_engine
+    sound = audio_engine.get_engine().decode(file_path)
+    if sound is None:
+        return None
+    import pygame
+    samples = pygame.sndarray.array(sound)
+    scale = float(np.iinfo(samples.dtype).max) if np.issubdtype(samples.dtype, np.integer) else 1.0
+    samples = samples.astype(np.float32) / scale
+    return samples.mean(axis=1) if samples.ndim > 1 else samples
+
+def compute_peaks(samples, columns=DEFAULT_COLUMNS):
+    """Reduces samples to (columns, 2) min/max pairs."""
+    np = _numpy()
+    if samples is None or len(samples) == 0:
+        return np.zeros((columns, 2), dtype=np.float32)
+    if len(samples) < columns:
+        samples = np.pad(samples, (0, columns - len(samples)))
+    usable = (len(samples) // columns) * columns
+    blocks = samples[:usable].reshape(columns, -1)
+    return np.stack([blocks.min(axis=1), blocks.max(axis=1)], axis=1).astype(np.float32)
+
+class WaveformCache:
+    """On-disk .npy cache of peaks keyed by content hash and column count."""
+
+    def __init__(self, directory=None):
+        self.directory = directory or os.path.join(app_paths.user_cache_dir(), "waveforms")
+
+    def _path(self, digest, columns):
+        return os.path.join(self.directory, digest[:2], f"{digest}_{columns}.npy")
+
+    def get(self, digest, columns):
+        try:
+            return np.load(self._path(digest, columns))
+        except (OSError, ValueError):
+            return None
+
+    def put(self, digest, columns, peaks):
+        import io
+        import tts_engine
+        buffer = io.BytesIO()
+        np.save(buffer, peaks)
+        with contextlib.suppress(OSError):  # Best effort: the peaks are simply recomputed next time
+            tts_engine.write_atomic(self._path(digest, columns), buffer.getvalue())
+
+_cache = None
+
+def get_peaks(file_path, columns=DEFAULT_COLUMNS):
+    """
+    Returns cached or freshly computed peaks for a clip (path or MemoryClip),
+    or None if NumPy is missing or decoding fails.
+    """
+    global _cache
+    if _numpy() is None:
+        return None
+    if _cache is None:
+        _cache = WaveformCache()
+
+    try:
+        # In-memory clips already carry the hash of their bytes
+        digest = getattr(file_path, "digest", None) or content_hash(file_path)
+    except OSError:
+        return None
+    peaks = _cache.get(digest, columns)
+    if peaks is not None:
+        return peaks
+
+    samples = decode_pcm(file_path)
+    if samples is None:
+        return None
+    peaks = compute_peaks(samples, columns)
+    _cache.put(digest, columns, peaks)
+    return peaks